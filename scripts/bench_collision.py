@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark da colisão com tiles.
+
+Compara check_tile_collision e is_tile_blocked sobre a BlockedMask com a
+implementação original, que percorre as listas do grid e verifica limites
+a cada tile, e o mapa inflado (uma consulta por teste) com o teste exato,
+no level_01.json e em um grid sintético grande. Mede também o movimento
+com colisão contínua contra as sondas separadas em X/Y e contra
+subpassos de 1 pixel.
+"""
+import sys
+import os
+import json
+import math
+import random
+import timeit
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+from rallyx_clone.core.constants import TILE_SIZE, TILE_WALL, TILE_BORDER
+from rallyx_clone.core.collision import (
+    BlockedMask, InflatedMap, check_tile_collision, is_tile_blocked,
+    move_and_slide
+)
+
+
+def load_level_grid():
+    """Carrega o grid do level_01.json."""
+    level_path = os.path.join(
+        src_path, "rallyx_clone", "assets", "data", "level_01.json"
+    )
+    with open(level_path, 'r') as f:
+        return json.load(f)["grid"]
+
+
+def synthetic_grid(size, wall_chance=0.2, seed=1):
+    """Gera um grid quadrado aleatório com borda."""
+    rng = random.Random(seed)
+    return [[3 if tx in (0, size - 1) or ty in (0, size - 1)
+             else (1 if rng.random() < wall_chance else 0)
+             for tx in range(size)] for ty in range(size)]
+
+
+def is_tile_blocked_lists(tx, ty, grid):
+    """Versão original de is_tile_blocked."""
+    if ty < 0 or ty >= len(grid) or tx < 0 or tx >= len(grid[0]):
+        return True
+    return grid[ty][tx] in (TILE_WALL, TILE_BORDER)
+
+
+def check_tile_collision_lists(x, y, width, height, grid):
+    """Versão original de check_tile_collision."""
+    left = int((x - width / 2) // TILE_SIZE)
+    right = int((x + width / 2) // TILE_SIZE)
+    top = int((y - height / 2) // TILE_SIZE)
+    bottom = int((y + height / 2) // TILE_SIZE)
+    for ty in range(top, bottom + 1):
+        for tx in range(left, right + 1):
+            if is_tile_blocked_lists(tx, ty, grid):
+                return True
+    return False
+
+
+def bench(name, grid, count=20000, repeat=15):
+    """Mede as duas versões sobre as mesmas consultas."""
+    rng = random.Random(2)
+    width = len(grid[0]) * TILE_SIZE
+    height = len(grid) * TILE_SIZE
+    boxes = [(rng.uniform(0, width), rng.uniform(0, height),
+              TILE_SIZE * 0.8, TILE_SIZE * 0.8) for _ in range(count)]
+    tiles = [(rng.randrange(len(grid[0])), rng.randrange(len(grid)))
+             for _ in range(count)]
+    BlockedMask.for_grid(grid)
+    
+    for box in boxes:
+        assert (check_tile_collision(*box, grid) ==
+                check_tile_collision_lists(*box, grid))
+    
+    def run(func, queries):
+        def body():
+            for query in queries:
+                func(*query, grid)
+        return min(timeit.repeat(body, number=1, repeat=repeat)) / len(queries)
+    
+    for label, old, new, queries in (
+            ("check_tile_collision", check_tile_collision_lists,
+             check_tile_collision, boxes),
+            ("is_tile_blocked", is_tile_blocked_lists, is_tile_blocked, tiles)):
+        before = run(old, queries)
+        after = run(new, queries)
+        print(f"{name:<20} {label:<22} listas {before * 1e9:7.0f} ns"
+              f"   máscara {after * 1e9:7.0f} ns   {before / after:5.2f}x")
+    
+    # Mapa inflado para o tamanho do jogador
+    size = 28 * 0.8
+    mask = BlockedMask.for_grid(grid)
+    inflated = mask.inflated(size, size)
+    centres = [(x, y) for x, y, _, _ in boxes]
+    exact = min(timeit.repeat(
+        lambda: [check_tile_collision(x, y, size, size, mask) for x, y in centres],
+        number=1, repeat=repeat)) / count
+    lookup = min(timeit.repeat(
+        lambda: [inflated.collides(x, y) for x, y in centres],
+        number=1, repeat=repeat)) / count
+    mixed = inflated.cells.count(InflatedMap.MIXED) / max(len(inflated.cells), 1)
+    print(f"{name:<20} {'mapa inflado':<22} exato  {exact * 1e9:7.0f} ns"
+          f"   consulta {lookup * 1e9:6.0f} ns   {exact / lookup:5.2f}x"
+          f"   ({mixed:.0%} células mistas)")
+
+
+def probe_move(x, y, size, dx, dy, grid):
+    """Movimento original: testa só o destino, um eixo por vez."""
+    if not check_tile_collision(x + dx, y, size, size, grid):
+        x += dx
+    if not check_tile_collision(x, y + dy, size, size, grid):
+        y += dy
+    return x, y
+
+
+def substep_move(x, y, size, dx, dy, grid):
+    """Referência contínua por força bruta: subpassos de até 1 pixel."""
+    steps = max(int(max(abs(dx), abs(dy))) + 1, 1)
+    for _ in range(steps):
+        x, y = probe_move(x, y, size, dx / steps, dy / steps, grid)
+    return x, y
+
+
+def bench_sweep(name, grid, count=5000, repeat=7):
+    """Custo por passo de movimento e quantos passos atravessam paredes."""
+    rng = random.Random(4)
+    size = 28 * 0.8
+    mask = BlockedMask.for_grid(grid)
+    width = len(grid[0]) * TILE_SIZE
+    height = len(grid) * TILE_SIZE
+    
+    for speed in (4.0, 32.0):
+        moves = []
+        while len(moves) < count:
+            x = rng.uniform(0, width)
+            y = rng.uniform(0, height)
+            if check_tile_collision(x, y, size, size, mask):
+                continue
+            angle = rng.uniform(0, 6.2832)
+            moves.append((x, y, speed * math.cos(angle), speed * math.sin(angle)))
+        
+        # Sondas que pulam uma parede: o trajeto passa por um tile bloqueado
+        tunnels = 0
+        for x, y, dx, dy in moves:
+            nx, ny = probe_move(x, y, size, dx, dy, mask)
+            if any(check_tile_collision(x + (nx - x) * k / 16, y + (ny - y) * k / 16,
+                                        size, size, mask) for k in range(17)):
+                tunnels += 1
+        
+        clearance = mask.inflated(size + 8, size + 8)
+        results = []
+        for label, func in (
+                ("sondas X/Y", lambda m: probe_move(m[0], m[1], size, m[2], m[3], mask)),
+                ("subpassos", lambda m: substep_move(m[0], m[1], size, m[2], m[3], mask)),
+                ("move_and_slide", lambda m: move_and_slide(
+                    m[0], m[1], size, size, m[2], m[3], mask, clearance))):
+            elapsed = min(timeit.repeat(lambda: [func(m) for m in moves],
+                                        number=1, repeat=repeat)) / count
+            results.append(f"{label} {elapsed * 1e9:6.0f} ns")
+        print(f"{name:<20} passo {speed:4.0f} px   " + "   ".join(results) +
+              f"   ({tunnels} trajetos das sondas cruzam parede)")
+
+
+def main():
+    bench("level_01 (20x15)", load_level_grid())
+    bench("sintético 256x256", synthetic_grid(256))
+    bench_sweep("level_01 (20x15)", load_level_grid())
+    bench_sweep("sintético 256x256", synthetic_grid(256))
+
+
+if __name__ == "__main__":
+    main()
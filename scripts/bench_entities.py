@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark de enxames: World.update com inimigos como objetos e em colunas.
+
+Monta um nível sintético em quarteirões (ruas de um tile entre blocos de
+paredes) com centenas de inimigos, bandeiras e algumas fumaças, e mede o
+tempo por frame de World.update nos dois modos. Também confere que nenhum
+inimigo termina dentro de uma parede.
+"""
+import sys
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.constants import TILE_SIZE
+from rallyx_clone.core.collision import check_tile_collision
+from rallyx_clone.gameplay import world as world_module
+from rallyx_clone.gameplay.world import World
+
+
+class NoKeys:
+    """Nenhuma tecla pressionada."""
+    
+    def __getitem__(self, key):
+        return False
+
+
+def swarm_level(size, enemies, flags, seed=1):
+    """Nível em quarteirões de 3x3 paredes com spawns nas ruas."""
+    rng = random.Random(seed)
+    grid = [[3 if tx in (0, size - 1) or ty in (0, size - 1)
+             else (1 if tx % 4 and ty % 4 else 0)
+             for tx in range(size)] for ty in range(size)]
+    roads = [(tx, ty) for ty in range(size) for tx in range(size)
+             if grid[ty][tx] == 0]
+    rng.shuffle(roads)
+    return {
+        "grid": grid,
+        "player_spawn": list(roads[0]),
+        "enemy_spawns": [list(tile) for tile in roads[1:enemies + 1]],
+        "flags": [list(tile) for tile in roads[enemies + 1:enemies + flags + 1]],
+        "enemy_count": enemies,
+    }
+
+
+def run(level, columns, frames=120):
+    """Mede World.update e retorna (ms por frame, inimigos em paredes)."""
+    threshold = world_module.ENTITY_STORE_MIN_ENEMIES
+    if not columns:
+        world_module.ENTITY_STORE_MIN_ENEMIES = 10 ** 9
+    try:
+        world = World()
+        world.load_level(level)
+    finally:
+        world_module.ENTITY_STORE_MIN_ENEMIES = threshold
+    assert (world.entity_store is not None) == columns
+    
+    for i in range(5):
+        world.smoke_manager.create_smoke(
+            world.enemies[i].x, world.enemies[i].y)
+    
+    keys = NoKeys()
+    started = time.perf_counter()
+    for _ in range(frames):
+        world.update(1 / 60, keys)
+    elapsed = (time.perf_counter() - started) / frames
+    
+    inside = sum(1 for e in world.enemies
+                 if check_tile_collision(e.x, e.y, e.width * e.collider_scale,
+                                         e.height * e.collider_scale, world.grid))
+    return elapsed * 1000, inside
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    for enemies in (100, 500, 1000):
+        level = swarm_level(64, enemies, 100)
+        objects, inside_objects = run(level, columns=False)
+        store, inside_store = run(level, columns=True)
+        print(f"{enemies:5d} inimigos   objetos {objects:7.2f} ms/frame"
+              f"   colunas {store:6.2f} ms/frame   {objects / store:5.1f}x"
+              f"   (em paredes: {inside_objects} / {inside_store})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark do pathfinding dos inimigos.
+
+Compara bfs_pathfind (predecessores em array plano) com a implementação
+original que copia o caminho a cada tile, no level_01.json e em grids
+sintéticos grandes, as engines do registro entre si e o mapa de
+distâncias vetorizado contra a BFS com deque. Em labirintos, mede também
+a compressão do grafo de cruzamentos.
+"""
+import sys
+import os
+import json
+import random
+import timeit
+from collections import deque
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+from rallyx_clone.core.pathfinding import (
+    bfs_pathfind, PATHFINDING_ENGINES, create_engine, JunctionGraph
+)
+from rallyx_clone.core import wavefront
+from rallyx_clone.core.collision import is_tile_blocked
+
+
+def load_level_grid():
+    """Carrega o grid do level_01.json."""
+    level_path = os.path.join(
+        src_path, "rallyx_clone", "assets", "data", "level_01.json"
+    )
+    with open(level_path, 'r') as f:
+        return json.load(f)["grid"]
+
+
+def bfs_pathfind_reference(start, goal, grid, max_distance=50):
+    """Implementação original do BFS, que copia o caminho a cada tile."""
+    if start == goal:
+        return [goal]
+    
+    queue = deque([(start, [start])])
+    visited = {start}
+    
+    while queue:
+        (cx, cy), path = queue.popleft()
+        if len(path) > max_distance:
+            continue
+        
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            nx, ny = cx + dx, cy + dy
+            if (nx, ny) in visited or is_tile_blocked(nx, ny, grid):
+                continue
+            
+            new_path = path + [(nx, ny)]
+            if (nx, ny) == goal:
+                return new_path
+            
+            visited.add((nx, ny))
+            queue.append(((nx, ny), new_path))
+    
+    return []
+
+
+def synthetic_grid(size, wall_chance=0.2, seed=1):
+    """Gera um grid quadrado aleatório com borda."""
+    rng = random.Random(seed)
+    grid = []
+    for ty in range(size):
+        row = []
+        for tx in range(size):
+            if tx in (0, size - 1) or ty in (0, size - 1):
+                row.append(3)
+            else:
+                row.append(1 if rng.random() < wall_chance else 0)
+        grid.append(row)
+    return grid
+
+
+def random_queries(grid, count, seed=2):
+    """Sorteia pares (início, destino) em tiles livres."""
+    rng = random.Random(seed)
+    free = [(tx, ty) for ty, row in enumerate(grid)
+            for tx, tile in enumerate(row) if tile in (0, 2)]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+def bench(name, grid, queries, max_distance, repeat=5):
+    """Mede as duas implementações sobre as mesmas consultas."""
+    def run(func):
+        def body():
+            for start, goal in queries:
+                func(start, goal, grid, max_distance)
+        return min(timeit.repeat(body, number=1, repeat=repeat))
+    
+    for start, goal in queries:
+        assert (bfs_pathfind(start, goal, grid, max_distance) ==
+                bfs_pathfind_reference(start, goal, grid, max_distance))
+    
+    reference = run(bfs_pathfind_reference)
+    current = run(bfs_pathfind)
+    per_query = len(queries)
+    print(f"{name:<24} referência {reference / per_query * 1e6:9.1f} us"
+          f"   bfs_pathfind {current / per_query * 1e6:9.1f} us"
+          f"   {reference / current:5.2f}x")
+
+
+def bench_engines(name, grid, queries, max_distance, repeat=3, skip=()):
+    """Mede cada engine registrada e os nós expandidos por consulta."""
+    print(f"{name}:")
+    for engine_name in PATHFINDING_ENGINES:
+        if engine_name in skip:
+            continue
+        engine = create_engine(engine_name)
+        
+        def body():
+            for start, goal in queries:
+                engine.find_path(start, goal, grid, max_distance)
+        
+        elapsed = min(timeit.repeat(body, number=1, repeat=repeat))
+        expanded = 0
+        for start, goal in queries:
+            engine.find_path(start, goal, grid, max_distance)
+            expanded += engine.last_expanded
+        print(f"  {engine_name:<16} {elapsed / len(queries) * 1e6:9.1f} us"
+              f"   {expanded / len(queries):9.1f} nós expandidos")
+
+
+def maze_grid(cells, seed=3, loops=0.05):
+    """Gera um labirinto de corredores de 1 tile com alguns ciclos."""
+    rng = random.Random(seed)
+    size = cells * 2 + 1
+    grid = [[1] * size for _ in range(size)]
+    for i in range(size):
+        grid[0][i] = grid[size - 1][i] = grid[i][0] = grid[i][size - 1] = 3
+    
+    stack = [(0, 0)]
+    visited = {(0, 0)}
+    grid[1][1] = 0
+    while stack:
+        cx, cy = stack[-1]
+        options = [(cx + dx, cy + dy) for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0))
+                   if 0 <= cx + dx < cells and 0 <= cy + dy < cells
+                   and (cx + dx, cy + dy) not in visited]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(options)
+        grid[cy + ny + 1][cx + nx + 1] = 0
+        grid[ny * 2 + 1][nx * 2 + 1] = 0
+        visited.add((nx, ny))
+        stack.append((nx, ny))
+    
+    # Paredes removidas criam caminhos alternativos
+    for _ in range(int(cells * cells * loops)):
+        tx, ty = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        if (tx + ty) % 2 == 1 and grid[ty][tx] == 1:
+            grid[ty][tx] = 0
+    return grid
+
+
+def bench_junction(name, grid, queries):
+    """Compara nós expandidos e tamanho dos caminhos com o BFS."""
+    graph = JunctionGraph(grid)
+    free = sum(1 for row in grid for tile in row if tile in (0, 2))
+    bfs = create_engine("bfs")
+    junction = create_engine("junction")
+    
+    bfs_expanded = junction_expanded = tiles = waypoints = 0
+    for start, goal in queries:
+        tiles += len(bfs.find_path(start, goal, grid, len(grid) ** 2))
+        bfs_expanded += bfs.last_expanded
+        waypoints += len(junction.find_waypoints(start, goal, grid, len(grid) ** 2))
+        junction_expanded += junction.last_expanded
+    
+    count = len(queries)
+    print(f"{name}: {free} tiles livres -> {len(graph.adjacency)} nós,"
+          f" {len(graph.edges)} arestas")
+    print(f"  nós expandidos  bfs {bfs_expanded / count:9.1f}"
+          f"   junction {junction_expanded / count:9.1f}")
+    print(f"  tamanho caminho tiles {tiles / count:7.1f}"
+          f"   pontos de passagem {waypoints / count:7.1f}")
+
+
+def bench_wavefront(sizes=(16, 24, 32, 48, 64, 128, 256, 512), repeat=3):
+    """Mede o mapa de distâncias com deque e com NumPy por tamanho de mapa."""
+    if not wavefront.HAS_NUMPY:
+        print("mapa de distâncias: NumPy não instalado")
+        return
+    
+    print("mapa de distâncias (deque x NumPy):")
+    crossover = None
+    for size in sizes:
+        grid = synthetic_grid(size)
+        source = (size // 2, size // 2)
+        grid[source[1]][source[0]] = 0
+        
+        expected = wavefront.distance_map_deque(grid, source)
+        assert wavefront.distance_map_numpy(grid, source).tolist() == expected
+        
+        deque_time = min(timeit.repeat(
+            lambda: wavefront.distance_map_deque(grid, source),
+            number=1, repeat=repeat))
+        numpy_time = min(timeit.repeat(
+            lambda: wavefront.distance_map_numpy(grid, source),
+            number=1, repeat=repeat))
+        if crossover is None and numpy_time < deque_time:
+            crossover = size
+        print(f"  {size:>4}x{size:<4} deque {deque_time * 1e3:8.2f} ms"
+              f"   NumPy {numpy_time * 1e3:8.2f} ms"
+              f"   {deque_time / numpy_time:5.2f}x")
+    
+    if crossover is not None:
+        print(f"  NumPy passa a ganhar a partir de {crossover}x{crossover}"
+              f" ({crossover * crossover} tiles)")
+
+
+def main():
+    level = load_level_grid()
+    bench("level_01 (20x15)", level, random_queries(level, 500), 50)
+    
+    for size in (64, 128, 256):
+        grid = synthetic_grid(size)
+        bench(f"sintético {size}x{size}", grid, random_queries(grid, 50), 50)
+        bench(f"sintético {size}x{size} s/ lim.", grid,
+              random_queries(grid, 20), size * size, repeat=3)
+    
+    bench_engines("engines level_01", level, random_queries(level, 500), 50)
+    for size in (64, 256):
+        grid = synthetic_grid(size, wall_chance=0.1)
+        # A tabela de todos os pares não é feita para mapas deste tamanho
+        bench_engines(f"engines mapa aberto {size}x{size}", grid,
+                      random_queries(grid, 30), size * size, skip=("table",))
+    
+    for cells in (32, 96):
+        grid = maze_grid(cells)
+        # D* Lite só compensa com o mesmo alvo entre consultas
+        bench_engines(f"engines labirinto {cells * 2 + 1}x{cells * 2 + 1}", grid,
+                      random_queries(grid, 30), len(grid) ** 2,
+                      skip=("table", "dstar_lite"))
+        bench_junction(f"grafo de cruzamentos {cells * 2 + 1}x{cells * 2 + 1}",
+                       grid, random_queries(grid, 30))
+    
+    bench_wavefront()
+
+
+if __name__ == "__main__":
+    main()
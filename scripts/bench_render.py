@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark de desenho: rotação por frame contra o cache de rotação, e o
+sistema de partículas nos dois back-ends.
+
+Desenha N carros girando (ângulos contínuos) numa superfície do tamanho da
+tela, primeiro chamando pygame.transform.rotate a cada frame e depois com
+AssetManager.get_rotated, e mostra as estatísticas do cache. Depois mede
+update + draw de nuvens de fumaça em partículas (NumPy e ``array``) e o
+mapa em pedaços percorrendo um nível de 1024x1024 tiles, redesenhando a
+tela toda ou rolando o fundo. Por fim compara um blit por entidade com a
+fila de renderização (recorte pela câmera e um blits por camada) num mundo
+quatro vezes maior que a tela.
+"""
+import sys
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.assets import AssetManager
+from rallyx_clone.core.constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, SMOKE_FADE_STEPS, SMOKE_PARTICLE_SIZE,
+    SMOKE_PARTICLE_LIFE, SMOKE_PARTICLE_SPEED
+)
+from rallyx_clone.core.particles import ParticleEmitter, ParticleField, HAS_NUMPY
+from rallyx_clone.core.map_renderer import ChunkedMapRenderer, ScrollingBackground
+from rallyx_clone.core.render_queue import RenderQueue
+from rallyx_clone.gameplay.entities_base import Entity
+
+
+def car_sprite():
+    """Sprite de carro sintético 28x28."""
+    surface = pygame.Surface((28, 28), pygame.SRCALPHA)
+    surface.fill((200, 40, 40, 255), pygame.Rect(6, 2, 16, 24))
+    return surface.convert_alpha()
+
+
+def run(cars, cached, frames=120, seed=1):
+    """Mede o desenho de ``cars`` carros e retorna ms por frame."""
+    rng = random.Random(seed)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprite = car_sprite()
+    assets = AssetManager()
+    cars = [[rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+             rng.uniform(0, 360), rng.uniform(-180, 180)] for _ in range(cars)]
+    
+    started = time.perf_counter()
+    for _ in range(frames):
+        for car in cars:
+            car[2] += car[3] / 60
+            if cached:
+                rotated, (dx, dy) = assets.get_rotated(sprite, car[2])
+                screen.blit(rotated, (round(car[0]) + dx, round(car[1]) + dy))
+            else:
+                rotated = pygame.transform.rotate(sprite, -car[2])
+                screen.blit(rotated, rotated.get_rect(center=(car[0], car[1])))
+    return (time.perf_counter() - started) / frames * 1000
+
+
+def run_particles(clouds, use_numpy, frames=120, seed=1):
+    """Mede update + draw de nuvens de partículas e retorna ms por frame."""
+    rng = random.Random(seed)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprite = pygame.Surface((SMOKE_PARTICLE_SIZE, SMOKE_PARTICLE_SIZE), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (220, 220, 220, 160), sprite.get_rect().center,
+                       SMOKE_PARTICLE_SIZE // 2)
+    fade = AssetManager().get_fade_frames(sprite.convert_alpha(), SMOKE_FADE_STEPS)
+    
+    field = ParticleField()
+    for i in range(clouds):
+        emitter = ParticleEmitter(fade, 256, 200.0, SMOKE_PARTICLE_LIFE,
+                                  speed=SMOKE_PARTICLE_SPEED * 4, radius=30.0,
+                                  drag=1.0, use_numpy=use_numpy, seed=i)
+        emitter.x = rng.uniform(-200, SCREEN_WIDTH + 200)
+        emitter.y = rng.uniform(-200, SCREEN_HEIGHT + 200)
+        emitter.emitting = True
+        field.add(emitter)
+    for _ in range(60):
+        field.update(1 / 60)
+    
+    started = time.perf_counter()
+    for _ in range(frames):
+        field.update(1 / 60)
+        field.draw(screen)
+    return (time.perf_counter() - started) / frames * 1000, field.particle_count
+
+
+def run_map(tiles, scrolling, frames=600, step=24, seed=1):
+    """
+    Percorre o mapa na diagonal e retorna (ms por frame, estatísticas,
+    fração da tela redesenhada a partir dos tiles por frame).
+    """
+    rng = random.Random(seed)
+    grid = [[rng.randrange(4) for _ in range(tiles)] for _ in range(tiles)]
+    renderer = ChunkedMapRenderer()
+    renderer.set_grid(grid)
+    background = ScrollingBackground(renderer)
+    screen = pygame.display.get_surface()
+    
+    redrawn = 0
+    started = time.perf_counter()
+    for i in range(frames):
+        offset = (i * step, i * step * 0.5)
+        if scrolling:
+            background.draw(screen, offset)
+            redrawn += background.redrawn_pixels
+        else:
+            screen.fill((0, 0, 0))
+            renderer.draw(screen, offset)
+            redrawn += SCREEN_WIDTH * SCREEN_HEIGHT
+    elapsed = (time.perf_counter() - started) / frames * 1000
+    return elapsed, renderer.stats(), redrawn / frames / (SCREEN_WIDTH * SCREEN_HEIGHT)
+
+
+def run_queue(count, queued, frames=120, seed=1):
+    """Mede o desenho de ``count`` entidades; retorna ms por frame e stats."""
+    rng = random.Random(seed)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprite = car_sprite()
+    entities = []
+    for _ in range(count):
+        entity = Entity(rng.uniform(0, SCREEN_WIDTH * 2), rng.uniform(0, SCREEN_HEIGHT * 2),
+                        28, 28)
+        entity._sprite = sprite
+        entity._angle = rng.choice((0, 90, 180, 270))
+        entities.append(entity)
+    camera = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+    queue = RenderQueue()
+    
+    started = time.perf_counter()
+    for _ in range(frames):
+        if queued:
+            queue.begin(screen, camera)
+            for entity in entities:
+                entity.enqueue(queue)
+            queue.flush(screen)
+        else:
+            for entity in entities:
+                entity.draw(screen, camera)
+    return (time.perf_counter() - started) / frames * 1000, queue.stats()
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    assets = AssetManager()
+    for cars in (10, 100, 500):
+        assets.clear_rotation_cache()
+        direct = run(cars, cached=False)
+        cached = run(cars, cached=True)
+        stats = assets.rotation_stats()
+        print(f"{cars:4d} carros   rotate {direct:6.2f} ms/frame"
+              f"   cache {cached:6.2f} ms/frame   {direct / cached:5.1f}x"
+              f"   ({stats['surfaces']} quadros, {stats['bytes'] // 1024} KiB,"
+              f" acertos {stats['hit_rate']:.1%})")
+    
+    for clouds in (5, 20):
+        line = f"{clouds:4d} nuvens  "
+        for use_numpy in ([True] if HAS_NUMPY else []) + [False]:
+            elapsed, particles = run_particles(clouds, use_numpy)
+            name = "numpy" if use_numpy else "array"
+            line += f"   {name} {elapsed:6.2f} ms/frame"
+        print(line + f"   ({particles} partículas)")
+    
+    tiles = 1024
+    for step in (4, 24):
+        full, stats, _ = run_map(tiles, scrolling=False, step=step)
+        scrolled, _, fraction = run_map(tiles, scrolling=True, step=step)
+        print(f"mapa {tiles}x{tiles} passo {step:2d}px   pedaços {full:5.2f} ms/frame"
+              f"   rolado {scrolled:5.2f} ms/frame ({fraction:.1%} da tela redesenhada)"
+              f"   cache {stats['bytes'] // 2 ** 20} MiB ({stats['chunks']} pedaços,"
+              f" {stats['evictions']} descartados)")
+    print(f"   (superfície do mapa inteiro seria {(tiles * 32) ** 2 * 4 // 2 ** 30} GiB)")
+    
+    for count in (100, 1000):
+        direct, _ = run_queue(count, queued=False)
+        queued, stats = run_queue(count, queued=True)
+        print(f"{count:5d} entidades   blit {direct:6.2f} ms/frame   fila {queued:6.2f} ms/frame"
+              f"   ({stats['draw_calls']} blits, {stats['submitted']} desenhadas,"
+              f" {stats['culled']} recortadas)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark da fase larga de colisão entre entidades.
+
+Simula enxames de inimigos, bandeiras e fumaças espalhados num mapa e
+compara, por frame, a varredura linear original (testar o jogador contra
+todos e cada inimigo contra todas as fumaças) com o hash espacial
+refeito a cada frame. Por fim mede a pergunta "inimigo na fumaça?" na
+grade de ocupação por tiles das fumaças, um inimigo por vez e em lote.
+"""
+import sys
+import os
+import random
+import timeit
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.particles import ParticleEmitter, ParticleField
+from rallyx_clone.core.spatial_hash import SpatialHash
+
+
+class Body:
+    """Entidade mínima (posição, caixa e raio)."""
+    
+    def __init__(self, x, y, size):
+        self.x = x
+        self.y = y
+        self.width = size
+        self.height = size
+        self.radius = size / 2
+        self.active = True
+
+
+def overlaps(a, b):
+    """Teste exato entre duas caixas centradas."""
+    return (abs(a.x - b.x) * 2 < a.width + b.width and
+            abs(a.y - b.y) * 2 < a.height + b.height)
+
+
+def in_smoke(smoke, x, y):
+    """Teste exato de ponto dentro da fumaça."""
+    dx = x - smoke.x
+    dy = y - smoke.y
+    return dx * dx + dy * dy <= smoke.radius * smoke.radius
+
+
+def frame_linear(player, enemies, flags, smokes):
+    """Frame com as varreduras lineares."""
+    hits = 0
+    for enemy in enemies:
+        for smoke in smokes:
+            if in_smoke(smoke, enemy.x, enemy.y):
+                hits += 1
+                break
+    hits += sum(1 for flag in flags if overlaps(player, flag))
+    hits += sum(1 for enemy in enemies if overlaps(player, enemy))
+    return hits
+
+
+def frame_hashed(player, enemies, flags, smokes, hashes):
+    """Frame com o hash: refaz inimigos e bandeiras e consulta."""
+    enemy_hash, flag_hash, smoke_hash = hashes
+    enemy_hash.rebuild(enemies)
+    flag_hash.rebuild(flags)
+    hits = 0
+    for enemy in enemies:
+        for smoke in smoke_hash.query_aabb(enemy.x, enemy.y):
+            if in_smoke(smoke, enemy.x, enemy.y):
+                hits += 1
+                break
+    box = (player.x, player.y, player.width + 2, player.height + 2)
+    hits += sum(1 for flag in flag_hash.query_aabb(*box) if overlaps(player, flag))
+    hits += sum(1 for enemy in enemy_hash.query_aabb(*box) if overlaps(player, enemy))
+    return hits
+
+
+def bench(enemy_count, flag_count, smoke_count, size=128, repeat=7):
+    """Mede os dois frames para um tamanho de enxame."""
+    rng = random.Random(3)
+    extent = size * 32
+    
+    def spawn(count, body_size):
+        return [Body(rng.uniform(0, extent), rng.uniform(0, extent), body_size)
+                for _ in range(count)]
+    
+    player = Body(extent / 2, extent / 2, 28)
+    enemies = spawn(enemy_count, 28)
+    flags = spawn(flag_count, 24)
+    smokes = spawn(smoke_count, 80)
+    smoke_hash = SpatialHash()
+    smoke_hash.rebuild(smokes)
+    hashes = (SpatialHash(), SpatialHash(), smoke_hash)
+    
+    assert (frame_linear(player, enemies, flags, smokes) ==
+            frame_hashed(player, enemies, flags, smokes, hashes))
+    
+    linear = min(timeit.repeat(
+        lambda: frame_linear(player, enemies, flags, smokes),
+        number=1, repeat=repeat))
+    hashed = min(timeit.repeat(
+        lambda: frame_hashed(player, enemies, flags, smokes, hashes),
+        number=1, repeat=repeat))
+    print(f"{enemy_count:5d} inimigos {flag_count:4d} bandeiras {smoke_count:4d} fumaças"
+          f"   linear {linear * 1e3:8.2f} ms   hash {hashed * 1e3:6.2f} ms"
+          f"   {linear / hashed:6.1f}x")
+
+
+def bench_smoke(enemy_count, smoke_count, size=128, repeat=7):
+    """Fumaça por varredura contra a grade de ocupação (um a um e em lote)."""
+    rng = random.Random(5)
+    extent = size * 32
+    enemies = [Body(rng.uniform(0, extent), rng.uniform(0, extent), 28)
+               for _ in range(enemy_count)]
+    smokes = [Body(rng.uniform(0, extent), rng.uniform(0, extent), 96)
+              for _ in range(smoke_count)]
+    
+    field = ParticleField()
+    frames = [pygame.Surface((32, 32))]
+    for smoke in smokes:
+        emitter = ParticleEmitter(frames, 1, 0.0, 1.0)
+        emitter.x, emitter.y = smoke.x, smoke.y
+        field.add(emitter, reach=smoke.radius)
+    xs = [enemy.x for enemy in enemies]
+    ys = [enemy.y for enemy in enemies]
+    
+    def scan():
+        return sum(1 for enemy in enemies
+                   if any(in_smoke(smoke, enemy.x, enemy.y) for smoke in smokes))
+    
+    def single():
+        return sum(1 for enemy in enemies if field.covers(enemy.x, enemy.y))
+    
+    def batch():
+        return int(sum(field.covers_many(xs, ys)))
+    
+    timings = [min(timeit.repeat(query, number=1, repeat=repeat))
+               for query in (scan, single, batch)]
+    print(f"{enemy_count:5d} inimigos {smoke_count:4d} fumaças"
+          f"   varredura {timings[0] * 1e3:8.2f} ms   grade {timings[1] * 1e3:6.2f} ms"
+          f"   lote {timings[2] * 1e3:6.2f} ms   (na fumaça: {scan()} / {single()})")
+
+
+def main():
+    bench(3, 10, 5)
+    bench(100, 50, 50)
+    bench(500, 200, 200)
+    bench(1000, 300, 400)
+    
+    bench_smoke(100, 50)
+    bench_smoke(1000, 400)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@ from .core.constants import (
     STATE_TITLE, STATE_OPTIONS, STATE_GAME, STATE_PAUSE, STATE_GAMEOVER
 )
 from .core.config import Config
+from .core.dirty_rects import DisplayPresenter
 from .core.assets import AssetManager
 from .core.audio import AudioManager
+from .core.path_service import AsyncPathService
 from .core.state import StateMachine
 from .scenes.title_scene import TitleScene
 from .scenes.options_scene import OptionsScene
@@ -45,6 +47,9 @@ class App:
         # Clock
         self._clock = pygame.time.Clock()
         
+        # Envio do frame para a janela (dirty rects ou flip)
+        self._presenter = DisplayPresenter()
+        
         # Managers
         self._assets = AssetManager()
         self._audio = AudioManager()
@@ -81,6 +86,9 @@ class App:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self._running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    # Janela redesenhada pelo sistema: reenvia tudo
+                    self._presenter.invalidate()
                 else:
                     self._state_machine.handle_event(event)
             
@@ -90,14 +98,21 @@ class App:
             # Draw
             self._state_machine.draw(self._screen)
             
-            # Flip
-            pygame.display.flip()
+            # Flip (ou só as áreas que mudaram); as áreas são recolhidas
+            # sempre, para a cena fechar o frame mesmo com a opção desligada
+            scene = self._state_machine.current_scene
+            rects = scene.dirty_rects() if scene else None
+            if self._config.dirty_rects:
+                self._presenter.present(rects, self._screen.get_rect())
+            else:
+                pygame.display.flip()
         
         # Cleanup
         self._cleanup()
     
     def _cleanup(self):
         """Limpa recursos."""
+        AsyncPathService().shutdown()
         pygame.mixer.quit()
         pygame.quit()
 
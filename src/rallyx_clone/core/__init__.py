@@ -6,5 +6,11 @@ from .audio import AudioManager
 from .timer import Timer
 from .state import StateMachine
 from .scene import Scene
-from .collision import check_tile_collision, check_circle_collision
-from .pathfinding import bfs_pathfind
+from .collision import check_tile_collision, check_circle_collision, BlockedMask
+from .pathfinding import bfs_pathfind, create_engine, FlowField, JunctionGraph
+from .path_table import NextHopTable
+from .hpa import ClusterGraph
+from .dstar_lite import DStarLite
+from .path_scheduler import PathScheduler
+from .path_service import AsyncPathService
+from .wavefront import distance_map
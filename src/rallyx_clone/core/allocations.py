@@ -0,0 +1,72 @@
+"""
+Contador de alocações por frame, para verificar laços quentes.
+
+Usa o tracemalloc da biblioteca padrão: a cada frame registra quantos
+bytes ficaram retidos e o pico de memória temporária acima do início do
+frame. Um laço que não aloca tem pico constante, qualquer que seja o
+número de entidades. O tracemalloc deixa o jogo bem mais lento, então o
+contador só deve ser ligado em testes e benchmarks.
+
+Sem ``tracemalloc.reset_peak`` (Python 3.8), o pico só é visto quando o
+frame passa do maior uso já registrado; abaixo disso o frame informa o uso
+no seu fim. Com o tracemalloc recém-ligado (uso como context manager) a
+medida é exata.
+"""
+import tracemalloc
+from typing import Optional
+
+# reset_peak só existe a partir do Python 3.9
+HAS_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+
+class AllocationCounter:
+    """Mede alocações entre ``begin_frame()`` e ``end_frame()``."""
+    
+    def __init__(self):
+        self.frames = 0
+        self.last_retained = 0  # Bytes alocados e ainda vivos no fim do frame
+        self.last_peak = 0  # Maior uso temporário acima do início do frame
+        self.max_peak = 0
+        self._start: Optional[int] = None
+        self._peak_before = 0  # Pico acumulado no início do frame (sem reset_peak)
+        self._started_tracing = False
+    
+    def start(self):
+        """Liga o tracemalloc (se ainda não estiver ligado)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+    
+    def stop(self):
+        """Desliga o tracemalloc, se foi ligado por este contador."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+    
+    def begin_frame(self):
+        """Marca o início de um frame."""
+        if HAS_RESET_PEAK:
+            tracemalloc.reset_peak()
+        self._start, self._peak_before = tracemalloc.get_traced_memory()
+    
+    def end_frame(self):
+        """Fecha o frame e atualiza as estatísticas."""
+        current, peak = tracemalloc.get_traced_memory()
+        if self._start is None:
+            return
+        if not HAS_RESET_PEAK and peak <= self._peak_before:
+            peak = current  # O pico acumulado é de frames anteriores
+        self.last_retained = current - self._start
+        self.last_peak = peak - self._start
+        self.max_peak = max(self.max_peak, self.last_peak)
+        self.frames += 1
+        self._start = None
+    
+    def __enter__(self) -> "AllocationCounter":
+        self.start()
+        self.begin_frame()
+        return self
+    
+    def __exit__(self, *exc):
+        self.end_frame()
+        self.stop()
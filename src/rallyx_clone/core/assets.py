@@ -1,10 +1,19 @@
 """
 Asset Manager - Carrega e cacheia imagens e dados.
+
+Os sprites e tiles listados em ``images/atlas.json`` são servidos por uma
+folha única (atlas): cada sprite é uma vista (``subsurface``) da folha, que
+é convertida uma vez só. Entradas com ``rect`` são recortadas da folha
+indicada em ``"sheet"``; as demais são carregadas dos arquivos e
+empacotadas numa folha montada na carga. Imagens fora do atlas (ou pedidas
+em outro tamanho) continuam vindo dos arquivos individuais.
 """
 import os
 import json
 import pygame
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from .constants import ROTATION_BUCKETS, TILE_SIZE, ATLAS_SHEET_WIDTH
 
 
 class AssetManager:
@@ -26,6 +35,23 @@ class AssetManager:
         self._images: Dict[str, pygame.Surface] = {}
         self._data: Dict[str, dict] = {}
         self._base_path = self._get_base_path()
+        
+        # Cache de rotação: sprite -> lista com uma entrada por faixa de ângulo
+        self.rotation_buckets = ROTATION_BUCKETS
+        self._rotations: Dict[pygame.Surface, list] = {}
+        self._rotation_hits = 0
+        self._rotation_misses = 0
+        
+        # Níveis de alfa pré-renderizados: (sprite, níveis) -> superfícies
+        self._fades: Dict[Tuple[pygame.Surface, int], List[pygame.Surface]] = {}
+        
+        # Atlas: folhas e vistas por nome e por (arquivo, tamanho)
+        self.use_atlas = True
+        self._atlas_loaded = False
+        self._sheets: List[pygame.Surface] = []
+        self._atlas_sprites: Dict[str, pygame.Surface] = {}
+        self._atlas_files: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+        self.decodes = 0  # Arquivos de imagem abertos e decodificados
     
     def _get_base_path(self):
         """Retorna o caminho base dos assets."""
@@ -52,9 +78,19 @@ class AssetManager:
         if cache_key in self._images:
             return self._images[cache_key]
         
+        # Sprite do atlas no mesmo tamanho: vista da folha, sem abrir arquivo
+        if convert_alpha and scale and self.use_atlas:
+            if not self._atlas_loaded:
+                self.load_atlas()
+            view = self._atlas_files.get((name, tuple(scale)))
+            if view is not None:
+                self._images[cache_key] = view
+                return view
+        
         path = os.path.join(self._base_path, "images", name)
         
         try:
+            self.decodes += 1
             if convert_alpha:
                 image = pygame.image.load(path).convert_alpha()
             else:
@@ -74,7 +110,7 @@ class AssetManager:
     
     def load_tile(self, tile_type: int) -> pygame.Surface:
         """Carrega tile pelo tipo."""
-        from .constants import TILE_SIZE, TILE_ROAD, TILE_WALL, TILE_GRASS, TILE_BORDER
+        from .constants import TILE_ROAD, TILE_WALL, TILE_GRASS, TILE_BORDER
         
         tile_names = {
             TILE_ROAD: "tile_road.png",
@@ -86,6 +122,140 @@ class AssetManager:
         name = tile_names.get(tile_type, "tile_road.png")
         return self.load_image(name, scale=(TILE_SIZE, TILE_SIZE))
     
+    def load_atlas(self, name: str = "atlas.json") -> bool:
+        """
+        Carrega o atlas de sprites descrito em ``images/<name>``.
+        
+        O JSON tem as seções "sprites" e "tiles"; cada entrada tem "file" e,
+        opcionalmente, "size" (tamanho usado no jogo; tiles usam TILE_SIZE)
+        e "rect" ([x, y, w, h] na folha "sheet" do topo do arquivo). A folha
+        é carregada e convertida uma vez; entradas sem "rect" são lidas dos
+        arquivos, escaladas e empacotadas numa folha montada aqui.
+        
+        Args:
+            name: Nome do arquivo (sem caminho)
+        
+        Returns:
+            True se o atlas foi carregado
+        """
+        self._atlas_loaded = True
+        path = os.path.join(self._base_path, "images", name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Erro ao carregar atlas {name}: {e}")
+            return False
+        
+        try:
+            entries = []
+            for section in ("sprites", "tiles"):
+                default = (TILE_SIZE, TILE_SIZE) if section == "tiles" else None
+                for key, entry in data.get(section, {}).items():
+                    entries.append((key, entry["file"], entry.get("size", default),
+                                    entry.get("rect")))
+            
+            sheet = None
+            if data.get("sheet"):
+                sheet = self._load_sheet(data["sheet"])
+            packed = [entry for entry in entries if sheet is None or entry[3] is None]
+            views = self._pack_sheet(packed) if packed else {}
+        except (KeyError, TypeError, ValueError, pygame.error) as e:
+            print(f"Erro ao montar atlas {name}: {e}")
+            return False
+        
+        for key, file, size, rect in entries:
+            if sheet is not None and rect is not None:
+                view = sheet.subsurface(pygame.Rect(rect))
+                if size and tuple(size) != view.get_size():
+                    view = pygame.transform.scale(view, size)
+            else:
+                view = views[key]
+            self._atlas_sprites[key] = view
+            self._atlas_files[(file, view.get_size())] = view
+        return True
+    
+    def _load_sheet(self, name: str) -> pygame.Surface:
+        """Carrega e converte uma folha de sprites."""
+        self.decodes += 1
+        sheet = pygame.image.load(os.path.join(self._base_path, "images", name))
+        sheet = sheet.convert_alpha()
+        self._sheets.append(sheet)
+        return sheet
+    
+    def _pack_sheet(self, entries: list) -> Dict[str, pygame.Surface]:
+        """
+        Empacota imagens avulsas numa folha (prateleiras por altura).
+        
+        Args:
+            entries: Tuplas (nome, arquivo, tamanho ou None, rect ignorado)
+        
+        Returns:
+            Dict nome -> vista na folha
+        """
+        images = {}
+        for key, file, size, _ in entries:
+            image = images.get((file, size and tuple(size)))
+            if image is None:
+                self.decodes += 1
+                image = pygame.image.load(os.path.join(self._base_path, "images", file))
+                if size:
+                    image = pygame.transform.scale(image, size)
+                images[(file, size and tuple(size))] = image
+        
+        # Prateleiras: as mais altas primeiro, da esquerda para a direita
+        order = sorted(images, key=lambda k: images[k].get_height(), reverse=True)
+        width = max(ATLAS_SHEET_WIDTH, max(image.get_width() for image in images.values()))
+        places = {}
+        x = y = shelf = 0
+        for k in order:
+            w, h = images[k].get_size()
+            if x + w > width:
+                x, y, shelf = 0, y + shelf, 0
+            places[k] = pygame.Rect(x, y, w, h)
+            x += w
+            shelf = max(shelf, h)
+        
+        # Cópia exata (soma sobre a folha transparente) e uma conversão só
+        sheet = pygame.Surface((width, y + shelf), pygame.SRCALPHA)
+        for k, rect in places.items():
+            sheet.blit(images[k], rect, special_flags=pygame.BLEND_RGBA_ADD)
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+        self._sheets.append(sheet)
+        
+        return {key: sheet.subsurface(places[(file, size and tuple(size))])
+                for key, file, size, _ in entries}
+    
+    def get_sprite(self, name: str) -> Optional[pygame.Surface]:
+        """
+        Retorna a vista de um sprite do atlas pelo nome.
+        
+        Args:
+            name: Nome da entrada no atlas (ex.: "player_car", "road")
+        
+        Returns:
+            Vista na folha, ou None se o nome não está no atlas
+        """
+        if not self._atlas_loaded:
+            self.load_atlas()
+        return self._atlas_sprites.get(name)
+    
+    def atlas_stats(self) -> dict:
+        """
+        Retorna estatísticas do atlas.
+        
+        Returns:
+            Dict com sheets, sprites, bytes (pixels das folhas) e decodes
+            (arquivos de imagem decodificados até agora)
+        """
+        return {
+            "sheets": len(self._sheets),
+            "sprites": len(self._atlas_sprites),
+            "bytes": sum(sheet.get_height() * sheet.get_pitch() for sheet in self._sheets),
+            "decodes": self.decodes,
+        }
+    
     def load_data(self, name: str) -> dict:
         """
         Carrega arquivo JSON de dados.
@@ -110,28 +280,178 @@ class AssetManager:
             print(f"Erro ao carregar dados {name}: {e}")
             return {}
     
+    def angle_bucket(self, angle: float) -> int:
+        """
+        Retorna a faixa de ângulo mais próxima.
+        
+        Args:
+            angle: Ângulo em graus (qualquer valor, é reduzido a 0-360)
+        
+        Returns:
+            Índice da faixa, de 0 a rotation_buckets - 1
+        """
+        buckets = self.rotation_buckets
+        return int(round(angle * buckets / 360.0)) % buckets
+    
+    def _render_rotation(self, surface: pygame.Surface,
+                         bucket: int) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """Renderiza uma faixa e calcula o deslocamento do canto ao centro."""
+        angle = bucket * 360.0 / self.rotation_buckets
+        if bucket == 0:
+            rotated = surface
+        else:
+            rotated = pygame.transform.rotate(surface, -angle)
+        width, height = rotated.get_size()
+        return rotated, (-(width // 2), -(height // 2))
+    
+    def get_rotated(self, surface: pygame.Surface,
+                    angle: float) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """
+        Retorna o sprite girado, usando o cache de rotação.
+        
+        O ângulo é arredondado para a faixa mais próxima (360 /
+        rotation_buckets graus cada); cada faixa é renderizada uma única vez
+        por sprite, na primeira vez que é pedida ou em prerotate().
+        
+        Args:
+            surface: Sprite original (não girado)
+            angle: Ângulo em graus, no sentido horário (como Entity._angle)
+        
+        Returns:
+            Tupla (superfície girada, (dx, dy)), onde (dx, dy) é o
+            deslocamento do centro até o canto superior esquerdo: o blit vai
+            em (centro_x + dx, centro_y + dy)
+        """
+        bucket = self.angle_bucket(angle)
+        frames = self._rotations.get(surface)
+        if frames is None:
+            frames = [None] * self.rotation_buckets
+            self._rotations[surface] = frames
+        
+        entry = frames[bucket]
+        if entry is None:
+            entry = self._render_rotation(surface, bucket)
+            frames[bucket] = entry
+            self._rotation_misses += 1
+        else:
+            self._rotation_hits += 1
+        return entry
+    
+    def prerotate(self, surface: pygame.Surface):
+        """
+        Renderiza de uma vez todas as faixas de um sprite.
+        
+        Args:
+            surface: Sprite original (não girado)
+        """
+        frames = self._rotations.setdefault(surface, [None] * self.rotation_buckets)
+        for bucket in range(self.rotation_buckets):
+            if frames[bucket] is None:
+                frames[bucket] = self._render_rotation(surface, bucket)
+    
+    def set_rotation_buckets(self, buckets: int):
+        """
+        Muda o número de faixas de ângulo (descarta o cache de rotação).
+        
+        Args:
+            buckets: Faixas por volta completa
+        """
+        if buckets < 1:
+            raise ValueError("buckets deve ser positivo")
+        self.rotation_buckets = buckets
+        self.clear_rotation_cache()
+    
+    def clear_rotation_cache(self):
+        """Limpa o cache de rotação e zera as estatísticas."""
+        self._rotations.clear()
+        self._rotation_hits = 0
+        self._rotation_misses = 0
+    
+    def rotation_stats(self) -> dict:
+        """
+        Retorna estatísticas do cache de rotação.
+        
+        Returns:
+            Dict com buckets, sprites, surfaces (faixas renderizadas),
+            bytes (pixels das faixas renderizadas, sem contar a faixa 0, que é
+            o próprio sprite), hits, misses e hit_rate
+        """
+        surfaces = 0
+        size = 0
+        for frames in self._rotations.values():
+            for bucket, entry in enumerate(frames):
+                if entry is None:
+                    continue
+                surfaces += 1
+                if bucket:
+                    rotated = entry[0]
+                    size += rotated.get_width() * rotated.get_height() * rotated.get_bytesize()
+        
+        lookups = self._rotation_hits + self._rotation_misses
+        return {
+            "buckets": self.rotation_buckets,
+            "sprites": len(self._rotations),
+            "surfaces": surfaces,
+            "bytes": size,
+            "hits": self._rotation_hits,
+            "misses": self._rotation_misses,
+            "hit_rate": self._rotation_hits / lookups if lookups else 0.0,
+        }
+    
+    def get_fade_frames(self, surface: pygame.Surface,
+                        steps: int) -> List[pygame.Surface]:
+        """
+        Retorna cópias do sprite com alfa de superfície crescente.
+        
+        A cópia i tem alfa round(255 * i / (steps - 1)); a última é o
+        próprio sprite. As cópias são feitas uma única vez por sprite, então
+        um fade-out só escolhe a cópia certa, sem copiar a cada frame.
+        
+        Args:
+            surface: Sprite original (opaco)
+            steps: Número de níveis de alfa (pelo menos 2)
+        
+        Returns:
+            Lista com ``steps`` superfícies, da transparente à opaca
+        """
+        key = (surface, steps)
+        frames = self._fades.get(key)
+        if frames is None:
+            frames = []
+            for i in range(steps - 1):
+                frame = surface.copy()
+                frame.set_alpha(round(255 * i / (steps - 1)))
+                frames.append(frame)
+            frames.append(surface)
+            self._fades[key] = frames
+        return frames
+    
     def clear_cache(self):
         """Limpa cache de imagens."""
         self._images.clear()
         self._data.clear()
+        self._fades.clear()
+        self.clear_rotation_cache()
+        self._sheets.clear()
+        self._atlas_sprites.clear()
+        self._atlas_files.clear()
+        self._atlas_loaded = False
     
     def preload_all(self):
         """Pré-carrega todos os assets principais."""
-        from .constants import TILE_SIZE
-        
-        # Imagens do jogo
-        images = [
-            "player_car.png",
-            "enemy_car.png",
-            "flag.png",
-            "smoke.png",
-            "icon_life.png",
-            "title.png",
-            "ui_panel.png"
-        ]
-        
-        for img in images:
-            self.load_image(img)
+        from .constants import SMOKE_PARTICLE_SIZE, SMOKE_FADE_STEPS
+        
+        # Sprites e tiles do jogo, numa folha só
+        if not self._atlas_loaded:
+            self.load_atlas()
+        
+        # Carros giram o tempo todo: todas as faixas já na carga
+        for img in ("player_car.png", "enemy_car.png"):
+            self.prerotate(self.load_image(img, scale=(28, 28)))
+        
+        # Fade-out das partículas de fumaça
+        size = (SMOKE_PARTICLE_SIZE, SMOKE_PARTICLE_SIZE)
+        self.get_fade_frames(self.load_image("smoke.png", scale=size), SMOKE_FADE_STEPS)
         
         # Tiles
         for tile_type in range(4):
@@ -2,8 +2,322 @@
 Sistema de detecção de colisão.
 """
 import math
-from typing import List, Tuple
-from .constants import TILE_SIZE, TILE_WALL, TILE_BORDER
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .constants import (
+    TILE_SIZE, TILE_WALL, TILE_BORDER, COLLISION_CELL_SIZE, INFLATED_MAP_MAX_TILES,
+    COLLISION_SWEEP_MARGIN
+)
+
+
+class GridCache(threading.local):
+    """
+    Último grid usado e o objeto derivado dele (máscara, grafo, tabela).
+    
+    Os níveis são estáticos depois de carregados, então uma entrada basta.
+    Cada thread tem a sua: os workers do serviço assíncrono buscam em cópias
+    do grid e não despejam a entrada do loop principal. A entrada é uma
+    tupla só, trocada de uma vez.
+    """
+    
+    entry: Optional[Tuple[Any, Any]] = None
+    
+    def get(self, grid: Any, default: Any = None) -> Any:
+        """Retorna o objeto guardado para o grid (``default`` se é outro grid)."""
+        entry = self.entry
+        if entry is not None and entry[0] is grid:
+            return entry[1]
+        return default
+    
+    def put(self, grid: Any, value: Any) -> Any:
+        """Guarda o objeto de um grid e o retorna."""
+        self.entry = (grid, value)
+        return value
+    
+    def forget(self, grid: Any):
+        """Descarta a entrada se ela é a do grid informado."""
+        entry = self.entry
+        if entry is not None and entry[0] is grid:
+            self.entry = None
+
+
+class BlockedMask:
+    """
+    Tiles bloqueados do grid em um bytearray plano, com moldura.
+    
+    O tile (tx, ty) fica no índice ``(ty + 1) * stride + tx + 1``. A
+    moldura de um tile em volta do mapa é marcada como bloqueada (fora do
+    mapa = bloqueado), então os vizinhos de qualquer tile do mapa podem ser
+    lidos sem verificar limites. Uma linha extra no fim cobre também os
+    vizinhos dos tiles da moldura (índices negativos caem no fim).
+    """
+    
+    # Última máscara construída, por thread
+    _cache = GridCache()
+    
+    def __init__(self, grid: List[List[int]]):
+        """
+        Constrói a máscara.
+        
+        Args:
+            grid: Grid do mapa
+        """
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height > 0 else 0
+        self.stride = self.width + 2
+        
+        blocked = (TILE_WALL, TILE_BORDER)
+        cells = bytearray([1]) * (self.stride * (self.height + 3))
+        for ty, row in enumerate(grid):
+            base = (ty + 1) * self.stride + 1
+            cells[base:base + self.width] = bytes(
+                1 if tile in blocked else 0 for tile in row)
+        self.cells = cells
+        
+        # Mapas inflados já construídos, por tamanho de entidade
+        self._inflated: Dict[Tuple[float, float], "InflatedMap"] = {}
+    
+    @classmethod
+    def for_grid(cls, grid: List[List[int]]) -> "BlockedMask":
+        """Retorna a máscara do grid, construindo apenas quando o grid muda."""
+        mask = cls._cache.get(grid)
+        if mask is None:
+            mask = cls._cache.put(grid, cls(grid))
+        return mask
+    
+    @classmethod
+    def forget(cls, grid: List[List[int]]):
+        """Descarta a máscara guardada se ela é a do grid informado."""
+        cls._cache.forget(grid)
+    
+    def index(self, tx: int, ty: int) -> int:
+        """Índice de um tile em ``cells`` (válido de -1 até width/height)."""
+        return (ty + 1) * self.stride + tx + 1
+    
+    def tile_at(self, index: int) -> Tuple[int, int]:
+        """Tile de um índice de ``cells``."""
+        return index % self.stride - 1, index // self.stride - 1
+    
+    def contains(self, tx: int, ty: int) -> bool:
+        """True se o tile está no mapa ou na moldura."""
+        return -1 <= tx <= self.width and -1 <= ty <= self.height
+    
+    def is_blocked(self, tx: int, ty: int) -> bool:
+        """
+        Verifica se um tile é bloqueado.
+        
+        Args:
+            tx, ty: Coordenadas do tile (qualquer valor)
+        
+        Returns:
+            True se o tile bloqueia passagem
+        """
+        if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
+            return True
+        return self.cells[(ty + 1) * self.stride + tx + 1] == 1
+    
+    def inflated(self, width: float, height: float) -> "InflatedMap":
+        """
+        Retorna o mapa inflado para um tamanho de entidade.
+        
+        Args:
+            width, height: Dimensões da caixa de colisão
+        
+        Returns:
+            Mapa construído na primeira chamada e reaproveitado depois
+        """
+        key = (width, height)
+        inflated = self._inflated.get(key)
+        if inflated is None:
+            inflated = self._inflated[key] = InflatedMap(self, width, height)
+        return inflated
+
+
+class InflatedMap:
+    """
+    Mapa de colisão no espaço de configuração de um tamanho de entidade.
+    
+    As paredes são engordadas pela metade da caixa da entidade, em células
+    de COLLISION_CELL_SIZE pixels, e testar um movimento vira uma consulta
+    na célula do centro. Células onde a resposta muda dentro da própria
+    célula (perto das bordas engordadas) ficam MIXED e usam o teste exato.
+    """
+    
+    FREE = 0
+    BLOCKED = 1
+    MIXED = 2
+    
+    # Folga nas bordas das células contra arredondamento
+    _EPSILON = 1e-6
+    
+    def __init__(self, mask: BlockedMask, width: float, height: float,
+                 cell_size: int = COLLISION_CELL_SIZE):
+        """
+        Constrói o mapa.
+        
+        Args:
+            mask: Máscara de tiles bloqueados do nível
+            width, height: Dimensões da caixa de colisão
+            cell_size: Lado de cada célula em pixels
+        """
+        self.mask = mask
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        
+        # Mapas grandes demais ficam sem células (todo teste é exato)
+        if mask.width * mask.height > INFLATED_MAP_MAX_TILES:
+            self.cols = self.rows = 0
+        else:
+            self.cols = -(-mask.width * TILE_SIZE // cell_size)
+            self.rows = -(-mask.height * TILE_SIZE // cell_size)
+        self.cells = self._build()
+    
+    def _axis_ranges(self, count: int, half: float,
+                     tiles: int) -> List[Tuple[int, int, int, int]]:
+        """
+        Tiles ocupados ao longo de um eixo para cada célula.
+        
+        Returns:
+            (menor primeiro, maior primeiro, menor último, maior último)
+            tile ocupado quando o centro percorre a célula
+        """
+        size = self.cell_size
+        eps = self._EPSILON
+        ranges = []
+        for k in range(count):
+            low = k * size - eps
+            high = (k + 1) * size + eps
+            ranges.append(tuple(
+                min(max(int(edge // TILE_SIZE), -1), tiles)
+                for edge in (low - half, high - half, low + half, high + half)
+            ))
+        return ranges
+    
+    def _build(self) -> bytearray:
+        """Classifica cada célula pelas caixas de tiles que ela pode ocupar."""
+        mask = self.mask
+        stride = mask.stride
+        rows = mask.height + 2
+        
+        # Somas acumuladas dos tiles bloqueados (com moldura)
+        prefix = [[0] * (stride + 1) for _ in range(rows + 1)]
+        for r in range(rows):
+            running = 0
+            line = mask.cells[r * stride:(r + 1) * stride]
+            above = prefix[r]
+            current = prefix[r + 1]
+            for c in range(stride):
+                running += line[c]
+                current[c + 1] = above[c + 1] + running
+        
+        def count(x0, x1, y0, y1):
+            """Tiles bloqueados na caixa de tiles (inclusiva)."""
+            return (prefix[y1 + 2][x1 + 2] - prefix[y0 + 1][x1 + 2] -
+                    prefix[y1 + 2][x0 + 1] + prefix[y0 + 1][x0 + 1])
+        
+        x_ranges = self._axis_ranges(self.cols, self.width / 2, mask.width)
+        y_ranges = self._axis_ranges(self.rows, self.height / 2, mask.height)
+        
+        # Células com as mesmas faixas de tiles têm a mesma resposta
+        cells = bytearray()
+        rows_done: Dict[tuple, bytes] = {}
+        for y_range in y_ranges:
+            row = rows_done.get(y_range)
+            if row is None:
+                top_min, top_max, bottom_min, bottom_max = y_range
+                values: Dict[tuple, int] = {}
+                line = bytearray()
+                for x_range in x_ranges:
+                    value = values.get(x_range)
+                    if value is None:
+                        left_min, left_max, right_min, right_max = x_range
+                        if not count(left_min, right_max, top_min, bottom_max):
+                            value = self.FREE
+                        elif (left_max <= right_min and top_max <= bottom_min and
+                              count(left_max, right_min, top_max, bottom_min)):
+                            value = self.BLOCKED
+                        else:
+                            value = self.MIXED
+                        values[x_range] = value
+                    line.append(value)
+                row = rows_done[y_range] = bytes(line)
+            cells += row
+        return cells
+    
+    def collides(self, x: float, y: float) -> bool:
+        """
+        Verifica colisão da entidade centrada em (x, y).
+        
+        Returns:
+            O mesmo que check_tile_collision com as dimensões do mapa
+        """
+        col = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            value = self.cells[row * self.cols + col]
+            if value != self.MIXED:
+                return value == self.BLOCKED
+        return check_tile_collision(x, y, self.width, self.height, self.mask)
+
+
+def inflated_map(grid: List[List[int]], width: float, height: float) -> InflatedMap:
+    """
+    Retorna o mapa inflado de um grid para um tamanho de entidade.
+    
+    Args:
+        grid: Grid do mapa (ou sua BlockedMask)
+        width, height: Dimensões da caixa de colisão
+    """
+    return as_blocked_mask(grid).inflated(width, height)
+
+
+# Caches derivados de grids (grafos, tabelas, máscaras NumPy) avisados
+# quando um grid é alterado no lugar
+_grid_listeners: List[Callable[[List[List[int]], Optional[List[Tuple[int, int]]]], None]] = []
+
+
+def add_grid_listener(callback: Callable[[List[List[int]],
+                                          Optional[List[Tuple[int, int]]]], None]):
+    """
+    Registra uma função chamada por ``mark_grid_changed``.
+    
+    Args:
+        callback: Recebe o grid alterado e os tiles que mudaram (None =
+            qualquer tile)
+    """
+    if callback not in _grid_listeners:
+        _grid_listeners.append(callback)
+
+
+def mark_grid_changed(grid: List[List[int]],
+                      tiles: Optional[Iterable[Tuple[int, int]]] = None):
+    """
+    Avisa que um grid foi alterado no lugar.
+    
+    Os caches por grid (máscara, grafos, tabelas) são reaproveitados
+    enquanto o objeto do grid é o mesmo, então toda edição de tiles de um
+    grid já carregado precisa passar por aqui.
+    
+    Args:
+        grid: Grid alterado
+        tiles: Tiles que mudaram (None = qualquer tile)
+    """
+    if tiles is not None:
+        tiles = list(tiles)
+    BlockedMask.forget(grid)
+    for callback in list(_grid_listeners):
+        callback(grid, tiles)
+
+
+def as_blocked_mask(grid: List[List[int]]) -> BlockedMask:
+    """Retorna a máscara de um grid (ou a própria máscara)."""
+    mask = BlockedMask._cache.get(grid)
+    if mask is not None:
+        return mask
+    if isinstance(grid, BlockedMask):
+        return grid
+    return BlockedMask.for_grid(grid)
 
 
 def check_tile_collision(x: float, y: float, width: float, height: float,
@@ -14,43 +328,233 @@ def check_tile_collision(x: float, y: float, width: float, height: float,
     Args:
         x, y: Posição central da entidade
         width, height: Dimensões da entidade
-        grid: Grid do mapa
+        grid: Grid do mapa (ou sua BlockedMask)
     
     Returns:
         True se há colisão
     """
+    # Caminho rápido: máscara do nível atual
+    entry = BlockedMask._cache.entry
+    if entry is not None and entry[0] is grid:
+        mask = entry[1]
+    else:
+        mask = as_blocked_mask(grid)
+    
     # Calcula tiles que a entidade ocupa
     left = int((x - width / 2) // TILE_SIZE)
     right = int((x + width / 2) // TILE_SIZE)
     top = int((y - height / 2) // TILE_SIZE)
     bottom = int((y + height / 2) // TILE_SIZE)
     
-    # Verifica cada tile
+    # Fora do mapa: presos à moldura, que é bloqueada
+    if left < 0 or top < 0 or right >= mask.width or bottom >= mask.height:
+        last_x = mask.width
+        last_y = mask.height
+        left = -1 if left < -1 else (last_x if left > last_x else left)
+        right = -1 if right < -1 else (last_x if right > last_x else right)
+        top = -1 if top < -1 else (last_y if top > last_y else top)
+        bottom = -1 if bottom < -1 else (last_y if bottom > last_y else bottom)
+    
+    cells = mask.cells
+    stride = mask.stride
+    
+    # Entidades até o tamanho de um tile ocupam no máximo 2x2 tiles
+    span = right - left
+    if span <= 1 and bottom - top <= 1:
+        upper = (top + 1) * stride + 1 + left
+        lower = (bottom + 1) * stride + 1 + left
+        return bool(cells[upper] or cells[upper + span] or
+                    cells[lower] or cells[lower + span])
+    
+    # Verifica cada tile (sem verificar limites)
     for ty in range(top, bottom + 1):
-        for tx in range(left, right + 1):
-            if is_tile_blocked(tx, ty, grid):
+        base = (ty + 1) * stride + 1
+        for index in range(base + left, base + right + 1):
+            if cells[index]:
                 return True
     
     return False
 
 
+# Distância mantida da parede no contato (a colisão inclui a borda do tile)
+SWEEP_SKIN = 1e-4
+
+
+def sweep_aabb(x: float, y: float, width: float, height: float,
+               dx: float, dy: float,
+               grid: List[List[int]]) -> Tuple[float, float, float]:
+    """
+    Varre a caixa da entidade ao longo de (dx, dy) contra os tiles bloqueados.
+    
+    Usa a mesma regra de sobreposição de check_tile_collision. Tiles que a
+    caixa já sobrepõe no início são ignorados, para que uma entidade presa
+    numa parede consiga sair.
+    
+    Args:
+        x, y: Posição central da entidade
+        width, height: Dimensões da entidade
+        dx, dy: Deslocamento do passo
+        grid: Grid do mapa (ou sua BlockedMask)
+    
+    Returns:
+        Tupla (instante de impacto em [0, 1], normal x, normal y); sem
+        impacto, (1.0, 0.0, 0.0)
+    """
+    mask = as_blocked_mask(grid)
+    half_w = width / 2
+    half_h = height / 2
+    
+    # Tiles que a caixa pode tocar no trajeto, presos à moldura
+    last_x = mask.width
+    last_y = mask.height
+    left = min(max(int((min(x, x + dx) - half_w) // TILE_SIZE), -1), last_x)
+    right = min(max(int((max(x, x + dx) + half_w) // TILE_SIZE), -1), last_x)
+    top = min(max(int((min(y, y + dy) - half_h) // TILE_SIZE), -1), last_y)
+    bottom = min(max(int((max(y, y + dy) + half_h) // TILE_SIZE), -1), last_y)
+    
+    cells = mask.cells
+    stride = mask.stride
+    inf = math.inf
+    best = 1.0
+    normal_x = normal_y = 0.0
+    
+    for ty in range(top, bottom + 1):
+        # Faixa de centros em y que sobrepõe a linha de tiles
+        y_low = ty * TILE_SIZE - half_h
+        y_high = (ty + 1) * TILE_SIZE + half_h
+        if dy > 0:
+            enter_y = (y_low - y) / dy
+            exit_y = (y_high - y) / dy
+        elif dy < 0:
+            enter_y = (y_high - y) / dy
+            exit_y = (y_low - y) / dy
+        elif y_low <= y < y_high:
+            enter_y, exit_y = -inf, inf
+        else:
+            continue
+        if enter_y > best or exit_y <= 0:
+            continue
+        
+        base = (ty + 1) * stride + 1
+        for tx in range(left, right + 1):
+            if not cells[base + tx]:
+                continue
+            x_low = tx * TILE_SIZE - half_w
+            x_high = (tx + 1) * TILE_SIZE + half_w
+            if dx > 0:
+                enter_x = (x_low - x) / dx
+                exit_x = (x_high - x) / dx
+            elif dx < 0:
+                enter_x = (x_high - x) / dx
+                exit_x = (x_low - x) / dx
+            elif x_low <= x < x_high:
+                enter_x, exit_x = -inf, inf
+            else:
+                continue
+            
+            enter = enter_x if enter_x > enter_y else enter_y
+            leave = exit_x if exit_x < exit_y else exit_y
+            if enter < 0 or enter > best or enter >= leave:
+                continue
+            
+            # Quina tocada junto com uma face: vale a normal da face
+            if enter == best and enter_x == enter_y and (normal_x or normal_y):
+                continue
+            
+            # A normal é a do eixo que entrou por último
+            if enter_x > enter_y:
+                best, normal_x, normal_y = enter, (-1.0 if dx > 0 else 1.0), 0.0
+            else:
+                best, normal_x, normal_y = enter, 0.0, (-1.0 if dy > 0 else 1.0)
+    
+    return best, normal_x, normal_y
+
+
+def move_and_slide(x: float, y: float, width: float, height: float,
+                   dx: float, dy: float, grid: List[List[int]],
+                   clearance: Optional[InflatedMap] = None
+                   ) -> Tuple[float, float, bool, bool]:
+    """
+    Move a entidade até o contato e desliza o resto do passo pela parede.
+    
+    Passos de até COLLISION_SWEEP_MARGIN pixels em cada eixo, com a caixa
+    engordada por essa margem livre, resolvem com uma consulta ao mapa
+    inflado; os demais são varridos com sweep_aabb, sem atravessar paredes
+    finas qualquer que seja o tamanho do passo.
+    
+    Args:
+        x, y: Posição central da entidade
+        width, height: Dimensões da entidade
+        dx, dy: Deslocamento do passo
+        grid: Grid do mapa (ou sua BlockedMask)
+        clearance: Mapa inflado da caixa engordada pela margem (opcional)
+    
+    Returns:
+        Tupla (x, y, bateu em x, bateu em y)
+    """
+    margin = COLLISION_SWEEP_MARGIN
+    if -margin <= dx <= margin and -margin <= dy <= margin:
+        if clearance is None:
+            clearance = as_blocked_mask(grid).inflated(width + 2 * margin,
+                                                       height + 2 * margin)
+        if not clearance.collides(x, y):
+            return x + dx, y + dy, False, False
+    
+    start_x, start_y = x, y
+    hit_x = hit_y = False
+    
+    # Um impacto por eixo: depois do segundo não sobra movimento
+    for _ in range(2):
+        if not dx and not dy:
+            break
+        toi, normal_x, normal_y = sweep_aabb(x, y, width, height, dx, dy, grid)
+        if not normal_x and not normal_y:
+            x += dx
+            y += dy
+            break
+        
+        x += dx * toi
+        y += dy * toi
+        remaining = 1.0 - toi
+        if normal_x:
+            x += normal_x * SWEEP_SKIN
+            hit_x = True
+            dx = 0.0
+            dy *= remaining
+        else:
+            y += normal_y * SWEEP_SKIN
+            hit_y = True
+            dy = 0.0
+            dx *= remaining
+    
+    # Arredondamento nunca deixa a entidade terminar dentro de uma parede
+    if (check_tile_collision(x, y, width, height, grid) and
+            not check_tile_collision(start_x, start_y, width, height, grid)):
+        return start_x, start_y, hit_x, hit_y
+    return x, y, hit_x, hit_y
+
+
 def is_tile_blocked(tx: int, ty: int, grid: List[List[int]]) -> bool:
     """
     Verifica se um tile é bloqueado.
     
     Args:
         tx, ty: Coordenadas do tile
-        grid: Grid do mapa
+        grid: Grid do mapa (ou sua BlockedMask)
     
     Returns:
         True se o tile bloqueia passagem
     """
+    entry = BlockedMask._cache.entry
+    if entry is not None and entry[0] is grid:
+        mask = entry[1]
+    else:
+        mask = as_blocked_mask(grid)
+    
     # Fora do mapa = bloqueado
-    if ty < 0 or ty >= len(grid) or tx < 0 or tx >= len(grid[0]):
+    if tx < 0 or ty < 0 or tx >= mask.width or ty >= mask.height:
         return True
-    
-    tile_type = grid[ty][tx]
-    return tile_type in (TILE_WALL, TILE_BORDER)
+    return mask.cells[(ty + 1) * mask.stride + tx + 1] == 1
 
 
 def check_circle_collision(x1: float, y1: float, r1: float,
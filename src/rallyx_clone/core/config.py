@@ -3,7 +3,7 @@ Configurações mutáveis do jogo.
 """
 import json
 import os
-from .constants import DIFFICULTY_NORMAL
+from .constants import DIFFICULTY_NORMAL, PATHFINDING_BFS
 
 
 class Config:
@@ -28,6 +28,10 @@ class Config:
         self.sfx_volume = 0.8
         self.fullscreen = False
         self.vsync = True
+        self.pathfinding_engine = PATHFINDING_BFS
+        self.precompute_paths = False
+        self.path_workers = 0  # 0 = buscas fatiadas na thread principal
+        self.dirty_rects = False  # envia só as áreas que mudaram (sem flip)
         
         # Caminho do arquivo de configuração
         self._config_path = self._get_config_path()
@@ -51,6 +55,13 @@ class Config:
                     self.sfx_volume = data.get("sfx_volume", self.sfx_volume)
                     self.fullscreen = data.get("fullscreen", self.fullscreen)
                     self.vsync = data.get("vsync", self.vsync)
+                    self.pathfinding_engine = data.get("pathfinding_engine",
+                                                       self.pathfinding_engine)
+                    self.precompute_paths = data.get("precompute_paths",
+                                                     self.precompute_paths)
+                    self.path_workers = data.get("path_workers",
+                                                 self.path_workers)
+                    self.dirty_rects = data.get("dirty_rects", self.dirty_rects)
         except (json.JSONDecodeError, IOError):
             pass  # Usa valores padrão
     
@@ -61,7 +72,11 @@ class Config:
             "music_volume": self.music_volume,
             "sfx_volume": self.sfx_volume,
             "fullscreen": self.fullscreen,
-            "vsync": self.vsync
+            "vsync": self.vsync,
+            "pathfinding_engine": self.pathfinding_engine,
+            "precompute_paths": self.precompute_paths,
+            "path_workers": self.path_workers,
+            "dirty_rects": self.dirty_rects
         }
         try:
             with open(self._config_path, 'w') as f:
@@ -76,3 +91,7 @@ class Config:
         self.sfx_volume = 0.8
         self.fullscreen = False
         self.vsync = True
+        self.pathfinding_engine = PATHFINDING_BFS
+        self.precompute_paths = False
+        self.path_workers = 0
+        self.dirty_rects = False
@@ -6,9 +6,22 @@ Constantes globais do jogo Rally-X Clone.
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+ROTATION_BUCKETS = 64  # ângulos pré-renderizados por sprite (cache de rotação)
+DIRTY_RECT_FULL_FRACTION = 0.5  # acima dessa fração da tela, flip em vez de update
+ATLAS_SHEET_WIDTH = 512  # largura mínima da folha montada com os sprites avulsos
+
+# Camadas da fila de renderização (menores são desenhadas primeiro)
+RENDER_LAYER_FLAGS = 0
+RENDER_LAYER_SMOKE = 1
+RENDER_LAYER_CARS = 2
 
 # Tiles
 TILE_SIZE = 32
+COLLISION_CELL_SIZE = 4  # px por célula dos mapas de colisão inflados
+MAP_CHUNK_TILES = 16  # lado, em tiles, dos pedaços do mapa renderizado
+MAP_CHUNK_CACHE_BYTES = 32 * 1024 * 1024  # teto de memória dos pedaços em cache
+INFLATED_MAP_MAX_TILES = 65536  # acima disso a colisão usa só o teste exato
+COLLISION_SWEEP_MARGIN = 4  # px; passos menores que isso dispensam a varredura
 
 # Cores
 COLOR_BLACK = (0, 0, 0)
@@ -48,11 +61,40 @@ SMOKE_DURATION = 2.5  # segundos
 SMOKE_COOLDOWN = 4.0  # segundos
 SMOKE_RADIUS = 48  # pixels
 SMOKE_SLOW_FACTOR = 0.3
+SMOKE_POOL_SIZE = 32  # fumaças simultâneas (a mais antiga é reciclada)
+SMOKE_FADE_STEPS = 32  # níveis de alfa pré-renderizados do fade-out
+SMOKE_PARTICLE_SIZE = 32  # pixels (sprite de cada partícula, no máximo um tile)
+SMOKE_PARTICLE_CAPACITY = 64  # partículas vivas por nuvem
+SMOKE_PARTICLE_RATE = 40.0  # partículas por segundo por nuvem
+SMOKE_PARTICLE_BURST = 24  # partículas emitidas quando a nuvem nasce
+SMOKE_PARTICLE_LIFE = 0.9  # segundos
+SMOKE_PARTICLE_SPEED = 14.0  # px/s, para fora do centro
 
 # Inimigos
 ENEMY_SPEED = 2.5
 ENEMY_CONFUSED_DURATION = 2.0  # segundos
 ENEMY_PATH_RECALC_INTERVAL = 0.5  # segundos
+ENEMY_PATH_MAX_DISTANCE = 50  # tiles por busca (engines de longo alcance: o mapa todo)
+ENTITY_STORE_MIN_ENEMIES = 64  # a partir disso o mundo usa entidades em colunas
+ENTITY_STORE_CAPACITY = 64  # slots iniciais de cada coluna (dobra quando enche)
+
+# Pathfinding (engines de busca selecionáveis)
+PATHFINDING_BFS = "bfs"
+PATHFINDING_ASTAR = "astar"
+PATHFINDING_BIDIRECTIONAL = "bidirectional"
+PATHFINDING_TABLE = "table"
+PATHFINDING_HIERARCHICAL = "hpa"
+PATHFINDING_DSTAR_LITE = "dstar_lite"
+PATHFINDING_JUNCTION = "junction"
+PATH_TABLE_MAX_TILES = 4096  # tiles livres (tabela de N² bytes)
+PATH_TABLE_CACHE_FILES = 8  # tabelas mantidas em saves/cache (as mais recentes)
+HPA_CLUSTER_SIZE = 16  # tiles por lado de cada cluster
+HPA_ENTRANCE_SPLIT = 6  # trechos maiores ganham duas entradas
+FLOW_FIELD_MAX_TILES = 4096  # acima disso cada inimigo usa sua engine
+PATH_BUDGET_MS = 2.0  # tempo de busca por frame (escalonador)
+PATH_WORKERS = 2  # workers do serviço assíncrono (quando ativado)
+PATH_STEP_BATCH = 64  # nós expandidos entre pausas de uma busca fatiada
+WAVEFRONT_MIN_TILES = 2048  # abaixo disso a BFS com deque é mais rápida
 
 # Pontuação
 SCORE_FLAG = 100
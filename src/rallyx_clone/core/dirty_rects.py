@@ -0,0 +1,150 @@
+"""
+Apresentação por retângulos sujos (dirty rects).
+
+A cena continua desenhando o frame inteiro na superfície da tela; o que muda
+é o envio para a janela. Em vez de ``pygame.display.flip()`` a cada frame,
+só as áreas que mudaram vão para ``pygame.display.update(rects)``.
+
+Uma área muda quando algo foi desenhado nela neste frame ou no anterior
+(o sprite que saiu de lá deixou o fundo exposto), por isso a DirtyRegion
+junta as áreas de dois frames seguidos. Quando a área suja passa de
+DIRTY_RECT_FULL_FRACTION da tela, o flip sai mais barato que vários updates.
+"""
+from typing import Iterable, List, Optional
+
+import pygame
+
+from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, DIRTY_RECT_FULL_FRACTION
+
+
+class DirtyRegion:
+    """Acumula as áreas desenhadas por uma cena, frame a frame."""
+    
+    def __init__(self):
+        """Cria a região pedindo a tela toda no primeiro frame."""
+        self._current: List[pygame.Rect] = []
+        self._previous: List[pygame.Rect] = []
+        self._full = True
+    
+    def invalidate(self):
+        """Pede a tela toda no próximo frame (troca de cena, menu mudou)."""
+        self._full = True
+    
+    def add(self, rect: Optional[pygame.Rect]):
+        """
+        Marca uma área desenhada neste frame.
+        
+        Args:
+            rect: Área da tela (None e áreas vazias são ignorados)
+        """
+        if rect:
+            self._current.append(pygame.Rect(rect))
+    
+    def extend(self, rects: Iterable[Optional[pygame.Rect]]):
+        """
+        Marca várias áreas desenhadas neste frame.
+        
+        Args:
+            rects: Áreas da tela
+        """
+        for rect in rects:
+            self.add(rect)
+    
+    def take(self) -> Optional[List[pygame.Rect]]:
+        """
+        Fecha o frame e retorna o que precisa ir para a janela.
+        
+        Returns:
+            None se a tela toda precisa ser enviada; senão as áreas deste
+            frame mais as do anterior (lista vazia = nada mudou)
+        """
+        if self._full:
+            self._full = False
+            rects = None
+        else:
+            rects = self._previous + self._current
+        
+        self._previous, self._current = self._current, self._previous
+        self._current.clear()
+        return rects
+
+
+class DisplayPresenter:
+    """Envia o frame para a janela com flip ou update, o que for mais barato."""
+    
+    def __init__(self, full_fraction: float = DIRTY_RECT_FULL_FRACTION):
+        """
+        Cria o apresentador.
+        
+        Args:
+            full_fraction: Fração da tela acima da qual usa flip
+        """
+        self.full_fraction = full_fraction
+        self._force_full = False
+        
+        self.flips = 0
+        self.updates = 0
+        self.skipped = 0
+        self.last_fraction = 1.0  # Fração da tela enviada no último present
+    
+    def invalidate(self):
+        """Força um flip no próximo present (janela exposta, modo de vídeo)."""
+        self._force_full = True
+    
+    def present(self, rects: Optional[List[pygame.Rect]],
+                screen_rect: Optional[pygame.Rect] = None) -> str:
+        """
+        Envia o frame para a janela.
+        
+        Args:
+            rects: Áreas que mudaram (None = tela toda, [] = nada)
+            screen_rect: Área da tela (padrão: SCREEN_WIDTH x SCREEN_HEIGHT)
+        
+        Returns:
+            "flip", "update" ou "skip", conforme o caminho usado
+        """
+        if screen_rect is None:
+            screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        
+        if rects is None or self._force_full:
+            return self._flip()
+        
+        clipped = [rect.clip(screen_rect) for rect in rects]
+        clipped = [rect for rect in clipped if rect]
+        if not clipped:
+            self.skipped += 1
+            self.last_fraction = 0.0
+            return "skip"
+        
+        # Sobreposições contam duas vezes: erra para o lado do flip
+        area = sum(rect.width * rect.height for rect in clipped)
+        fraction = area / float(screen_rect.width * screen_rect.height)
+        if fraction >= self.full_fraction:
+            return self._flip()
+        
+        pygame.display.update(clipped)
+        self.updates += 1
+        self.last_fraction = fraction
+        return "update"
+    
+    def _flip(self) -> str:
+        """Envia a tela toda."""
+        pygame.display.flip()
+        self._force_full = False
+        self.flips += 1
+        self.last_fraction = 1.0
+        return "flip"
+    
+    def stats(self) -> dict:
+        """
+        Retorna contadores de apresentação.
+        
+        Returns:
+            Dict com flips, updates, skipped e last_fraction
+        """
+        return {
+            "flips": self.flips,
+            "updates": self.updates,
+            "skipped": self.skipped,
+            "last_fraction": self.last_fraction,
+        }
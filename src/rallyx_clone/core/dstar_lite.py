@@ -0,0 +1,272 @@
+"""
+Planejador incremental D* Lite para perseguir um alvo em movimento.
+
+A busca é enraizada no destino (o jogador) e guarda g/rhs entre chamadas.
+O inimigo andando é tratado pelo termo km do D* Lite; o destino mudando de
+tile equivale a trocar a aresta de custo zero até um sumidouro virtual, e
+tiles alterados no grid são reparados como mudanças de custo de arestas.
+Assim cada recálculo processa apenas os nós afetados.
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+from .constants import TILE_WALL, TILE_BORDER, PATHFINDING_DSTAR_LITE
+from .pathfinding import (
+    DIRECTIONS, PathfindingEngine, register_engine, bfs_pathfind
+)
+
+Tile = Tuple[int, int]
+INFINITY = float("inf")
+
+
+class DStarLite:
+    """Estado de busca incremental de um único perseguidor."""
+    
+    def __init__(self):
+        self.grid: Optional[List[List[int]]] = None
+        self.width = 0
+        self.height = 0
+        self.start: Optional[Tile] = None
+        self.goal: Optional[Tile] = None
+        self.last_expanded = 0
+        
+        self._g: Dict[Tile, float] = {}
+        self._rhs: Dict[Tile, float] = {}
+        self._queue: List[tuple] = []
+        self._queued: Dict[Tile, Tuple[float, float]] = {}
+        self._km = 0
+        self._last_start: Optional[Tile] = None
+        self._counter = 0
+    
+    def reset(self):
+        """Descarta todo o estado de busca."""
+        self.grid = None
+        self.start = None
+        self.goal = None
+        self._g.clear()
+        self._rhs.clear()
+        self._queue.clear()
+        self._queued.clear()
+        self._km = 0
+        self._last_start = None
+    
+    def _initialize(self, start: Tile, goal: Tile, grid: List[List[int]]):
+        """Começa uma busca nova."""
+        self.reset()
+        self.grid = grid
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height > 0 else 0
+        self.start = start
+        self.goal = goal
+        self._last_start = start
+        self._rhs[goal] = 0
+        self._push(goal)
+    
+    def is_free(self, tile: Tile) -> bool:
+        """Retorna True se o tile existe e não bloqueia passagem."""
+        tx, ty = tile
+        if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
+            return False
+        return self.grid[ty][tx] not in (TILE_WALL, TILE_BORDER)
+    
+    def _neighbours(self, tile: Tile) -> Iterable[Tile]:
+        """Vizinhos livres (custo 1 em ambos os sentidos)."""
+        tx, ty = tile
+        for dx, dy in DIRECTIONS:
+            neighbour = (tx + dx, ty + dy)
+            if self.is_free(neighbour):
+                yield neighbour
+    
+    def _heuristic(self, tile: Tile) -> int:
+        """Manhattan até o início (a busca vai do destino ao início)."""
+        return abs(tile[0] - self.start[0]) + abs(tile[1] - self.start[1])
+    
+    def _key(self, tile: Tile) -> Tuple[float, float]:
+        """Chave de prioridade do D* Lite."""
+        best = min(self._g.get(tile, INFINITY), self._rhs.get(tile, INFINITY))
+        return best + self._heuristic(tile) + self._km, best
+    
+    def _push(self, tile: Tile):
+        """Insere ou atualiza um tile na fila (entradas antigas ficam obsoletas)."""
+        key = self._key(tile)
+        self._queued[tile] = key
+        heapq.heappush(self._queue, (key[0], key[1], self._counter, tile))
+        self._counter += 1
+    
+    def _top(self) -> Optional[tuple]:
+        """Topo da fila, descartando entradas obsoletas."""
+        queue = self._queue
+        while queue:
+            k1, k2, _, tile = queue[0]
+            if self._queued.get(tile) == (k1, k2):
+                return queue[0]
+            heapq.heappop(queue)
+        return None
+    
+    def _update_vertex(self, tile: Tile):
+        """Recalcula rhs de um tile e sua presença na fila."""
+        if tile != self.goal:
+            best = INFINITY
+            if self.is_free(tile):
+                g = self._g
+                for neighbour in self._neighbours(tile):
+                    cost = g.get(neighbour, INFINITY) + 1
+                    if cost < best:
+                        best = cost
+            self._rhs[tile] = best
+        
+        self._queued.pop(tile, None)
+        if self._g.get(tile, INFINITY) != self._rhs.get(tile, INFINITY):
+            self._push(tile)
+    
+    def _compute_shortest_path(self):
+        """Processa a fila até o início ficar consistente."""
+        g = self._g
+        rhs = self._rhs
+        start = self.start
+        
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            start_key = self._key(start)
+            if ((top[0], top[1]) >= start_key and
+                    rhs.get(start, INFINITY) == g.get(start, INFINITY)):
+                break
+            
+            k_old = (top[0], top[1])
+            tile = top[3]
+            k_new = self._key(tile)
+            self.last_expanded += 1
+            
+            if k_old < k_new:
+                self._push(tile)
+            elif g.get(tile, INFINITY) > rhs.get(tile, INFINITY):
+                # Sobreconsistente: fixa g e propaga para os vizinhos
+                heapq.heappop(self._queue)
+                del self._queued[tile]
+                g[tile] = rhs[tile]
+                for neighbour in self._neighbours(tile):
+                    self._update_vertex(neighbour)
+            else:
+                # Subconsistente: invalida g e reavalia tile e vizinhos
+                heapq.heappop(self._queue)
+                del self._queued[tile]
+                g[tile] = INFINITY
+                self._update_vertex(tile)
+                for neighbour in self._neighbours(tile):
+                    self._update_vertex(neighbour)
+    
+    def tiles_changed(self, tiles: Iterable[Tile]):
+        """
+        Repara a busca depois que tiles do grid mudaram.
+        
+        Args:
+            tiles: Tiles cujo tipo (livre/bloqueado) mudou
+        """
+        if self.grid is None:
+            return
+        for tile in tiles:
+            self._update_vertex(tile)
+            tx, ty = tile
+            for dx, dy in DIRECTIONS:
+                self._update_vertex((tx + dx, ty + dy))
+    
+    def plan(self, start: Tile, goal: Tile,
+             grid: List[List[int]]) -> List[Tile]:
+        """
+        Atualiza a busca para novo início/destino e retorna o caminho.
+        
+        Args:
+            start: Tile atual do perseguidor
+            goal: Tile do alvo
+            grid: Grid do mapa
+        
+        Returns:
+            Lista de tiles do caminho (vazio se não encontrou)
+        """
+        self.last_expanded = 0
+        if grid is not self.grid or self.start is None:
+            self._initialize(start, goal, grid)
+        else:
+            # Perseguidor andou: corrige as chaves pelo termo km
+            if start != self.start:
+                self._km += (abs(start[0] - self._last_start[0]) +
+                             abs(start[1] - self._last_start[1]))
+                self._last_start = start
+                self.start = start
+            
+            # Alvo mudou: troca a aresta até o sumidouro virtual
+            if goal != self.goal:
+                old_goal = self.goal
+                self.goal = goal
+                self._update_vertex(old_goal)
+                self._rhs[goal] = 0
+                self._update_vertex(goal)
+        
+        self._compute_shortest_path()
+        return self._extract_path()
+    
+    def _extract_path(self) -> List[Tile]:
+        """Desce g a partir do início até o destino."""
+        g = self._g
+        tile = self.start
+        if g.get(tile, INFINITY) == INFINITY:
+            return []
+        
+        path = [tile]
+        limit = self.width * self.height
+        while tile != self.goal:
+            best = None
+            best_cost = INFINITY
+            for neighbour in self._neighbours(tile):
+                cost = g.get(neighbour, INFINITY)
+                if cost < best_cost:
+                    best = neighbour
+                    best_cost = cost
+            if best is None or len(path) > limit:
+                return []
+            tile = best
+            path.append(tile)
+        return path
+
+
+@register_engine
+class DStarLiteEngine(PathfindingEngine):
+    """Engine incremental: mantém o estado do D* Lite entre recálculos."""
+    
+    name = PATHFINDING_DSTAR_LITE
+    
+    def __init__(self):
+        super().__init__()
+        self.planner = DStarLite()
+    
+    def find_path(self, start, goal, grid, max_distance=50):
+        if start == goal:
+            return [goal]
+        
+        # Início bloqueado ou destino inalcançável: mesma resposta do BFS
+        planner = self.planner
+        height = len(grid)
+        width = len(grid[0]) if height > 0 else 0
+        sx, sy = start
+        gx, gy = goal
+        if (not (0 <= sx < width and 0 <= sy < height) or
+                grid[sy][sx] in (TILE_WALL, TILE_BORDER) or
+                not (0 <= gx < width and 0 <= gy < height) or
+                grid[gy][gx] in (TILE_WALL, TILE_BORDER)):
+            return bfs_pathfind(start, goal, grid, max_distance)
+        
+        path = planner.plan(start, goal, grid)
+        self.last_expanded = planner.last_expanded
+        if len(path) - 1 > max_distance:
+            return []
+        return path
+    
+    def reset(self):
+        self.planner.reset()
+    
+    def tiles_changed(self, tiles=None):
+        if tiles is None:
+            self.planner.reset()
+        else:
+            self.planner.tiles_changed(tiles)
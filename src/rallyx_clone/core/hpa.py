@@ -0,0 +1,369 @@
+"""
+Pathfinding hierárquico (HPA*) para mapas muito grandes.
+
+O grid é dividido em clusters quadrados. Nas bordas entre clusters
+vizinhos ficam as entradas, ligadas entre si por arestas de custo
+conhecido dentro de cada cluster. A busca é feita primeiro nesse grafo
+abstrato e depois refinada em tiles com buscas locais limitadas a um
+cluster, então o custo por consulta não cresce com o tamanho do mapa.
+"""
+import heapq
+from typing import Dict, List, Optional, Tuple
+from .constants import (
+    TILE_WALL, TILE_BORDER, PATHFINDING_HIERARCHICAL,
+    HPA_CLUSTER_SIZE, HPA_ENTRANCE_SPLIT
+)
+from .collision import GridCache, add_grid_listener
+from .pathfinding import DIRECTIONS, PathfindingEngine, register_engine
+
+Tile = Tuple[int, int]
+
+
+class ClusterGraph:
+    """Grafo abstrato de entradas entre clusters de um grid."""
+    
+    # Último grafo construído, por thread
+    _cache = GridCache()
+    
+    def __init__(self, grid: List[List[int]], cluster_size: int = HPA_CLUSTER_SIZE):
+        """
+        Constrói o grafo abstrato.
+        
+        Args:
+            grid: Grid do mapa
+            cluster_size: Lado de cada cluster em tiles
+        """
+        self.grid = grid
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height > 0 else 0
+        self.cluster_size = cluster_size
+        
+        # Arestas do grafo abstrato: tile -> {tile vizinho: custo}
+        self.edges: Dict[Tile, Dict[Tile, int]] = {}
+        self.cluster_nodes: Dict[Tile, List[Tile]] = {}
+        
+        # Caminhos em tiles das arestas internas, calculados sob demanda
+        self._intra_paths: Dict[Tuple[Tile, Tile], List[Tile]] = {}
+        
+        self._build_entrances()
+        self._build_intra_edges()
+    
+    @classmethod
+    def for_grid(cls, grid: List[List[int]]) -> "ClusterGraph":
+        """Retorna o grafo do grid, construindo apenas quando o grid muda."""
+        graph = cls._cache.get(grid)
+        if graph is None:
+            graph = cls._cache.put(grid, cls(grid))
+        return graph
+    
+    @classmethod
+    def forget(cls, grid: List[List[int]], tiles=None):
+        """Descarta o grafo guardado se ele é o do grid alterado."""
+        cls._cache.forget(grid)
+    
+    def is_free(self, tx: int, ty: int) -> bool:
+        """Retorna True se o tile existe e não bloqueia passagem."""
+        if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
+            return False
+        return self.grid[ty][tx] not in (TILE_WALL, TILE_BORDER)
+    
+    def cluster_of(self, tile: Tile) -> Tile:
+        """Retorna as coordenadas do cluster de um tile."""
+        return tile[0] // self.cluster_size, tile[1] // self.cluster_size
+    
+    def _cluster_bounds(self, cluster: Tile) -> Tuple[int, int, int, int]:
+        """Retorna (x0, y0, x1, y1) do cluster, com x1/y1 exclusivos."""
+        x0 = cluster[0] * self.cluster_size
+        y0 = cluster[1] * self.cluster_size
+        return (x0, y0, min(x0 + self.cluster_size, self.width),
+                min(y0 + self.cluster_size, self.height))
+    
+    def _add_node(self, tile: Tile):
+        """Adiciona uma entrada ao grafo abstrato."""
+        if tile not in self.edges:
+            self.edges[tile] = {}
+            self.cluster_nodes.setdefault(self.cluster_of(tile), []).append(tile)
+    
+    def _add_transition(self, a: Tile, b: Tile):
+        """Liga dois tiles vizinhos em clusters diferentes."""
+        self._add_node(a)
+        self._add_node(b)
+        self.edges[a][b] = 1
+        self.edges[b][a] = 1
+    
+    def _build_entrances(self):
+        """Procura trechos livres dos dois lados de cada borda de cluster."""
+        size = self.cluster_size
+        
+        # Bordas verticais (entre clusters da esquerda e da direita)
+        for x in range(size - 1, self.width - 1, size):
+            self._scan_border([((x, y), (x + 1, y)) for y in range(self.height)])
+        
+        # Bordas horizontais (entre clusters de cima e de baixo)
+        for y in range(size - 1, self.height - 1, size):
+            self._scan_border([((x, y), (x, y + 1)) for x in range(self.width)])
+    
+    def _scan_border(self, pairs: List[Tuple[Tile, Tile]]):
+        """Cria transições para cada trecho contínuo livre de uma borda."""
+        size = self.cluster_size
+        run: List[Tuple[Tile, Tile]] = []
+        
+        for index, (a, b) in enumerate(pairs):
+            free = self.is_free(*a) and self.is_free(*b)
+            if free:
+                run.append((a, b))
+            
+            # Fecha o trecho no fim da borda, em um bloqueio ou no fim do cluster
+            last_in_cluster = (index + 1) % size == 0
+            if run and (not free or last_in_cluster or index == len(pairs) - 1):
+                if len(run) >= HPA_ENTRANCE_SPLIT:
+                    self._add_transition(*run[0])
+                    self._add_transition(*run[-1])
+                else:
+                    self._add_transition(*run[len(run) // 2])
+                run = []
+    
+    def _build_intra_edges(self):
+        """Liga as entradas de cada cluster pelas distâncias internas."""
+        for cluster, nodes in self.cluster_nodes.items():
+            bounds = self._cluster_bounds(cluster)
+            for node in nodes:
+                distances, _ = self._local_bfs(node, bounds)
+                for other in nodes:
+                    if other != node and other in distances:
+                        self.edges[node][other] = distances[other]
+    
+    def _local_bfs(self, source: Tile, bounds: Tuple[int, int, int, int],
+                   target: Optional[Tile] = None) -> Tuple[Dict[Tile, int], Dict[Tile, Tile]]:
+        """
+        BFS limitada a um cluster.
+        
+        Args:
+            source: Tile inicial
+            bounds: Limites do cluster
+            target: Se definido, para ao alcançá-lo
+        
+        Returns:
+            Tupla (distâncias, predecessores)
+        """
+        x0, y0, x1, y1 = bounds
+        grid = self.grid
+        blocked = (TILE_WALL, TILE_BORDER)
+        distances = {source: 0}
+        parents: Dict[Tile, Tile] = {}
+        frontier = [source]
+        distance = 1
+        
+        while frontier:
+            next_frontier = []
+            for cx, cy in frontier:
+                for dx, dy in DIRECTIONS:
+                    nx, ny = cx + dx, cy + dy
+                    if nx < x0 or ny < y0 or nx >= x1 or ny >= y1:
+                        continue
+                    neighbour = (nx, ny)
+                    if neighbour in distances or grid[ny][nx] in blocked:
+                        continue
+                    distances[neighbour] = distance
+                    parents[neighbour] = (cx, cy)
+                    if neighbour == target:
+                        return distances, parents
+                    next_frontier.append(neighbour)
+            frontier = next_frontier
+            distance += 1
+        
+        return distances, parents
+    
+    def _intra_path(self, a: Tile, b: Tile) -> List[Tile]:
+        """Caminho em tiles entre duas entradas do mesmo cluster (sem a)."""
+        key = (a, b)
+        path = self._intra_paths.get(key)
+        if path is None:
+            _, parents = self._local_bfs(a, self._cluster_bounds(self.cluster_of(a)), b)
+            path = _walk_back(parents, b, a)
+            self._intra_paths[key] = path
+        return path
+    
+    def find_path(self, start: Tile, goal: Tile) -> List[Tile]:
+        """
+        Busca no grafo abstrato e refina em tiles.
+        
+        Args:
+            start: Tile inicial (tx, ty)
+            goal: Tile destino (tx, ty)
+        
+        Returns:
+            Lista de tiles do caminho (vazio se não encontrou)
+        """
+        return self.search(start, goal)[0]
+    
+    def search(self, start: Tile, goal: Tile) -> Tuple[List[Tile], int]:
+        """
+        Como ``find_path``, mas retorna também o número de nós expandidos.
+        
+        Contam os tiles das buscas locais do início e do destino e os nós
+        do grafo abstrato (os refinamentos entre entradas ficam em cache).
+        
+        Returns:
+            Tupla (caminho, nós expandidos)
+        """
+        if start == goal:
+            return [goal], 0
+        if not self.is_free(*goal):
+            return [], 0
+        if not self.is_free(*start):
+            return self._search_from_blocked(start, goal)
+        
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        start_bounds = self._cluster_bounds(start_cluster)
+        goal_bounds = self._cluster_bounds(goal_cluster)
+        
+        # Liga início e destino às entradas dos seus clusters
+        start_distances, start_parents = self._local_bfs(start, start_bounds)
+        expanded = len(start_distances)
+        if start_cluster == goal_cluster and goal in start_distances:
+            return [start] + _walk_back(start_parents, goal, start), expanded
+        goal_distances, goal_parents = self._local_bfs(goal, goal_bounds)
+        expanded += len(goal_distances)
+        
+        start_links = {node: start_distances[node]
+                       for node in self.cluster_nodes.get(start_cluster, [])
+                       if node in start_distances}
+        goal_links = {node: goal_distances[node]
+                      for node in self.cluster_nodes.get(goal_cluster, [])
+                      if node in goal_distances}
+        if not start_links or not goal_links:
+            return [], expanded
+        
+        nodes, abstract_expanded = self._search_abstract(goal, start_links, goal_links)
+        expanded += abstract_expanded
+        if not nodes:
+            return [], expanded
+        
+        # Refina cada aresta abstrata em tiles
+        path = [start]
+        path.extend(_walk_back(start_parents, nodes[0], start))
+        for a, b in zip(nodes, nodes[1:]):
+            if self.cluster_of(a) != self.cluster_of(b):
+                path.append(b)
+            else:
+                path.extend(self._intra_path(a, b))
+        
+        # Trecho final: o caminho do destino até a última entrada, invertido
+        tail = _walk_back(goal_parents, nodes[-1], goal)
+        tail.reverse()
+        path.extend(tail[1:])
+        if path[-1] != goal:
+            path.append(goal)
+        return path, expanded
+    
+    def _search_from_blocked(self, start: Tile, goal: Tile) -> Tuple[List[Tile], int]:
+        """
+        Início bloqueado (carro encostado numa parede): como no BFS, o
+        primeiro passo pode ir para qualquer vizinho livre, inclusive em
+        outro cluster.
+        """
+        best: List[Tile] = []
+        expanded = 0
+        for dx, dy in DIRECTIONS:
+            neighbour = (start[0] + dx, start[1] + dy)
+            if not self.is_free(*neighbour):
+                continue
+            path, neighbour_expanded = self.search(neighbour, goal)
+            expanded += neighbour_expanded
+            if path and (not best or len(path) < len(best)):
+                best = path
+        return ([start] + best if best else []), expanded
+    
+    def _search_abstract(self, goal: Tile, start_links: Dict[Tile, int],
+                         goal_links: Dict[Tile, int]) -> Tuple[List[Tile], int]:
+        """
+        A* no grafo abstrato com início e destino temporários.
+        
+        Returns:
+            Tupla (entradas visitadas entre o início e o destino, nós
+            expandidos)
+        """
+        gx, gy = goal
+        # Nós temporários não colidem com tiles que também sejam entradas
+        start_key = ("start",)
+        goal_key = ("goal",)
+        costs: Dict[tuple, int] = {start_key: 0}
+        parents: Dict[tuple, Optional[tuple]] = {start_key: None}
+        open_heap = [(0, 0, start_key)]
+        counter = 1
+        expanded = 0
+        
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current == goal_key:
+                nodes = []
+                current = parents[current]
+                while current != start_key:
+                    nodes.append(current)
+                    current = parents[current]
+                nodes.reverse()
+                return nodes, expanded
+            expanded += 1
+            
+            cost = costs[current]
+            if current == start_key:
+                links = start_links.items()
+            else:
+                links = list(self.edges[current].items())
+                if current in goal_links:
+                    links.append((goal_key, goal_links[current]))
+            
+            for neighbour, edge_cost in links:
+                new_cost = cost + edge_cost
+                if new_cost >= costs.get(neighbour, new_cost + 1):
+                    continue
+                costs[neighbour] = new_cost
+                parents[neighbour] = current
+                if neighbour == goal_key:
+                    h = 0
+                else:
+                    h = abs(neighbour[0] - gx) + abs(neighbour[1] - gy)
+                heapq.heappush(open_heap, (new_cost + h, counter, neighbour))
+                counter += 1
+        
+        return [], expanded
+
+
+add_grid_listener(ClusterGraph.forget)
+
+
+def _walk_back(parents: Dict[Tile, Tile], tile: Tile, stop: Tile) -> List[Tile]:
+    """Segue predecessores de ``tile`` até ``stop`` (exclusivo), em ordem."""
+    path = []
+    while tile != stop:
+        path.append(tile)
+        tile = parents[tile]
+    path.reverse()
+    return path
+
+
+@register_engine
+class HierarchicalEngine(PathfindingEngine):
+    """
+    HPA* sobre o grafo de clusters compartilhado do grid.
+    
+    Segue a regra de ``max_distance`` das outras engines: destinos mais
+    longe que o limite em distância Manhattan nem são buscados, e
+    caminhos mais longos que ele são descartados. Como é de longo
+    alcance, os inimigos a chamam com o tamanho do mapa como limite.
+    """
+    
+    name = PATHFINDING_HIERARCHICAL
+    long_range = True
+    
+    def find_path(self, start, goal, grid, max_distance=50):
+        self.last_expanded = 0
+        if abs(start[0] - goal[0]) + abs(start[1] - goal[1]) > max_distance:
+            return []
+        
+        path, self.last_expanded = ClusterGraph.for_grid(grid).search(start, goal)
+        if len(path) - 1 > max_distance:
+            return []
+        return path
@@ -0,0 +1,278 @@
+"""
+Renderização do mapa de tiles em pedaços (chunks) com cache LRU.
+
+O mapa é dividido em pedaços de MAP_CHUNK_TILES x MAP_CHUNK_TILES tiles.
+Cada pedaço vira uma superfície no formato de pixels da tela, montada só
+quando entra na câmera pela primeira vez, e fica num cache LRU limitado
+por MAP_CHUNK_CACHE_BYTES. Por frame, só os pedaços que cruzam a área
+visível (o retângulo de clip da superfície de destino) são desenhados,
+então a memória não depende do tamanho do nível e a área desenhada é a da
+tela.
+
+O ScrollingBackground guarda o fundo do frame anterior e, com a câmera
+andando aos poucos, só redesenha as faixas que entraram na tela.
+"""
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import pygame
+
+from .assets import AssetManager
+from .constants import TILE_SIZE, MAP_CHUNK_TILES, MAP_CHUNK_CACHE_BYTES, COLOR_BLACK
+
+
+class ChunkedMapRenderer:
+    """Desenha o mapa de tiles a partir de pedaços montados sob demanda."""
+    
+    def __init__(self, chunk_tiles: int = MAP_CHUNK_TILES,
+                 max_bytes: int = MAP_CHUNK_CACHE_BYTES):
+        """
+        Cria o renderizador sem mapa.
+        
+        Args:
+            chunk_tiles: Lado de cada pedaço em tiles
+            max_bytes: Memória máxima dos pedaços em cache (os pedaços
+                visíveis no frame nunca são descartados, mesmo acima disso)
+        """
+        self.chunk_tiles = chunk_tiles
+        self.chunk_size = chunk_tiles * TILE_SIZE
+        self.max_bytes = max_bytes
+        
+        self._grid: List[List[int]] = []
+        self._width = 0
+        self._height = 0
+        
+        self._chunks: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+        self._bytes = 0
+        self.builds = 0
+        self.hits = 0
+        self.evictions = 0
+    
+    def set_grid(self, grid: List[List[int]]):
+        """
+        Troca o mapa (descarta todos os pedaços).
+        
+        Args:
+            grid: Matriz de tipos de tile
+        """
+        self._grid = grid
+        self._height = len(grid)
+        self._width = len(grid[0]) if self._height > 0 else 0
+        self.clear()
+    
+    def clear(self):
+        """Descarta os pedaços em cache."""
+        self._chunks.clear()
+        self._bytes = 0
+    
+    def invalidate_tile(self, tx: int, ty: int):
+        """
+        Descarta o pedaço de um tile que mudou no grid.
+        
+        Args:
+            tx, ty: Posição do tile
+        """
+        key = (tx // self.chunk_tiles, ty // self.chunk_tiles)
+        surface = self._chunks.pop(key, None)
+        if surface is not None:
+            self._bytes -= self._surface_bytes(surface)
+    
+    @staticmethod
+    def _surface_bytes(surface: pygame.Surface) -> int:
+        """Memória de pixels de uma superfície."""
+        return surface.get_height() * surface.get_pitch()
+    
+    def _build_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        """Monta a superfície de um pedaço a partir dos tiles."""
+        n = self.chunk_tiles
+        left, top = cx * n, cy * n
+        right = min(left + n, self._width)
+        bottom = min(top + n, self._height)
+        
+        surface = pygame.Surface(((right - left) * TILE_SIZE,
+                                  (bottom - top) * TILE_SIZE))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        
+        load_tile = AssetManager().load_tile
+        grid = self._grid
+        surface.blits([
+            (load_tile(grid[ty][tx]), ((tx - left) * TILE_SIZE, (ty - top) * TILE_SIZE))
+            for ty in range(top, bottom) for tx in range(left, right)
+        ], doreturn=False)
+        self.builds += 1
+        return surface
+    
+    def _chunk(self, cx: int, cy: int) -> pygame.Surface:
+        """Pedaço do cache (marcado como usado) ou montado agora."""
+        key = (cx, cy)
+        surface = self._chunks.get(key)
+        if surface is None:
+            surface = self._build_chunk(cx, cy)
+            self._chunks[key] = surface
+            self._bytes += self._surface_bytes(surface)
+        else:
+            self._chunks.move_to_end(key)
+            self.hits += 1
+        return surface
+    
+    def _evict(self, keep: int):
+        """Descarta os pedaços menos usados até caber no teto."""
+        chunks = self._chunks
+        while self._bytes > self.max_bytes and len(chunks) > keep:
+            _, surface = chunks.popitem(last=False)
+            self._bytes -= self._surface_bytes(surface)
+            self.evictions += 1
+    
+    def draw(self, screen: pygame.Surface,
+             camera_offset: Tuple[float, float] = (0, 0)) -> int:
+        """
+        Desenha os pedaços que cruzam a área visível.
+        
+        A área visível é o retângulo de clip de ``screen`` (a tela toda,
+        se não houver clip), deslocado pela câmera.
+        
+        Args:
+            screen: Surface de destino
+            camera_offset: Offset da câmera
+        
+        Returns:
+            Número de pedaços desenhados
+        """
+        if not self._width or not self._height:
+            return 0
+        
+        ox, oy = int(camera_offset[0]), int(camera_offset[1])
+        view = screen.get_clip()
+        size = self.chunk_size
+        left = max(0, (view.left + ox) // size)
+        top = max(0, (view.top + oy) // size)
+        right = min((self._width - 1) // self.chunk_tiles, (view.right - 1 + ox) // size)
+        bottom = min((self._height - 1) // self.chunk_tiles, (view.bottom - 1 + oy) // size)
+        if right < left or bottom < top:
+            return 0
+        
+        chunk = self._chunk
+        screen.blits([
+            (chunk(cx, cy), (cx * size - ox, cy * size - oy))
+            for cy in range(top, bottom + 1) for cx in range(left, right + 1)
+        ], doreturn=False)
+        
+        drawn = (right - left + 1) * (bottom - top + 1)
+        self._evict(drawn)
+        return drawn
+    
+    def stats(self) -> dict:
+        """
+        Retorna estatísticas do cache de pedaços.
+        
+        Returns:
+            Dict com chunks, bytes, max_bytes, builds, hits e evictions
+        """
+        return {
+            "chunks": len(self._chunks),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "builds": self.builds,
+            "hits": self.hits,
+            "evictions": self.evictions,
+        }
+
+
+class ScrollingBackground:
+    """
+    Fundo do tamanho da tela que acompanha a câmera rolando pixels.
+    
+    Quando a câmera anda pouco, o fundo do frame anterior é deslocado com
+    ``Surface.scroll`` e só as faixas que entraram na tela são redesenhadas
+    a partir dos pedaços do mapa. Saltos grandes (respawn, troca de nível)
+    redesenham a tela toda.
+    """
+    
+    def __init__(self, renderer: ChunkedMapRenderer,
+                 fill_color: Tuple[int, int, int] = COLOR_BLACK):
+        """
+        Cria o fundo vazio (o primeiro draw redesenha tudo).
+        
+        Args:
+            renderer: Renderizador dos pedaços do mapa
+            fill_color: Cor fora dos limites do mapa
+        """
+        self.renderer = renderer
+        self.fill_color = fill_color
+        self.surface: Optional[pygame.Surface] = None
+        self._offset: Optional[Tuple[int, int]] = None
+        
+        self.redrawn_pixels = 0  # Área redesenhada no último draw
+        self.full_redraws = 0
+        self.scrolls = 0
+    
+    def invalidate(self):
+        """Força um redesenho completo no próximo draw (mapa mudou)."""
+        self._offset = None
+    
+    def _redraw(self, area: pygame.Rect, offset: Tuple[int, int]):
+        """Redesenha uma área do fundo a partir dos pedaços."""
+        surface = self.surface
+        surface.set_clip(area)
+        surface.fill(self.fill_color)
+        self.renderer.draw(surface, offset)
+        surface.set_clip(None)
+        self.redrawn_pixels += area.width * area.height
+    
+    def draw(self, screen: pygame.Surface,
+             camera_offset: Tuple[float, float] = (0, 0)) -> List[pygame.Rect]:
+        """
+        Atualiza o fundo para a câmera atual e o copia para a tela.
+        
+        Args:
+            screen: Surface de destino
+            camera_offset: Offset da câmera
+        
+        Returns:
+            Áreas da tela que foram redesenhadas a partir dos tiles
+        """
+        width, height = screen.get_size()
+        if self.surface is None or self.surface.get_size() != (width, height):
+            self.surface = pygame.Surface((width, height))
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert()
+            self._offset = None
+        
+        offset = (int(camera_offset[0]), int(camera_offset[1]))
+        self.redrawn_pixels = 0
+        strips: List[pygame.Rect] = []
+        
+        if self._offset is None:
+            dx = dy = width
+        else:
+            dx = offset[0] - self._offset[0]
+            dy = offset[1] - self._offset[1]
+        
+        if abs(dx) * 2 >= width or abs(dy) * 2 >= height:
+            # Salto: as faixas cobririam metade da tela ou mais
+            strips.append(pygame.Rect(0, 0, width, height))
+            self.full_redraws += 1
+        elif dx or dy:
+            self.surface.scroll(-dx, -dy)
+            self.scrolls += 1
+            
+            # Faixa horizontal (largura toda) e vertical (sem o canto repetido)
+            rows = pygame.Rect(0, 0, width, height)
+            if dy > 0:
+                strips.append(pygame.Rect(0, height - dy, width, dy))
+                rows.height -= dy
+            elif dy < 0:
+                strips.append(pygame.Rect(0, 0, width, -dy))
+                rows.top, rows.height = -dy, height + dy
+            if dx > 0:
+                strips.append(pygame.Rect(width - dx, rows.top, dx, rows.height))
+            elif dx < 0:
+                strips.append(pygame.Rect(0, rows.top, -dx, rows.height))
+        
+        for strip in strips:
+            self._redraw(strip, offset)
+        self._offset = offset
+        
+        screen.blit(self.surface, (0, 0))
+        return strips
@@ -0,0 +1,515 @@
+"""
+Sistema de partículas com estado em arrays.
+
+Cada emissor guarda posição, velocidade e idade de suas partículas em
+arrays paralelos (NumPy quando disponível, ``array`` da biblioteca padrão
+como alternativa) e atualiza todas de uma vez: integração, remoção das que
+expiraram e descarte das que estão fora da câmera. O desenho de um emissor
+é uma única chamada a ``Surface.blits``.
+
+O ``ParticleField`` junta os emissores e mantém uma grade grossa de
+ocupação (células do tamanho de um tile dentro da área de algum emissor),
+usada para perguntar "este ponto está dentro do efeito?" sem testar
+partícula por partícula.
+"""
+import math
+import random
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import pygame
+
+from .constants import TILE_SIZE
+
+if TYPE_CHECKING:
+    from .render_queue import RenderQueue
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+class ParticleEmitter:
+    """
+    Fonte de partículas com estado em arrays paralelos.
+    
+    As partículas vivas ocupam sempre o começo dos arrays ([:count]); as
+    que expiram são compactadas no fim de cada update.
+    """
+    
+    def __init__(self, frames: Sequence[pygame.Surface], capacity: int,
+                 rate: float, life: float, speed: float = 0.0,
+                 radius: float = 0.0, drag: float = 0.0,
+                 use_numpy: bool = HAS_NUMPY, seed: Optional[int] = None):
+        """
+        Cria um emissor parado, sem partículas.
+        
+        Args:
+            frames: Sprites do fade-out, do transparente ao opaco (todos do
+                mesmo tamanho; ver AssetManager.get_fade_frames)
+            capacity: Máximo de partículas vivas
+            rate: Partículas emitidas por segundo (vezes ``intensity``)
+            life: Duração de cada partícula em segundos
+            speed: Velocidade inicial máxima, para fora do centro (px/s)
+            radius: Raio do disco onde as partículas nascem
+            drag: Fração da velocidade perdida por segundo
+            use_numpy: Se False, usa ``array`` mesmo com NumPy instalado
+            seed: Semente do gerador aleatório
+        """
+        self.frames = frames
+        self.capacity = capacity
+        self.rate = rate
+        self.life = life
+        self.speed = speed
+        self.radius = radius
+        self.drag = drag
+        
+        self.x = 0.0
+        self.y = 0.0
+        self.emitting = False
+        self.intensity = 1.0  # Multiplica a taxa de emissão
+        self.count = 0
+        self._pending = 0.0  # Fração de partícula acumulada entre frames
+        
+        width, height = frames[-1].get_size()
+        self.half_width = width / 2
+        self.half_height = height / 2
+        
+        self.use_numpy = use_numpy and HAS_NUMPY
+        if self.use_numpy:
+            self._rng = np.random.default_rng(seed)
+            self.px = np.zeros(capacity)
+            self.py = np.zeros(capacity)
+            self.vx = np.zeros(capacity)
+            self.vy = np.zeros(capacity)
+            self.age = np.zeros(capacity)
+        else:
+            self._rng = random.Random(seed)
+            self.px = array("d", [0.0]) * capacity
+            self.py = array("d", [0.0]) * capacity
+            self.vx = array("d", [0.0]) * capacity
+            self.vy = array("d", [0.0]) * capacity
+            self.age = array("d", [0.0]) * capacity
+    
+    def clear(self):
+        """Remove todas as partículas (os arrays são mantidos)."""
+        self.count = 0
+        self._pending = 0.0
+    
+    def emit(self, amount: int) -> int:
+        """
+        Emite partículas no disco ao redor de (x, y).
+        
+        Args:
+            amount: Quantas emitir (limitado pela capacidade livre)
+        
+        Returns:
+            Índice da primeira partícula emitida
+        """
+        start = self.count
+        amount = min(amount, self.capacity - start)
+        if amount <= 0:
+            return start
+        end = start + amount
+        
+        if self.use_numpy:
+            rng = self._rng
+            theta = rng.uniform(0.0, 2 * math.pi, amount)
+            cos, sin = np.cos(theta), np.sin(theta)
+            r = self.radius * np.sqrt(rng.random(amount))
+            v = self.speed * rng.uniform(0.3, 1.0, amount)
+            self.px[start:end] = self.x + r * cos
+            self.py[start:end] = self.y + r * sin
+            self.vx[start:end] = v * cos
+            self.vy[start:end] = v * sin
+            self.age[start:end] = 0.0
+        else:
+            rng = self._rng
+            for i in range(start, end):
+                theta = rng.uniform(0.0, 2 * math.pi)
+                cos, sin = math.cos(theta), math.sin(theta)
+                r = self.radius * math.sqrt(rng.random())
+                v = self.speed * rng.uniform(0.3, 1.0)
+                self.px[i] = self.x + r * cos
+                self.py[i] = self.y + r * sin
+                self.vx[i] = v * cos
+                self.vy[i] = v * sin
+                self.age[i] = 0.0
+        
+        self.count = end
+        return start
+    
+    def update(self, dt: float):
+        """
+        Integra, remove as partículas expiradas e emite as novas.
+        
+        Args:
+            dt: Delta time em segundos
+        """
+        self._integrate(dt)
+        
+        if self.emitting:
+            self._pending += self.rate * self.intensity * dt
+            amount = int(self._pending)
+            if amount:
+                self._pending -= amount
+                self.emit(amount)
+    
+    def _integrate(self, dt: float):
+        """Move as partículas vivas e compacta as que expiraram."""
+        n = self.count
+        if not n:
+            return
+        damping = max(0.0, 1.0 - self.drag * dt)
+        
+        if self.use_numpy:
+            px, py = self.px[:n], self.py[:n]
+            vx, vy = self.vx[:n], self.vy[:n]
+            age = self.age[:n]
+            px += vx * dt
+            py += vy * dt
+            vx *= damping
+            vy *= damping
+            age += dt
+            
+            alive = age < self.life
+            live = int(np.count_nonzero(alive))
+            if live != n:
+                for column in (self.px, self.py, self.vx, self.vy, self.age):
+                    column[:live] = column[:n][alive]
+                self.count = live
+        else:
+            px, py, vx, vy, age = self.px, self.py, self.vx, self.vy, self.age
+            life = self.life
+            live = 0
+            for i in range(n):
+                if age[i] + dt >= life:
+                    continue
+                px[live] = px[i] + vx[i] * dt
+                py[live] = py[i] + vy[i] * dt
+                vx[live] = vx[i] * damping
+                vy[live] = vy[i] * damping
+                age[live] = age[i] + dt
+                live += 1
+            self.count = live
+    
+    @property
+    def reach(self) -> float:
+        """Distância máxima do centro que uma partícula pode cobrir."""
+        return (self.radius + self.speed * self.life
+                + max(self.half_width, self.half_height))
+    
+    def bounds(self, camera_offset: Tuple[float, float] = (0, 0)) -> pygame.Rect:
+        """
+        Área da tela que as partículas deste emissor podem cobrir.
+        
+        Args:
+            camera_offset: Offset da câmera
+        
+        Returns:
+            Quadrado de lado 2 * reach ao redor do emissor (arredondado para fora)
+        """
+        reach = math.ceil(self.reach)
+        left = math.floor(self.x - camera_offset[0]) - reach
+        top = math.floor(self.y - camera_offset[1]) - reach
+        return pygame.Rect(left, top, 2 * reach + 1, 2 * reach + 1)
+    
+    def sprites(self, view: pygame.Rect,
+                camera_offset: Tuple[float, float] = (0, 0)) -> List[tuple]:
+        """
+        Monta a lista de blits das partículas visíveis.
+        
+        Partículas fora de ``view`` são descartadas antes de montar a lista;
+        cada uma usa o nível de fade correspondente à vida que lhe resta.
+        
+        Args:
+            view: Área visível da tela
+            camera_offset: Offset da câmera
+        
+        Returns:
+            Pares (superfície, posição na tela), na ordem das partículas
+        """
+        n = self.count
+        if not n:
+            return []
+        frames = self.frames
+        steps = len(frames) - 1
+        hw, hh = self.half_width, self.half_height
+        left = camera_offset[0] + hw
+        top = camera_offset[1] + hh
+        min_x, max_x = view.left - 2 * hw, view.right
+        min_y, max_y = view.top - 2 * hh, view.bottom
+        
+        if self.use_numpy:
+            sx = self.px[:n] - left
+            sy = self.py[:n] - top
+            visible = ((sx > min_x) & (sx < max_x) &
+                       (sy > min_y) & (sy < max_y))
+            level = ((self.life - self.age[:n][visible]) * (steps / self.life)
+                     + 0.5).astype(np.int64)
+            np.clip(level, 0, steps, out=level)
+            sx, sy = sx[visible], sy[visible]
+            return list(zip([frames[i] for i in level.tolist()],
+                            zip(sx.tolist(), sy.tolist())))
+        
+        blits = []
+        px, py, age, life = self.px, self.py, self.age, self.life
+        for i in range(n):
+            x = px[i] - left
+            y = py[i] - top
+            if min_x < x < max_x and min_y < y < max_y:
+                level = min(steps, max(0, int((life - age[i]) * steps / life + 0.5)))
+                blits.append((frames[level], (x, y)))
+        return blits
+    
+    def draw(self, screen: pygame.Surface,
+             camera_offset: Tuple[float, float] = (0, 0)) -> int:
+        """
+        Desenha as partículas visíveis com uma única chamada a ``blits``.
+        
+        Args:
+            screen: Surface para desenhar (a área visível é o seu clip)
+            camera_offset: Offset da câmera
+        
+        Returns:
+            Número de partículas desenhadas
+        """
+        blits = self.sprites(screen.get_clip(), camera_offset)
+        screen.blits(blits, doreturn=False)
+        return len(blits)
+    
+    def enqueue(self, queue: "RenderQueue", layer: int):
+        """
+        Empilha as partículas visíveis numa fila de renderização.
+        
+        Args:
+            queue: Fila do frame (dá a área visível e a câmera)
+            layer: Camada das partículas
+        """
+        blits = self.sprites(queue.view, queue.camera_offset)
+        queue.extend(blits, layer, bounds=self.bounds(queue.camera_offset),
+                     culled=self.count - len(blits))
+
+
+class ParticleField:
+    """
+    Conjunto de emissores com uma grade grossa de ocupação.
+    
+    Cada emissor registrado marca na grade a sua área (todas as células
+    que o círculo de alcance ao redor dele toca) e a desmarca ao ser
+    removido; a grade guarda quais emissores tocam cada célula. Como os
+    emissores não se movem depois de registrados, a grade só muda quando
+    um nasce ou some. ``occupied`` é a fase larga (um acesso a dicionário)
+    e ``covers`` confirma com o círculo exato dos emissores da célula.
+    """
+    
+    def __init__(self, cell_size: int = TILE_SIZE):
+        """
+        Cria o campo vazio.
+        
+        Args:
+            cell_size: Lado das células da grade de ocupação
+        """
+        self.cell_size = cell_size
+        self.emitters: List[ParticleEmitter] = []
+        self._cells: Dict[Tuple[int, int], List[ParticleEmitter]] = {}
+        self._footprints: Dict[ParticleEmitter, List[Tuple[int, int]]] = {}
+        # Círculo de cada emissor (x, y, raio²) para o teste exato
+        self._areas: Dict[ParticleEmitter, Tuple[float, float, float]] = {}
+        
+        # Cópia densa da grade para consultas em lote (refeita sob demanda)
+        self._dense = None
+    
+    @property
+    def particle_count(self) -> int:
+        """Partículas vivas em todos os emissores."""
+        return sum(emitter.count for emitter in self.emitters)
+    
+    def footprint(self, x: float, y: float, reach: float) -> List[Tuple[int, int]]:
+        """
+        Células de uma área circular.
+        
+        Args:
+            x, y: Centro em pixels
+            reach: Raio em pixels
+        
+        Returns:
+            Células que o círculo toca (a do centro primeiro)
+        """
+        size = self.cell_size
+        home = (int(x // size), int(y // size))
+        cells = [home]
+        reach_sq = reach * reach
+        for cy in range(int((y - reach) // size), int((y + reach) // size) + 1):
+            # Distância do centro ao ponto mais próximo da célula
+            top = cy * size
+            dy = max(top - y, 0.0, y - top - size)
+            for cx in range(int((x - reach) // size), int((x + reach) // size) + 1):
+                left = cx * size
+                dx = max(left - x, 0.0, x - left - size)
+                if dx * dx + dy * dy <= reach_sq and (cx, cy) != home:
+                    cells.append((cx, cy))
+        return cells
+    
+    def add(self, emitter: ParticleEmitter, reach: Optional[float] = None):
+        """
+        Registra um emissor e marca sua área na grade.
+        
+        Args:
+            emitter: Emissor já posicionado
+            reach: Raio da área; padrão é o alcance das partículas
+        """
+        if reach is None:
+            reach = emitter.reach
+        cells = self.footprint(emitter.x, emitter.y, reach)
+        grid = self._cells
+        for cell in cells:
+            entries = grid.get(cell)
+            if entries is None:
+                grid[cell] = [emitter]
+            else:
+                entries.append(emitter)
+        self._footprints[emitter] = cells
+        self._areas[emitter] = (emitter.x, emitter.y, reach * reach)
+        self.emitters.append(emitter)
+        self._dense = None
+    
+    def remove(self, emitter: ParticleEmitter):
+        """Remove um emissor e desmarca sua área na grade."""
+        self.emitters.remove(emitter)
+        grid = self._cells
+        for cell in self._footprints.pop(emitter):
+            entries = grid[cell]
+            if len(entries) == 1:
+                del grid[cell]
+            else:
+                entries.remove(emitter)
+        del self._areas[emitter]
+        self._dense = None
+    
+    def update(self, dt: float):
+        """Atualiza todos os emissores."""
+        for emitter in self.emitters:
+            emitter.update(dt)
+    
+    def occupied(self, x: float, y: float) -> bool:
+        """
+        Verifica se a célula de um ponto é tocada pela área de algum emissor.
+        
+        É a fase larga de ``covers``: pode dar True para pontos fora dos
+        círculos, nunca False para pontos dentro.
+        
+        Args:
+            x, y: Posição em pixels
+        
+        Returns:
+            True se a célula está ocupada
+        """
+        size = self.cell_size
+        return (int(x // size), int(y // size)) in self._cells
+    
+    def covers(self, x: float, y: float) -> bool:
+        """
+        Verifica se um ponto está dentro da área de algum emissor.
+        
+        Só os emissores que tocam a célula do ponto fazem o teste exato.
+        
+        Args:
+            x, y: Posição em pixels
+        
+        Returns:
+            True se o ponto está no círculo de alcance de um emissor
+        """
+        size = self.cell_size
+        entries = self._cells.get((int(x // size), int(y // size)))
+        if entries is None:
+            return False
+        areas = self._areas
+        for emitter in entries:
+            cx, cy, reach_sq = areas[emitter]
+            dx = x - cx
+            dy = y - cy
+            if dx * dx + dy * dy <= reach_sq:
+                return True
+        return False
+    
+    def covers_many(self, xs: Sequence[float], ys: Sequence[float]):
+        """
+        Versão em lote de ``covers``.
+        
+        A grade filtra os pontos de uma vez (``occupied_many``) e só os
+        candidatos passam pelo teste exato.
+        
+        Args:
+            xs, ys: Posições em pixels (arrays ou sequências)
+        
+        Returns:
+            Array bool (com NumPy) ou lista de bools, um por ponto
+        """
+        if not HAS_NUMPY:
+            return [self.covers(x, y) for x, y in zip(xs, ys)]
+        
+        result = self.occupied_many(xs, ys)
+        for i in np.flatnonzero(result).tolist():
+            result[i] = self.covers(float(xs[i]), float(ys[i]))
+        return result
+    
+    def occupied_many(self, xs: Sequence[float], ys: Sequence[float]):
+        """
+        Consulta em lote da grade de ocupação.
+        
+        Com NumPy, as células de todos os pontos são indexadas de uma vez
+        numa cópia densa da grade (refeita só quando um emissor entra ou
+        sai); sem NumPy, é um occupied() por ponto.
+        
+        Args:
+            xs, ys: Posições em pixels (arrays ou sequências)
+        
+        Returns:
+            Array bool (com NumPy) ou lista de bools, um por ponto
+        """
+        if not HAS_NUMPY:
+            return [self.occupied(x, y) for x, y in zip(xs, ys)]
+        
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        result = np.zeros(len(xs), dtype=bool)
+        if not self._cells:
+            return result
+        
+        if self._dense is None:
+            cells = np.array(list(self._cells), dtype=np.int64)
+            left, top = cells.min(axis=0)
+            right, bottom = cells.max(axis=0)
+            grid = np.zeros((bottom - top + 1, right - left + 1), dtype=bool)
+            grid[cells[:, 1] - top, cells[:, 0] - left] = True
+            self._dense = (grid, left, top)
+        grid, left, top = self._dense
+        
+        cx = np.floor_divide(xs, self.cell_size).astype(np.int64) - left
+        cy = np.floor_divide(ys, self.cell_size).astype(np.int64) - top
+        inside = ((cx >= 0) & (cx < grid.shape[1]) &
+                  (cy >= 0) & (cy < grid.shape[0]))
+        result[inside] = grid[cy[inside], cx[inside]]
+        return result
+    
+    def draw(self, screen: pygame.Surface,
+             camera_offset: Tuple[float, float] = (0, 0)) -> int:
+        """Desenha todos os emissores; retorna as partículas desenhadas."""
+        drawn = 0
+        for emitter in self.emitters:
+            drawn += emitter.draw(screen, camera_offset)
+        return drawn
+    
+    def clear(self):
+        """Remove todos os emissores e partículas."""
+        for emitter in self.emitters:
+            emitter.clear()
+        self.emitters.clear()
+        self._cells.clear()
+        self._footprints.clear()
+        self._areas.clear()
+        self._dense = None
@@ -0,0 +1,145 @@
+"""
+Escalonador de buscas de caminho com orçamento de tempo por frame.
+
+Em vez de cada inimigo buscar na hora (e todos no mesmo frame), os
+pedidos entram numa fila com prioridade e são processados em fatias até
+esgotar o orçamento do frame. Buscas inacabadas continuam no frame
+seguinte; enquanto isso o inimigo segue o caminho antigo.
+"""
+import time
+import heapq
+from typing import Generator, List, Optional, Tuple
+from .constants import PATH_BUDGET_MS
+from .pathfinding import PathfindingEngine
+
+
+class PathRequest:
+    """Pedido de caminho; o solicitante consulta ``done()`` a cada frame."""
+    
+    def __init__(self, start: Tuple[int, int], goal: Tuple[int, int],
+                 grid: List[List[int]], engine: PathfindingEngine,
+                 max_distance: int = 50):
+        self.start = start
+        self.goal = goal
+        self.grid = grid
+        self.engine = engine
+        self.max_distance = max_distance
+        
+        self.cancelled = False
+        self._steps: Optional[Generator] = None
+        self._done = False
+        self._path: List[Tuple[int, int]] = []
+    
+    def done(self) -> bool:
+        """Retorna True quando o caminho está pronto."""
+        return self._done
+    
+    def result(self) -> List[Tuple[int, int]]:
+        """Retorna o caminho encontrado (vazio se não há caminho)."""
+        return self._path
+    
+    def cancel(self):
+        """Desiste do pedido; o escalonador o descarta."""
+        self.cancelled = True
+    
+    def step(self) -> bool:
+        """
+        Avança a busca por uma fatia.
+        
+        Returns:
+            True se a busca terminou
+        """
+        if self._steps is None:
+            self._steps = self.engine.search_steps(
+                self.start, self.goal, self.grid, self.max_distance)
+        try:
+            next(self._steps)
+        except StopIteration as finished:
+            self._path = finished.value or []
+            self._done = True
+            self._steps = None
+        return self._done
+
+
+class PathScheduler:
+    """Fila de pedidos de caminho processada com orçamento por frame."""
+    
+    def __init__(self, budget_ms: float = PATH_BUDGET_MS):
+        """
+        Cria o escalonador.
+        
+        Args:
+            budget_ms: Tempo máximo de busca por frame em milissegundos
+        """
+        self.budget_ms = budget_ms
+        self._queue: List[tuple] = []
+        self._counter = 0
+        
+        # Estatísticas do último frame
+        self.last_frame_ms = 0.0
+        self.completed_last_frame = 0
+    
+    @property
+    def pending(self) -> int:
+        """Número de pedidos na fila."""
+        return len(self._queue)
+    
+    def submit(self, start: Tuple[int, int], goal: Tuple[int, int],
+               grid: List[List[int]], engine: PathfindingEngine,
+               priority: float = 0.0, max_distance: int = 50) -> PathRequest:
+        """
+        Enfileira um pedido de caminho.
+        
+        Args:
+            start: Tile inicial
+            goal: Tile destino
+            grid: Grid do mapa
+            engine: Engine que fará a busca
+            priority: Menor valor é atendido primeiro (ex.: distância ao jogador)
+            max_distance: Distância máxima de busca
+        
+        Returns:
+            Pedido a ser consultado nos próximos frames
+        """
+        request = PathRequest(start, goal, grid, engine, max_distance)
+        heapq.heappush(self._queue, (priority, self._counter, request))
+        self._counter += 1
+        return request
+    
+    def run(self, budget_ms: Optional[float] = None):
+        """
+        Processa pedidos até esgotar o orçamento do frame.
+        
+        Pelo menos uma fatia é processada por frame, para que a fila
+        sempre ande mesmo com orçamento mínimo.
+        
+        Args:
+            budget_ms: Orçamento deste frame (padrão: o do escalonador)
+        """
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        started = time.perf_counter()
+        deadline = started + budget
+        completed = 0
+        
+        queue = self._queue
+        while queue:
+            request = queue[0][2]
+            if request.cancelled:
+                heapq.heappop(queue)
+                continue
+            
+            if request.step():
+                heapq.heappop(queue)
+                completed += 1
+            
+            if time.perf_counter() >= deadline:
+                break
+        
+        self.last_frame_ms = (time.perf_counter() - started) * 1000.0
+        self.completed_last_frame = completed
+    
+    def clear(self):
+        """Cancela todos os pedidos pendentes."""
+        for _, _, request in self._queue:
+            request.cancel()
+        self._queue.clear()
@@ -0,0 +1,289 @@
+"""
+Serviço de busca de caminhos assíncrono, em um pool de workers.
+
+O grid é publicado uma vez por versão: com processos, numa área de
+memória compartilhada; com threads, como uma tupla imutável. Cada pedido
+leva só a referência e o número da versão, e cada worker remonta o grid
+uma única vez por versão (reaproveitando o mesmo objeto, o que mantém
+válidos os caches por grid) e mantém suas próprias engines.
+
+Os pedidos esperam numa fila com prioridade e só vão para o pool quando
+há worker livre, então os mais urgentes passam na frente. O resultado é
+um ``Future`` com o mesmo protocolo de ``PathRequest`` (``done()``,
+``result()``, ``cancel()``), então o inimigo não precisa saber onde a
+busca roda.
+"""
+import heapq
+import struct
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+from .collision import add_grid_listener
+from .constants import PATH_WORKERS
+from .pathfinding import PathfindingEngine, create_engine
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+# Cabeçalho do grid na memória compartilhada: largura, altura
+_GRID_HEADER = struct.Struct("<II")
+
+# Engines e grid de cada worker (uma por thread, pois o estado não é
+# compartilhável)
+_worker_state = threading.local()
+
+GridRef = Union[str, Tuple[Tuple[int, ...], ...]]
+
+
+def _read_shared_grid(name: str) -> List[List[int]]:
+    """Remonta o grid publicado numa área de memória compartilhada."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        width, height = _GRID_HEADER.unpack_from(block.buf)
+        data = bytes(block.buf[_GRID_HEADER.size:_GRID_HEADER.size + width * height])
+    finally:
+        block.close()
+    return [list(data[row * width:(row + 1) * width]) for row in range(height)]
+
+
+def _worker_grid(grid_ref: GridRef, version: int):
+    """Grid da versão pedida, remontado só na primeira vez."""
+    if getattr(_worker_state, "version", None) != version:
+        if isinstance(grid_ref, str):
+            _worker_state.grid = _read_shared_grid(grid_ref)
+        else:
+            _worker_state.grid = grid_ref
+        _worker_state.version = version
+    return _worker_state.grid
+
+
+def _find_path_job(engine_name: str, start: Tuple[int, int],
+                   goal: Tuple[int, int], grid_ref: GridRef, version: int,
+                   max_distance: int) -> List[Tuple[int, int]]:
+    """Executa uma busca dentro do worker."""
+    engines: Optional[Dict[str, PathfindingEngine]] = getattr(
+        _worker_state, "engines", None)
+    if engines is None:
+        engines = _worker_state.engines = {}
+    
+    grid = _worker_grid(grid_ref, version)
+    engine = engines.get(engine_name)
+    if engine is None:
+        engine = engines[engine_name] = create_engine(engine_name)
+    return engine.find_path(start, goal, grid, max_distance)
+
+
+class AsyncPathService:
+    """Pool de workers para buscas de caminho fora da thread principal."""
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        
+        self._executor = None
+        self._use_processes = False
+        self._workers = 0
+        
+        # Pedidos esperando worker livre: (prioridade, ordem, future, job)
+        self._queue: List[tuple] = []
+        self._counter = 0
+        self._running: Dict[Future, int] = {}  # Future -> versão do grid
+        self._lock = threading.RLock()
+        
+        # Versão publicada do grid
+        self._last_grid: Optional[List[List[int]]] = None
+        self._version = 0
+        self._grid_ref: Optional[GridRef] = None
+        self._blocks: Dict[int, object] = {}  # Versão -> SharedMemory (processos)
+        add_grid_listener(self._grid_changed)
+    
+    def _grid_changed(self, grid: List[List[int]], tiles=None):
+        """Grid alterado no lugar: a próxima busca publica uma versão nova."""
+        if grid is self._last_grid:
+            self._last_grid = None
+    
+    @property
+    def running(self) -> bool:
+        """True se o pool de workers está ativo."""
+        return self._executor is not None
+    
+    def start(self, workers: int = PATH_WORKERS, use_processes: bool = True):
+        """
+        Cria o pool de workers (se ainda não existe).
+        
+        Processos buscam em paralelo de verdade; threads evitam copiar o
+        grid, mas disputam o GIL com o loop principal.
+        
+        Args:
+            workers: Número de workers
+            use_processes: Usa processos em vez de threads
+        """
+        if self._executor is not None:
+            return
+        
+        self._workers = workers
+        if use_processes and shared_memory is not None:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+                self._use_processes = True
+                return
+            except (OSError, NotImplementedError, ImportError):
+                pass  # Sem multiprocessing: usa threads
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._use_processes = False
+    
+    def _publish(self, grid: List[List[int]]):
+        """Publica uma versão nova do grid para os workers."""
+        self._version += 1
+        self._last_grid = grid
+        if not self._use_processes:
+            self._grid_ref = tuple(tuple(row) for row in grid)
+            return
+        
+        height = len(grid)
+        width = len(grid[0]) if height > 0 else 0
+        data = bytes(tile for row in grid for tile in row)
+        block = shared_memory.SharedMemory(create=True,
+                                           size=_GRID_HEADER.size + len(data))
+        _GRID_HEADER.pack_into(block.buf, 0, width, height)
+        block.buf[_GRID_HEADER.size:_GRID_HEADER.size + len(data)] = data
+        
+        self._blocks[self._version] = block
+        self._grid_ref = block.name
+        self._release_blocks()
+    
+    def _release_blocks(self, everything: bool = False):
+        """
+        Libera as áreas compartilhadas de versões que nenhum pedido usa.
+        
+        Args:
+            everything: Libera também a versão atual (encerramento)
+        """
+        in_use = {job[4] for _, _, _, job in self._queue}
+        in_use.update(self._running.values())
+        if not everything:
+            in_use.add(self._version)
+        for version in [v for v in self._blocks if v not in in_use]:
+            block = self._blocks.pop(version)
+            block.close()
+            block.unlink()
+    
+    def submit(self, start: Tuple[int, int], goal: Tuple[int, int],
+               grid: List[List[int]], engine: PathfindingEngine,
+               priority: float = 0.0, max_distance: int = 50) -> Future:
+        """
+        Enfileira um pedido de caminho.
+        
+        Args:
+            start: Tile inicial
+            goal: Tile destino
+            grid: Grid do mapa
+            engine: Engine do solicitante (o worker usa uma do mesmo tipo)
+            priority: Menor valor vai primeiro para um worker livre
+            max_distance: Distância máxima de busca
+        
+        Returns:
+            Future com a lista de tiles do caminho
+        """
+        if self._executor is None:
+            self.start()
+        
+        with self._lock:
+            if grid is not self._last_grid:
+                self._publish(grid)
+            
+            future = Future()
+            job = (engine.name, start, goal, self._grid_ref, self._version,
+                   max_distance)
+            heapq.heappush(self._queue, (priority, self._counter, future, job))
+            self._counter += 1
+            self._dispatch()
+        return future
+    
+    def _dispatch(self):
+        """Envia os pedidos mais urgentes enquanto há worker livre."""
+        with self._lock:
+            queue = self._queue
+            while queue and len(self._running) < self._workers:
+                _, _, future, job = heapq.heappop(queue)
+                if not future.set_running_or_notify_cancel():
+                    continue  # Cancelado enquanto esperava
+                self._running[future] = job[4]
+                task = self._executor.submit(_find_path_job, *job)
+                task.add_done_callback(
+                    lambda task, future=future: self._finished(task, future))
+    
+    def _finished(self, task: Future, future: Future):
+        """Repassa o resultado de um worker e libera a vaga."""
+        with self._lock:
+            current = self._running.pop(future, None) is not None
+        
+        # Pedidos soltos por reset já foram respondidos: o grid era outro
+        if current:
+            if task.cancelled():
+                future.set_exception(RuntimeError("busca cancelada no pool"))
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+        
+        with self._lock:
+            if self._executor is not None:
+                self._dispatch()
+            self._release_blocks()
+    
+    @property
+    def pending(self) -> int:
+        """Número de pedidos ainda não concluídos (na fila ou nos workers)."""
+        with self._lock:
+            waiting = sum(1 for _, _, future, _ in self._queue if not future.cancelled())
+            return waiting + sum(1 for future in self._running if not future.done())
+    
+    def clear(self):
+        """Cancela os pedidos que ainda esperam por um worker."""
+        with self._lock:
+            for _, _, future, _ in self._queue:
+                future.cancel()
+            self._queue.clear()
+    
+    def reset(self):
+        """
+        Descarta o trabalho pedido para o nível anterior.
+        
+        Cancela a fila e solta as buscas em andamento: elas terminam nos
+        workers, mas o resultado é ignorado e o future recebe um erro. A
+        próxima busca publica uma versão nova do grid.
+        """
+        with self._lock:
+            self.clear()
+            running = list(self._running)
+            self._running.clear()
+            self._last_grid = None
+        for future in running:
+            future.set_exception(RuntimeError("busca descartada: nível recarregado"))
+    
+    def shutdown(self):
+        """Encerra o pool sem esperar buscas em andamento."""
+        if self._executor is None:
+            return
+        with self._lock:
+            self.clear()
+            executor = self._executor
+            self._executor = None
+            self._running.clear()
+            self._release_blocks(everything=True)
+            self._last_grid = None
+            self._grid_ref = None
+        executor.shutdown(wait=False)
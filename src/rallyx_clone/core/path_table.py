@@ -0,0 +1,368 @@
+"""
+Tabela de próximos passos pré-calculada para todos os pares de tiles.
+
+Os níveis são estáticos depois de carregados, então o próximo tile de
+qualquer tile livre até qualquer outro pode ser calculado uma única vez.
+A tabela fica em um arquivo binário em ``saves/cache`` cujo nome é o hash
+do grid (um nível alterado gera outro arquivo) e é mapeada em memória. Só
+as PATH_TABLE_CACHE_FILES tabelas usadas mais recentemente ficam no disco.
+"""
+import os
+import mmap
+import struct
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from .constants import (
+    TILE_WALL, TILE_BORDER, PATHFINDING_TABLE, PATH_TABLE_MAX_TILES,
+    PATH_TABLE_CACHE_FILES
+)
+from .collision import GridCache, add_grid_listener
+from .pathfinding import (
+    DIRECTIONS, PathfindingEngine, register_engine, bfs_pathfind
+)
+
+
+# Cabeçalho: magic, versão, largura, altura, tiles livres
+_HEADER = struct.Struct("<4sIIII")
+_MAGIC = b"RXNH"
+_VERSION = 1
+
+# Sem próximo passo (destino inalcançável ou o próprio tile)
+NO_HOP = 255
+
+# Grid ainda sem entrada no cache (a tabela guardada pode ser None)
+_MISSING = object()
+
+
+class NextHopTable:
+    """Próximo passo (índice em DIRECTIONS) para cada par de tiles livres."""
+    
+    # Tabelas já carregadas, por hash do grid
+    _loaded: Dict[str, "NextHopTable"] = {}
+    
+    # Último grid consultado e sua tabela, por thread
+    _cache = GridCache()
+    
+    # Hash do último grid visto, por thread (consultas sem tabela carregada
+    # não recalculam o hash a cada passo)
+    _digests = GridCache()
+    
+    def __init__(self, grid: List[List[int]], digest: str):
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height > 0 else 0
+        self.digest = digest
+        
+        # Índice compacto de cada tile livre (-1 = bloqueado)
+        self.tile_ids: List[int] = [-1] * (self.width * self.height)
+        self.tiles: List[Tuple[int, int]] = []
+        for ty, row in enumerate(grid):
+            for tx, tile_type in enumerate(row):
+                if tile_type not in (TILE_WALL, TILE_BORDER):
+                    self.tile_ids[ty * self.width + tx] = len(self.tiles)
+                    self.tiles.append((tx, ty))
+        self.count = len(self.tiles)
+        
+        self._file = None
+        self._table = None  # mmap ou bytearray
+    
+    @classmethod
+    def for_grid(cls, grid: List[List[int]]) -> Optional["NextHopTable"]:
+        """
+        Retorna a tabela de um grid, carregando do cache ou construindo.
+        
+        Args:
+            grid: Grid do mapa
+        
+        Returns:
+            Tabela pronta ou None se o mapa tem tiles livres demais
+        """
+        table = cls._cache.get(grid, _MISSING)
+        if table is not _MISSING:
+            return table
+        
+        digest = cls._digest(grid)
+        table = cls._loaded.get(digest)
+        if table is None:
+            table = cls._load_or_build(grid, digest)
+        return cls._cache.put(grid, table)
+    
+    @classmethod
+    def _digest(cls, grid: List[List[int]]) -> str:
+        """Hash do grid, calculado uma vez por objeto de grid."""
+        digest = cls._digests.get(grid)
+        if digest is None:
+            digest = cls._digests.put(grid, grid_digest(grid))
+        return digest
+    
+    @classmethod
+    def _load_or_build(cls, grid: List[List[int]],
+                       digest: str) -> Optional["NextHopTable"]:
+        """Mapeia a tabela do cache em disco, reconstruindo se preciso."""
+        table = cls(grid, digest)
+        if table.count > PATH_TABLE_MAX_TILES:
+            return None
+        
+        cache_dir = _get_cache_dir()
+        path = os.path.join(cache_dir, f"nexthop_{digest[:16]}.bin")
+        if table._open(path):
+            _touch(path)
+        else:
+            table._build()
+            table._save(path)
+            table._open(path)
+            _prune_cache(cache_dir, keep=path)
+        
+        cls._loaded[digest] = table
+        return table
+    
+    @classmethod
+    def loaded_for(cls, grid: List[List[int]]) -> Optional["NextHopTable"]:
+        """Retorna a tabela do grid apenas se já foi pré-calculada."""
+        table = cls._cache.get(grid, _MISSING)
+        if table is not _MISSING:
+            return table
+        if not cls._loaded:
+            return None
+        return cls._loaded.get(cls._digest(grid))
+    
+    @classmethod
+    def clear_cache(cls):
+        """Fecha e esquece todas as tabelas carregadas."""
+        for table in cls._loaded.values():
+            table.close()
+        cls._loaded.clear()
+        cls._cache = GridCache()  # Nova instância: vale para todas as threads
+    
+    @classmethod
+    def forget(cls, grid: List[List[int]], tiles=None):
+        """Esquece o grid alterado (o hash do conteúdo novo é outro)."""
+        cls._cache.forget(grid)
+        cls._digests.forget(grid)
+    
+    def _build(self):
+        """Uma BFS reversa por destino preenche a coluna dele na tabela."""
+        count = self.count
+        width = self.width
+        tile_ids = self.tile_ids
+        
+        # Vizinhos livres de cada tile e a direção vizinho -> tile
+        neighbours: List[List[Tuple[int, int]]] = []
+        for tx, ty in self.tiles:
+            entries = []
+            for direction, (dx, dy) in enumerate(DIRECTIONS):
+                nx, ny = tx + dx, ty + dy
+                if 0 <= nx < width and 0 <= ny < self.height:
+                    n_id = tile_ids[ny * width + nx]
+                    if n_id >= 0:
+                        # DIRECTIONS alterna sentidos opostos em pares
+                        entries.append((n_id, direction ^ 1))
+            neighbours.append(entries)
+        
+        table = bytearray([NO_HOP]) * (count * count)
+        
+        for goal in range(count):
+            visited = bytearray(count)
+            visited[goal] = 1
+            frontier = [goal]
+            
+            while frontier:
+                next_frontier = []
+                for current in frontier:
+                    for n_id, direction in neighbours[current]:
+                        if visited[n_id]:
+                            continue
+                        visited[n_id] = 1
+                        table[n_id * count + goal] = direction
+                        next_frontier.append(n_id)
+                frontier = next_frontier
+        
+        self._table = table
+    
+    def _save(self, path: str):
+        """Grava a tabela no cache."""
+        try:
+            with open(path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, self.width,
+                                     self.height, self.count))
+                f.write(self._table)
+        except IOError:
+            pass  # Segue com a tabela em memória
+    
+    def _open(self, path: str) -> bool:
+        """Mapeia o arquivo do cache em memória se for válido."""
+        try:
+            f = open(path, 'rb')
+        except IOError:
+            return False
+        
+        try:
+            header = f.read(_HEADER.size)
+            expected = _HEADER.pack(_MAGIC, _VERSION, self.width,
+                                    self.height, self.count)
+            size = os.fstat(f.fileno()).st_size
+            if header != expected or size != _HEADER.size + self.count * self.count:
+                f.close()
+                return False
+            
+            self._table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._file = f
+            return True
+        except (IOError, ValueError):
+            f.close()
+            return False
+    
+    def close(self):
+        """Libera o mapeamento do arquivo."""
+        if isinstance(self._table, mmap.mmap):
+            self._table.close()
+        self._table = None
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def _hop(self, start_id: int, goal_id: int) -> int:
+        """Lê o próximo passo de um par de tiles livres."""
+        offset = start_id * self.count + goal_id
+        if isinstance(self._table, mmap.mmap):
+            offset += _HEADER.size
+        return self._table[offset]
+    
+    def _tile_id(self, tile: Tuple[int, int]) -> int:
+        """Índice compacto de um tile (-1 se bloqueado ou fora do mapa)."""
+        tx, ty = tile
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return self.tile_ids[ty * self.width + tx]
+        return -1
+    
+    def is_free(self, tile: Tuple[int, int]) -> bool:
+        """Retorna True se o tile tem linha na tabela (livre e no mapa)."""
+        return self._tile_id(tile) >= 0
+    
+    def next_tile(self, start: Tuple[int, int],
+                  goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Retorna o próximo tile no caminho mais curto.
+        
+        Args:
+            start: Tile atual
+            goal: Tile destino
+        
+        Returns:
+            Próximo tile ou None se não há caminho
+        """
+        start_id = self._tile_id(start)
+        goal_id = self._tile_id(goal)
+        if start_id < 0 or goal_id < 0:
+            return None
+        
+        direction = self._hop(start_id, goal_id)
+        if direction == NO_HOP:
+            return None
+        dx, dy = DIRECTIONS[direction]
+        return start[0] + dx, start[1] + dy
+    
+    def path(self, start: Tuple[int, int], goal: Tuple[int, int],
+             max_distance: int = 50) -> List[Tuple[int, int]]:
+        """
+        Monta o caminho seguindo a tabela.
+        
+        Args:
+            start: Tile inicial (precisa ser livre)
+            goal: Tile destino
+            max_distance: Distância máxima (mesma regra do BFS)
+        
+        Returns:
+            Lista de tiles do caminho (vazio se não há caminho)
+        """
+        if start == goal:
+            return [goal]
+        
+        path = [start]
+        tile = start
+        while tile != goal:
+            if len(path) > max_distance:
+                return []
+            tile = self.next_tile(tile, goal)
+            if tile is None:
+                return []
+            path.append(tile)
+        return path
+
+
+add_grid_listener(NextHopTable.forget)
+
+
+def grid_digest(grid: List[List[int]]) -> str:
+    """Hash do conteúdo do grid (e da versão do formato)."""
+    height = len(grid)
+    width = len(grid[0]) if height > 0 else 0
+    digest = hashlib.sha1(struct.pack("<III", _VERSION, width, height))
+    for row in grid:
+        digest.update(bytes(row))
+    return digest.hexdigest()
+
+
+def _get_cache_dir() -> str:
+    """Retorna o diretório do cache de tabelas."""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cache_dir = os.path.join(os.path.dirname(base_dir), "saves", "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def _touch(path: str):
+    """Marca o arquivo como usado agora (a limpeza remove os mais antigos)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _prune_cache(cache_dir: str, keep: str):
+    """
+    Remove as tabelas usadas há mais tempo além do limite.
+    
+    Args:
+        cache_dir: Diretório do cache
+        keep: Arquivo que nunca é removido (o recém-gravado)
+    """
+    try:
+        names = [name for name in os.listdir(cache_dir)
+                 if name.startswith("nexthop_") and name.endswith(".bin")]
+    except OSError:
+        return
+    if len(names) <= PATH_TABLE_CACHE_FILES:
+        return
+    
+    files = []
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            files.append((os.path.getmtime(path), path))
+        except OSError:
+            continue
+    files.sort(reverse=True)
+    
+    for _, path in files[PATH_TABLE_CACHE_FILES:]:
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Em uso por outro processo (Windows): fica para a próxima
+
+
+@register_engine
+class TableEngine(PathfindingEngine):
+    """Consulta a tabela pré-calculada; cai no BFS se não houver tabela."""
+    
+    name = PATHFINDING_TABLE
+    
+    def find_path(self, start, goal, grid, max_distance=50):
+        table = NextHopTable.for_grid(grid)
+        if table is None or not table.is_free(start):
+            return bfs_pathfind(start, goal, grid, max_distance)
+        
+        path = table.path(start, goal, max_distance)
+        self.last_expanded = 0
+        return path
@@ -1,9 +1,23 @@
 """
-Pathfinding BFS para inimigos.
+Pathfinding para inimigos: BFS, A*, BFS bidirecional, grafo de cruzamentos
+e campo de distâncias.
 """
-from collections import deque
-from typing import List, Tuple, Optional
-from .collision import is_tile_blocked
+import heapq
+from typing import Dict, Generator, List, Sequence, Tuple, Optional, Type
+from .collision import (
+    BlockedMask, GridCache, as_blocked_mask, add_grid_listener
+)
+from . import wavefront
+from .constants import (
+    TILE_WALL, TILE_BORDER,
+    PATHFINDING_BFS, PATHFINDING_ASTAR, PATHFINDING_BIDIRECTIONAL,
+    PATHFINDING_JUNCTION,
+    PATH_STEP_BATCH, WAVEFRONT_MIN_TILES
+)
+
+
+# Direções: cima, baixo, esquerda, direita
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
 
 
 def bfs_pathfind(start: Tuple[int, int], goal: Tuple[int, int],
@@ -11,6 +25,10 @@ def bfs_pathfind(start: Tuple[int, int], goal: Tuple[int, int],
     """
     Encontra caminho usando BFS.
     
+    Guarda apenas o predecessor de cada tile em um array plano indexado
+    como a BlockedMask do grid e reconstrói o caminho uma única vez, ao
+    alcançar o destino.
+    
     Args:
         start: Tile inicial (tx, ty)
         goal: Tile destino (tx, ty)
@@ -20,46 +38,892 @@ def bfs_pathfind(start: Tuple[int, int], goal: Tuple[int, int],
     Returns:
         Lista de tiles do caminho (vazio se não encontrou)
     """
+    return _bfs_search(start, goal, grid, max_distance)[0]
+
+
+def _bfs_search(start: Tuple[int, int], goal: Tuple[int, int],
+                grid: List[List[int]],
+                max_distance: int) -> Tuple[List[Tuple[int, int]], int]:
+    """BFS de ``bfs_pathfind``; retorna também o número de nós expandidos."""
+    try:
+        next(bfs_search_steps(start, goal, grid, max_distance, batch=0))
+    except StopIteration as finished:
+        return finished.value
+    return [], 0  # Inalcançável: sem lote, o gerador nunca cede
+
+
+def bfs_search_steps(start: Tuple[int, int], goal: Tuple[int, int],
+                     grid: List[List[int]], max_distance: int = 50,
+                     batch: int = 64) -> Generator[None, None, Tuple[List[Tuple[int, int]], int]]:
+    """
+    BFS fatiada: cede o controle a cada ``batch`` nós expandidos.
+    
+    Permite continuar uma busca longa no frame seguinte. O valor de
+    retorno do gerador é a tupla (caminho, nós expandidos).
+    
+    Args:
+        start: Tile inicial (tx, ty)
+        goal: Tile destino (tx, ty)
+        grid: Grid do mapa
+        max_distance: Distância máxima de busca
+        batch: Nós expandidos entre pausas (0 = nunca pausa: cada nível
+            é expandido de uma vez)
+    """
     if start == goal:
-        return [goal]
+        return [goal], 0
     
-    # BFS
-    queue = deque([(start, [start])])
-    visited = {start}
+    # Índices na máscara com moldura: vizinhos sem verificar limites
+    mask = as_blocked_mask(grid)
+    cells = mask.cells
+    stride = mask.stride
+    if not mask.contains(*start):
+        return [], 0  # Início longe do mapa: nenhum vizinho livre
+    start_index = mask.index(*start)
+    goal_index = mask.index(*goal) if mask.contains(*goal) else -1
+    offsets = tuple(dy * stride + dx for dx, dy in DIRECTIONS)
     
-    # Direções: cima, baixo, esquerda, direita
-    directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+    # Predecessores: -1 = não visitado
+    parents = [-1] * len(cells)
+    parents[start_index] = start_index
     
-    while queue:
-        (cx, cy), path = queue.popleft()
+    # Expande nível a nível: a profundidade substitui len(path)
+    frontier = [start_index]
+    depth = 1
+    expanded = 0
+    
+    while frontier and depth <= max_distance:
+        next_frontier = []
         
-        # Limita distância
-        if len(path) > max_distance:
-            continue
+        # Fatias de ``batch`` nós, com uma pausa depois de cada uma
+        chunk = batch or len(frontier)
+        for begin in range(0, len(frontier), chunk):
+            nodes = frontier[begin:begin + chunk] if batch else frontier
+            found = _expand_frontier(nodes, cells, offsets, parents,
+                                     goal_index, next_frontier)
+            if found:
+                path = _rebuild_path(parents, goal_index, start, start_index, mask)
+                return path, expanded + found
+            expanded += len(nodes)
+            if batch:
+                yield
         
-        for dx, dy in directions:
-            nx, ny = cx + dx, cy + dy
-            
-            if (nx, ny) in visited:
+        frontier = next_frontier
+        depth += 1
+    
+    # Não encontrou caminho
+    return [], expanded
+
+
+def _expand_frontier(nodes: List[int], cells: bytearray, offsets: Tuple[int, ...],
+                     parents: List[int], goal_index: int,
+                     next_frontier: List[int]) -> int:
+    """
+    Expande nós da fronteira, marcando os predecessores dos vizinhos.
+    
+    Returns:
+        Quantos nós foram expandidos até alcançar o destino (0 se não o
+        alcançou; os vizinhos novos ficam em ``next_frontier``)
+    """
+    for position, index in enumerate(nodes):
+        for offset in offsets:
+            n_index = index + offset
+            if cells[n_index] or parents[n_index] != -1:
                 continue
             
-            if is_tile_blocked(nx, ny, grid):
+            parents[n_index] = index
+            
+            if n_index == goal_index:
+                return position + 1
+            
+            next_frontier.append(n_index)
+    return 0
+
+
+def _rebuild_path(parents: List[int], index: int, start: Tuple[int, int],
+                  start_index: int, mask: BlockedMask) -> List[Tuple[int, int]]:
+    """Reconstrói o caminho seguindo os predecessores até o início."""
+    path = []
+    while index != start_index:
+        path.append(mask.tile_at(index))
+        index = parents[index]
+    path.append(start)
+    path.reverse()
+    return path
+
+
+class PathfindingEngine:
+    """
+    Interface comum dos algoritmos de busca.
+    
+    Cada inimigo tem sua própria instância, então engines podem guardar
+    estado entre chamadas (e limpá-lo em ``reset``).
+    """
+    
+    name = ""
+    long_range = False  # Feita para buscas além do limite padrão de distância
+    
+    def __init__(self):
+        self.last_expanded = 0  # Nós expandidos na última busca
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  grid: List[List[int]], max_distance: int = 50) -> List[Tuple[int, int]]:
+        """
+        Encontra caminho entre dois tiles.
+        
+        Args:
+            start: Tile inicial (tx, ty)
+            goal: Tile destino (tx, ty)
+            grid: Grid do mapa
+            max_distance: Distância máxima de busca
+        
+        Returns:
+            Lista de tiles do caminho (vazio se não encontrou)
+        """
+        raise NotImplementedError
+    
+    def search_steps(self, start: Tuple[int, int], goal: Tuple[int, int],
+                     grid: List[List[int]],
+                     max_distance: int = 50) -> Generator[None, None, List[Tuple[int, int]]]:
+        """
+        Versão fatiada de ``find_path`` para o escalonador de buscas.
+        
+        O gerador cede o controle entre lotes de trabalho e retorna o
+        caminho. Engines sem versão fatiada fazem a busca inteira no
+        primeiro passo.
+        """
+        yield
+        return self.find_path(start, goal, grid, max_distance)
+    
+    def find_waypoints(self, start: Tuple[int, int], goal: Tuple[int, int],
+                       grid: List[List[int]],
+                       max_distance: int = 50) -> List[Tuple[int, int]]:
+        """
+        Como ``find_path``, mas retorna só início, curvas e destino.
+        
+        Returns:
+            Pontos de passagem ligados por trechos retos (vazio se não
+            encontrou)
+        """
+        return path_to_waypoints(self.find_path(start, goal, grid, max_distance))
+    
+    def reset(self):
+        """Descarta qualquer estado guardado entre buscas."""
+        pass
+    
+    def tiles_changed(self, tiles: Optional[List[Tuple[int, int]]] = None):
+        """
+        Avisa que tiles do grid mudaram de tipo.
+        
+        Engines incrementais reparam o estado guardado; as demais só o
+        descartam.
+        
+        Args:
+            tiles: Tiles alterados (None = qualquer tile)
+        """
+        self.reset()
+
+
+PATHFINDING_ENGINES: Dict[str, Type[PathfindingEngine]] = {}
+
+
+def register_engine(cls: Type[PathfindingEngine]) -> Type[PathfindingEngine]:
+    """Registra uma engine de busca pelo seu nome (usável como decorator)."""
+    PATHFINDING_ENGINES[cls.name] = cls
+    return cls
+
+
+def create_engine(name: str = PATHFINDING_BFS) -> PathfindingEngine:
+    """
+    Cria uma engine de busca pelo nome.
+    
+    Args:
+        name: Nome registrado da engine
+    
+    Returns:
+        Nova instância da engine (BFS se o nome é desconhecido)
+    """
+    cls = PATHFINDING_ENGINES.get(name, PATHFINDING_ENGINES[PATHFINDING_BFS])
+    return cls()
+
+
+@register_engine
+class BFSEngine(PathfindingEngine):
+    """BFS simples; ótimo em mapas pequenos e labirínticos."""
+    
+    name = PATHFINDING_BFS
+    
+    def find_path(self, start, goal, grid, max_distance=50):
+        path, self.last_expanded = _bfs_search(start, goal, grid, max_distance)
+        return path
+    
+    def search_steps(self, start, goal, grid, max_distance=50):
+        path, self.last_expanded = yield from bfs_search_steps(
+            start, goal, grid, max_distance, batch=PATH_STEP_BATCH)
+        return path
+
+
+@register_engine
+class AStarEngine(PathfindingEngine):
+    """
+    A* com heurística Manhattan.
+    
+    Empates em f são resolvidos pelo menor h, o que aprofunda a busca na
+    direção do destino; em mapas abertos expande uma fração dos nós do BFS.
+    """
+    
+    name = PATHFINDING_ASTAR
+    
+    def find_path(self, start, goal, grid, max_distance=50):
+        self.last_expanded = 0
+        if start == goal:
+            return [goal]
+        
+        mask = as_blocked_mask(grid)
+        cells = mask.cells
+        stride = mask.stride
+        gx, gy = goal
+        if mask.is_blocked(gx, gy) or not mask.contains(*start):
+            return []
+        
+        parents = {start: None}
+        costs = {start: 0}
+        h = abs(start[0] - gx) + abs(start[1] - gy)
+        # (f, h, ordem de inserção, tile)
+        open_heap = [(h, h, 0, start)]
+        counter = 1
+        
+        while open_heap:
+            _, _, _, current = heapq.heappop(open_heap)
+            cost = costs[current]
+            
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                path.reverse()
+                return path
+            
+            # Limita distância (mesma regra do BFS)
+            if cost >= max_distance:
                 continue
             
-            new_path = path + [(nx, ny)]
+            self.last_expanded += 1
+            cx, cy = current
+            new_cost = cost + 1
+            
+            for dx, dy in DIRECTIONS:
+                nx = cx + dx
+                ny = cy + dy
+                
+                # A moldura da máscara dispensa verificar limites
+                if cells[(ny + 1) * stride + nx + 1]:
+                    continue
+                
+                neighbour = (nx, ny)
+                if new_cost >= costs.get(neighbour, new_cost + 1):
+                    continue
+                
+                costs[neighbour] = new_cost
+                parents[neighbour] = current
+                h = abs(nx - gx) + abs(ny - gy)
+                heapq.heappush(open_heap, (new_cost + h, h, counter, neighbour))
+                counter += 1
+        
+        return []
+
+
+@register_engine
+class BidirectionalBFSEngine(PathfindingEngine):
+    """
+    BFS bidirecional: expande alternadamente a menor fronteira a partir do
+    início e do destino até que se encontrem.
+    """
+    
+    name = PATHFINDING_BIDIRECTIONAL
+    
+    def find_path(self, start, goal, grid, max_distance=50):
+        self.last_expanded = 0
+        if start == goal:
+            return [goal]
+        mask = as_blocked_mask(grid)
+        if mask.is_blocked(*goal) or not mask.contains(*start):
+            return []
+        cells = mask.cells
+        stride = mask.stride
+        
+        forward = {start: None}
+        backward = {goal: None}
+        forward_frontier = [start]
+        backward_frontier = [goal]
+        forward_depth = 0
+        backward_depth = 0
+        
+        while forward_frontier and backward_frontier:
+            # Já não há caminho dentro do limite
+            if forward_depth + backward_depth >= max_distance:
+                return []
+            
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, parents, others = forward_frontier, forward, backward
+            else:
+                frontier, parents, others = backward_frontier, backward, forward
             
-            if (nx, ny) == goal:
-                return new_path
+            next_frontier = []
+            for cx, cy in frontier:
+                self.last_expanded += 1
+                for dx, dy in DIRECTIONS:
+                    neighbour = (cx + dx, cy + dy)
+                    if neighbour in parents:
+                        continue
+                    
+                    # Encontro das buscas
+                    if neighbour in others:
+                        parents[neighbour] = (cx, cy)
+                        return self._join(neighbour, forward, backward)
+                    
+                    nx, ny = neighbour
+                    if cells[(ny + 1) * stride + nx + 1]:
+                        continue
+                    
+                    parents[neighbour] = (cx, cy)
+                    next_frontier.append(neighbour)
             
-            visited.add((nx, ny))
-            queue.append(((nx, ny), new_path))
+            if expand_forward:
+                forward_frontier = next_frontier
+                forward_depth += 1
+            else:
+                backward_frontier = next_frontier
+                backward_depth += 1
+        
+        return []
     
-    # Não encontrou caminho
-    return []
+    def _join(self, meeting: Tuple[int, int], forward: dict,
+              backward: dict) -> List[Tuple[int, int]]:
+        """Une as duas metades do caminho no ponto de encontro."""
+        path = []
+        tile = meeting
+        while tile is not None:
+            path.append(tile)
+            tile = forward[tile]
+        path.reverse()
+        
+        tile = backward[meeting]
+        while tile is not None:
+            path.append(tile)
+            tile = backward[tile]
+        return path
+
+
+class JunctionGraph:
+    """
+    Grid comprimido em cruzamentos e corredores.
+    
+    Tiles livres com número de vizinhos livres diferente de 2 (cruzamentos
+    e becos sem saída) viram nós; cada sequência de tiles com exatamente
+    dois vizinhos entre dois nós vira uma aresta com o comprimento do
+    corredor. A busca roda nesse grafo e o resultado é uma lista de pontos
+    de passagem (início, curvas e destino) ligados por trechos retos.
+    """
+    
+    # Último grafo construído, por thread
+    _cache = GridCache()
+    
+    def __init__(self, grid: List[List[int]]):
+        """
+        Constrói o grafo.
+        
+        Args:
+            grid: Grid do mapa
+        """
+        self.grid = grid
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height > 0 else 0
+        self.mask = as_blocked_mask(grid)
+        self.last_expanded = 0
+        
+        # Arestas: (nó a, nó b, tiles de a até b, índices das curvas)
+        self.edges: List[Tuple[Tuple[int, int], Tuple[int, int],
+                               List[Tuple[int, int]], List[int]]] = []
+        # Nó -> [(vizinho, custo, aresta)]
+        self.adjacency: Dict[Tuple[int, int], List[Tuple[Tuple[int, int], int, int]]] = {}
+        # Tile interno de corredor -> (aresta, posição na aresta)
+        self.corridor: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        
+        self._build()
+    
+    @classmethod
+    def for_grid(cls, grid: List[List[int]]) -> "JunctionGraph":
+        """Retorna o grafo do grid, construindo apenas quando o grid muda."""
+        graph = cls._cache.get(grid)
+        if graph is None:
+            graph = cls._cache.put(grid, cls(grid))
+        return graph
+    
+    @classmethod
+    def forget(cls, grid: List[List[int]], tiles=None):
+        """Descarta o grafo guardado se ele é o do grid alterado."""
+        cls._cache.forget(grid)
+    
+    def is_free(self, tile: Tuple[int, int]) -> bool:
+        """Retorna True se o tile existe e não bloqueia passagem."""
+        return not self.mask.is_blocked(*tile)
+    
+    def _free_neighbours(self, tile: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Vizinhos livres de um tile."""
+        tx, ty = tile
+        return [(tx + dx, ty + dy) for dx, dy in DIRECTIONS
+                if self.is_free((tx + dx, ty + dy))]
+    
+    def _build(self):
+        """Encontra os nós e percorre os corredores entre eles."""
+        free = [(tx, ty) for ty in range(self.height) for tx in range(self.width)
+                if self.is_free((tx, ty))]
+        neighbours = {tile: self._free_neighbours(tile) for tile in free}
+        
+        for tile in free:
+            if len(neighbours[tile]) != 2:
+                self.adjacency[tile] = []
+        for node in list(self.adjacency):
+            self._walk_corridors(node, neighbours)
+        
+        # Anéis sem cruzamento: qualquer tile do anel vira nó
+        for tile in free:
+            if tile not in self.adjacency and tile not in self.corridor:
+                self.adjacency[tile] = []
+                self._walk_corridors(tile, neighbours)
+    
+    def _walk_corridors(self, node: Tuple[int, int],
+                        neighbours: Dict[Tuple[int, int], List[Tuple[int, int]]]):
+        """Cria as arestas que saem de um nó (uma vez por corredor)."""
+        for first in neighbours[node]:
+            if first in self.corridor:
+                continue  # Corredor já percorrido a partir da outra ponta
+            if first in self.adjacency and any(
+                    other == first and len(self.edges[edge][2]) == 2
+                    for other, _, edge in self.adjacency[node]):
+                continue  # Nós vizinhos já ligados
+            
+            tiles = [node, first]
+            previous, current = node, first
+            while current not in self.adjacency:
+                a, b = neighbours[current]
+                previous, current = current, (b if a == previous else a)
+                tiles.append(current)
+            self._add_edge(tiles)
+    
+    def _add_edge(self, tiles: List[Tuple[int, int]]):
+        """Registra um corredor como aresta."""
+        edge = len(self.edges)
+        a, b = tiles[0], tiles[-1]
+        bends = [i for i in range(1, len(tiles) - 1)
+                 if (tiles[i][0] - tiles[i - 1][0], tiles[i][1] - tiles[i - 1][1]) !=
+                    (tiles[i + 1][0] - tiles[i][0], tiles[i + 1][1] - tiles[i][1])]
+        self.edges.append((a, b, tiles, bends))
+        
+        for offset in range(1, len(tiles) - 1):
+            self.corridor[tiles[offset]] = (edge, offset)
+        if a != b:
+            cost = len(tiles) - 1
+            self.adjacency[a].append((b, cost, edge))
+            self.adjacency[b].append((a, cost, edge))
+    
+    def _links(self, tile: Tuple[int, int]) -> List[Tuple[Tuple[int, int], int, tuple]]:
+        """
+        Liga um tile qualquer aos nós do grafo.
+        
+        Returns:
+            Lista (nó, custo, trecho) onde trecho é (aresta, de, até)
+        """
+        if tile in self.adjacency:
+            return [(tile, 0, None)]
+        edge, offset = self.corridor[tile]
+        a, b, tiles, _ = self.edges[edge]
+        last = len(tiles) - 1
+        return [(a, offset, (edge, offset, 0)),
+                (b, last - offset, (edge, offset, last))]
+    
+    def search(self, start: Tuple[int, int], goal: Tuple[int, int],
+               max_distance: Optional[int] = None) -> Optional[List[tuple]]:
+        """
+        A* no grafo entre dois tiles livres.
+        
+        Args:
+            start: Tile inicial (livre)
+            goal: Tile destino (livre)
+            max_distance: Distância máxima em tiles (None = sem limite)
+        
+        Returns:
+            Trechos (aresta, de, até) do caminho, ou None se não encontrou
+        """
+        self.last_expanded = 0
+        gx, gy = goal
+        goal_key = ("goal",)
+        costs: Dict[object, int] = {}
+        parents: Dict[object, Tuple[object, Optional[tuple]]] = {}
+        open_heap: List[tuple] = []
+        counter = 0
+        
+        def push(key, cost, parent, leg, h):
+            nonlocal counter
+            if max_distance is not None and cost > max_distance:
+                return
+            if cost >= costs.get(key, cost + 1):
+                return
+            costs[key] = cost
+            parents[key] = (parent, leg)
+            heapq.heappush(open_heap, (cost + h, counter, key, cost))
+            counter += 1
+        
+        goal_links = {}
+        for node, cost, leg in self._links(goal):
+            if node not in goal_links or cost < goal_links[node][0]:
+                # O trecho até o destino é percorrido no sentido inverso
+                goal_links[node] = (cost, leg and (leg[0], leg[2], leg[1]))
+        
+        for node, cost, leg in self._links(start):
+            push(node, cost, None, leg, abs(node[0] - gx) + abs(node[1] - gy))
+        
+        # Início e destino no mesmo corredor
+        start_place = self.corridor.get(start)
+        goal_place = self.corridor.get(goal)
+        if start_place and goal_place and start_place[0] == goal_place[0]:
+            push(goal_key, abs(start_place[1] - goal_place[1]), None,
+                 (start_place[0], start_place[1], goal_place[1]), 0)
+        
+        while open_heap:
+            _, _, current, cost = heapq.heappop(open_heap)
+            if cost > costs[current]:
+                continue  # Entrada obsoleta
+            if current == goal_key:
+                legs = []
+                while current is not None:
+                    current, leg = parents[current]
+                    if leg is not None:
+                        legs.append(leg)
+                legs.reverse()
+                return legs
+            
+            self.last_expanded += 1
+            link = goal_links.get(current)
+            if link is not None:
+                push(goal_key, cost + link[0], current, link[1], 0)
+            
+            for neighbour, edge_cost, edge in self.adjacency[current]:
+                a = self.edges[edge][0]
+                last = len(self.edges[edge][2]) - 1
+                leg = (edge, 0, last) if current == a else (edge, last, 0)
+                push(neighbour, cost + edge_cost, current, leg,
+                     abs(neighbour[0] - gx) + abs(neighbour[1] - gy))
+        
+        return None
+    
+    def _leg_tiles(self, leg: tuple) -> List[Tuple[int, int]]:
+        """Tiles de um trecho, inclusive as duas pontas, na ordem percorrida."""
+        edge, begin, end = leg
+        tiles = self.edges[edge][2]
+        if begin <= end:
+            return tiles[begin:end + 1]
+        return tiles[end:begin + 1][::-1]
+    
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  max_distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Busca no grafo e expande o resultado em tiles.
+        
+        Returns:
+            Lista de tiles do caminho (vazio se não encontrou)
+        """
+        if start == goal:
+            return [goal]
+        if not self.is_free(start) or not self.is_free(goal):
+            return []
+        legs = self.search(start, goal, max_distance)
+        if legs is None:
+            return []
+        
+        path = [start]
+        for leg in legs:
+            path.extend(self._leg_tiles(leg)[1:])
+        return path
+    
+    def find_waypoints(self, start: Tuple[int, int], goal: Tuple[int, int],
+                       max_distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Busca no grafo sem expandir os corredores.
+        
+        Returns:
+            Início, curvas e destino, ligados por trechos retos (vazio se
+            não encontrou)
+        """
+        if start == goal:
+            return [goal]
+        if not self.is_free(start) or not self.is_free(goal):
+            return []
+        legs = self.search(start, goal, max_distance)
+        if legs is None:
+            return []
+        
+        points = [start]
+        for edge, begin, end in legs:
+            tiles = self.edges[edge][2]
+            bends = self.edges[edge][3]
+            if begin <= end:
+                inner = [i for i in bends if begin < i < end]
+            else:
+                inner = [i for i in reversed(bends) if end < i < begin]
+            points.extend(tiles[i] for i in inner)
+            points.append(tiles[end])
+        return path_to_waypoints(points)
+
+
+add_grid_listener(JunctionGraph.forget)
+
+
+def path_to_waypoints(path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Reduz um caminho aos pontos onde ele muda de direção.
+    
+    Args:
+        path: Tiles (ou pontos ligados por trechos retos) do caminho
+    
+    Returns:
+        Início, curvas e destino
+    """
+    if len(path) <= 2:
+        return list(path)
+    
+    waypoints = [path[0]]
+    for previous, current, following in zip(path, path[1:], path[2:]):
+        if not ((previous[0] == current[0] == following[0]) or
+                (previous[1] == current[1] == following[1])):
+            waypoints.append(current)
+    waypoints.append(path[-1])
+    return waypoints
+
+
+def waypoints_to_path(waypoints: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Expande pontos de passagem ligados por trechos retos em tiles.
+    
+    Args:
+        waypoints: Pontos de passagem
+    
+    Returns:
+        Todos os tiles do caminho
+    """
+    if not waypoints:
+        return []
+    
+    path = [waypoints[0]]
+    for tx, ty in waypoints[1:]:
+        cx, cy = path[-1]
+        step_x = (tx > cx) - (tx < cx)
+        step_y = (ty > cy) - (ty < cy)
+        while (cx, cy) != (tx, ty):
+            cx += step_x
+            cy += step_y
+            path.append((cx, cy))
+    return path
+
+
+@register_engine
+class JunctionEngine(PathfindingEngine):
+    """Busca no grafo de cruzamentos do grid; ótima em mapas de corredores."""
+    
+    name = PATHFINDING_JUNCTION
+    
+    def find_path(self, start, goal, grid, max_distance=50):
+        graph = JunctionGraph.for_grid(grid)
+        if not graph.is_free(start):
+            # Carro encostado numa parede: mesma resposta do BFS
+            return bfs_pathfind(start, goal, grid, max_distance)
+        path = graph.find_path(start, goal, max_distance)
+        self.last_expanded = graph.last_expanded
+        return path
+    
+    def find_waypoints(self, start, goal, grid, max_distance=50):
+        graph = JunctionGraph.for_grid(grid)
+        if not graph.is_free(start):
+            return path_to_waypoints(bfs_pathfind(start, goal, grid, max_distance))
+        waypoints = graph.find_waypoints(start, goal, max_distance)
+        self.last_expanded = graph.last_expanded
+        return waypoints
+
+
+class FlowField:
+    """
+    Campo de distâncias até o jogador, compartilhado por todos os inimigos.
+    
+    Uma única BFS reversa a partir do tile do jogador é feita sempre que
+    ele muda de tile; cada inimigo lê seu próximo passo como o vizinho de
+    menor distância, em O(1). Em mapas grandes ``distances`` é o array
+    NumPy do kernel vetorizado, achatado sem cópia; nos demais, uma lista.
+    """
+    
+    UNREACHABLE = -1
+    
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.distances: Sequence[int] = []  # lista ou ndarray plano
+        self.target: Optional[Tuple[int, int]] = None
+        self._grid: List[List[int]] = []
+    
+    def set_grid(self, grid: List[List[int]]):
+        """
+        Define o grid do nível e invalida o campo atual.
+        
+        Args:
+            grid: Grid do mapa
+        """
+        self._grid = grid
+        self.height = len(grid)
+        self.width = len(grid[0]) if self.height > 0 else 0
+        self.distances = [self.UNREACHABLE] * (self.width * self.height)
+        self.target = None
+    
+    def invalidate(self):
+        """Força o recálculo no próximo ``update`` (o grid mudou)."""
+        self.target = None
+    
+    def update(self, target: Tuple[int, int]) -> bool:
+        """
+        Recalcula o campo se o alvo mudou de tile.
+        
+        Args:
+            target: Tile do jogador (tx, ty)
+        
+        Returns:
+            True se o campo foi recalculado
+        """
+        if target == self.target:
+            return False
+        
+        self.target = target
+        self._compute(target)
+        return True
+    
+    def _compute(self, target: Tuple[int, int]):
+        """BFS reversa a partir do alvo sobre todo o grid."""
+        width = self.width
+        height = self.height
+        grid = self._grid
+        
+        # Mapas maiores: o kernel vetorizado calcula o campo inteiro e os
+        # inimigos leem o próprio array (só alguns vizinhos por passo)
+        if wavefront.HAS_NUMPY and width * height >= WAVEFRONT_MIN_TILES:
+            self.distances = wavefront.distance_map_numpy(grid, target).ravel()
+            return
+        
+        self.distances = [self.UNREACHABLE] * (width * height)
+        tx, ty = target
+        if not (0 <= tx < width and 0 <= ty < height):
+            return
+        
+        # BFS nos índices da máscara com moldura (sem verificar limites)
+        mask = as_blocked_mask(grid)
+        cells = mask.cells
+        stride = mask.stride
+        offsets = tuple(dy * stride + dx for dx, dy in DIRECTIONS)
+        padded = [self.UNREACHABLE] * len(cells)
+        start_index = mask.index(tx, ty)
+        padded[start_index] = 0
+        frontier = [start_index]
+        distance = 1
+        
+        while frontier:
+            next_frontier = []
+            
+            for index in frontier:
+                for offset in offsets:
+                    n_index = index + offset
+                    if cells[n_index] or padded[n_index] != self.UNREACHABLE:
+                        continue
+                    
+                    padded[n_index] = distance
+                    next_frontier.append(n_index)
+            
+            frontier = next_frontier
+            distance += 1
+        
+        # Volta ao layout ty * width + tx, sem a moldura
+        distances = self.distances
+        for row in range(height):
+            base = (row + 1) * stride + 1
+            distances[row * width:(row + 1) * width] = padded[base:base + width]
+    
+    def distance_at(self, tile: Tuple[int, int]) -> int:
+        """
+        Retorna a distância de um tile até o alvo.
+        
+        Args:
+            tile: Tile (tx, ty)
+        
+        Returns:
+            Distância em tiles ou UNREACHABLE
+        """
+        tx, ty = tile
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return int(self.distances[ty * self.width + tx])
+        return self.UNREACHABLE
+    
+    def next_tile(self, tile: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Retorna o vizinho de menor distância até o alvo.
+        
+        Args:
+            tile: Tile atual
+        
+        Returns:
+            Próximo tile ou None se não há como se aproximar
+        """
+        best = None
+        best_distance = self.distance_at(tile)
+        if best_distance == self.UNREACHABLE:
+            best_distance = len(self.distances)
+        
+        tx, ty = tile
+        for dx, dy in DIRECTIONS:
+            neighbour = (tx + dx, ty + dy)
+            distance = self.distance_at(neighbour)
+            if distance != self.UNREACHABLE and distance < best_distance:
+                best = neighbour
+                best_distance = distance
+        
+        return best
+    
+    def path_from(self, start: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Desce o campo a partir de um tile até o alvo.
+        
+        Custa O(comprimento do caminho); os inimigos não precisam dele e
+        leem um passo por tile com ``next_tile``.
+        
+        Args:
+            start: Tile inicial
+        
+        Returns:
+            Lista de tiles do caminho (vazio se o alvo é inalcançável)
+        """
+        if start == self.target:
+            return [start]
+        
+        path = [start]
+        tile = self.next_tile(start)
+        while tile is not None:
+            path.append(tile)
+            if tile == self.target:
+                return path
+            tile = self.next_tile(tile)
+        
+        return []
 
 
 def get_next_tile(start: Tuple[int, int], goal: Tuple[int, int],
-                  grid: List[List[int]]) -> Optional[Tuple[int, int]]:
+                  grid: List[List[int]],
+                  max_distance: int = 50) -> Optional[Tuple[int, int]]:
     """
     Retorna o próximo tile no caminho para o objetivo.
     
@@ -67,11 +931,17 @@ def get_next_tile(start: Tuple[int, int], goal: Tuple[int, int],
         start: Tile atual
         goal: Tile destino
         grid: Grid do mapa
+        max_distance: Distância máxima de busca (mesma regra do BFS)
     
     Returns:
-        Próximo tile ou None se bloqueado
+        Próximo tile ou None se bloqueado ou mais longe que o limite
     """
-    path = bfs_pathfind(start, goal, grid)
+    # Com a tabela pré-calculada do nível, o caminho é lido sem busca
+    table = path_table.NextHopTable.loaded_for(grid)
+    if table is not None and table.is_free(start):
+        path = table.path(start, goal, max_distance)
+    else:
+        path = bfs_pathfind(start, goal, grid, max_distance)
     
     if len(path) > 1:
         return path[1]  # Próximo tile (índice 0 é o atual)
@@ -106,3 +976,8 @@ def get_direction_to_tile(current_x: float, current_y: float,
         dy /= length
     
     return dx, dy
+
+
+# path_table importa este módulo; importado por último, o ciclo resolve nas
+# duas ordens (get_next_tile só lê o atributo na hora da chamada)
+from . import path_table  # noqa: E402
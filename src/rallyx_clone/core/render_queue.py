@@ -0,0 +1,155 @@
+"""
+Fila de renderização por camadas.
+
+Em vez de cada entidade chamar ``screen.blit`` por conta própria, as
+entidades empilham (superfície, posição, camada) numa fila. Sprites fora
+da área visível são descartados já no push, e o flush envia cada camada,
+da menor para a maior, com uma única chamada a ``Surface.blits``. Dentro de
+uma camada vale a ordem de push.
+
+Os contadores do último frame (sprites enviados, descartados e chamadas de
+desenho) ficam expostos para profiling.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pygame
+
+
+class RenderQueue:
+    """Sprites de um frame agrupados por camada."""
+    
+    def __init__(self):
+        """Cria a fila vazia."""
+        self._layers: Dict[int, List[Tuple[pygame.Surface, Tuple[float, float]]]] = {}
+        self.view = pygame.Rect(0, 0, 0, 0)
+        self._bounds = (0, 0, 0, 0)  # view como tupla (recorte sem criar Rect)
+        self.camera_offset: Tuple[float, float] = (0, 0)
+        self.rects: List[pygame.Rect] = []
+        
+        # Contadores do último frame
+        self.submitted = 0
+        self.culled = 0
+        self.draw_calls = 0
+    
+    def begin(self, screen: pygame.Surface,
+              camera_offset: Tuple[float, float] = (0, 0)):
+        """
+        Começa um frame: esvazia a fila e zera os contadores.
+        
+        Args:
+            screen: Surface de destino (a área visível é o seu clip)
+            camera_offset: Offset da câmera, para as entidades calcularem
+                a posição na tela
+        """
+        for entries in self._layers.values():
+            entries.clear()
+        self.view = view = screen.get_clip()
+        self._bounds = (view.left, view.top, view.right, view.bottom)
+        self.camera_offset = camera_offset
+        self.rects = []
+        self.submitted = 0
+        self.culled = 0
+        self.draw_calls = 0
+    
+    def cull(self, x: float, y: float, width: float, height: float) -> bool:
+        """
+        Testa se uma área da tela está fora da área visível.
+        
+        Serve para descartar uma entidade antes de preparar o sprite (girar,
+        escolher quadro); o que for descartado entra na contagem.
+        
+        Args:
+            x, y: Canto superior esquerdo na tela
+            width, height: Tamanho
+        
+        Returns:
+            True se a área está toda fora (e foi contada como descartada)
+        """
+        left, top, right, bottom = self._bounds
+        if x + width <= left or x >= right or y + height <= top or y >= bottom:
+            self.culled += 1
+            return True
+        return False
+    
+    def push(self, surface: pygame.Surface, pos: Tuple[float, float],
+             layer: int = 0) -> bool:
+        """
+        Empilha um sprite, descartando-o se estiver fora da área visível.
+        
+        Args:
+            surface: Sprite
+            pos: Canto superior esquerdo na tela
+            layer: Camada (menores são desenhadas primeiro)
+        
+        Returns:
+            True se o sprite entrou na fila
+        """
+        x, y = pos
+        width, height = surface.get_size()
+        if self.cull(x, y, width, height):
+            return False
+        
+        entries = self._layers.get(layer)
+        if entries is None:
+            entries = self._layers[layer] = []
+        entries.append((surface, pos))
+        self.rects.append(pygame.Rect(x, y, width, height).clip(self.view))
+        self.submitted += 1
+        return True
+    
+    def extend(self, sprites: Sequence[Tuple[pygame.Surface, Tuple[float, float]]],
+               layer: int = 0, bounds: Optional[pygame.Rect] = None,
+               culled: int = 0):
+        """
+        Empilha sprites já recortados por quem os gerou (partículas).
+        
+        Args:
+            sprites: Pares (superfície, posição na tela)
+            layer: Camada
+            bounds: Área que cobre todos os sprites (vira uma área suja só)
+            culled: Quantos sprites o chamador descartou
+        """
+        self.culled += culled
+        if not sprites:
+            return
+        
+        entries = self._layers.get(layer)
+        if entries is None:
+            entries = self._layers[layer] = []
+        entries.extend(sprites)
+        self.submitted += len(sprites)
+        if bounds is not None:
+            rect = bounds.clip(self.view)
+            if rect:
+                self.rects.append(rect)
+    
+    def flush(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """
+        Desenha as camadas em ordem, um ``blits`` por camada não vazia.
+        
+        Args:
+            screen: Surface de destino
+        
+        Returns:
+            Áreas da tela cobertas pelos sprites do frame
+        """
+        for layer in sorted(self._layers):
+            entries = self._layers[layer]
+            if entries:
+                screen.blits(entries, doreturn=False)
+                self.draw_calls += 1
+                entries.clear()
+        return self.rects
+    
+    def stats(self) -> dict:
+        """
+        Retorna os contadores do último frame.
+        
+        Returns:
+            Dict com submitted, culled e draw_calls
+        """
+        return {
+            "submitted": self.submitted,
+            "culled": self.culled,
+            "draw_calls": self.draw_calls,
+        }
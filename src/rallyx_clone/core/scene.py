@@ -2,9 +2,13 @@
 Classe base Scene para todas as cenas do jogo.
 """
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, List, Optional
+
+from .dirty_rects import DirtyRegion
 
 if TYPE_CHECKING:
+    import pygame
+    
     from .state import StateMachine
 
 
@@ -13,6 +17,7 @@ class Scene(ABC):
     
     def __init__(self):
         self.state_machine: Optional["StateMachine"] = None
+        self.dirty = DirtyRegion()
     
     def on_enter(self, **kwargs):
         """
@@ -47,6 +52,18 @@ class Scene(ABC):
         """
         pass
     
+    def dirty_rects(self) -> Optional[List["pygame.Rect"]]:
+        """
+        Áreas da tela que mudaram desde o frame anterior.
+        
+        Chamado depois de draw, uma vez por frame. Cenas que não acompanham
+        o que desenham retornam None (a tela toda).
+        
+        Returns:
+            Lista de áreas (vazia = nada mudou) ou None para a tela toda
+        """
+        return None
+    
     @abstractmethod
     def handle_event(self, event):
         """
@@ -0,0 +1,133 @@
+"""
+Hash espacial em grade uniforme para a fase larga de colisão entre entidades.
+
+Cada entidade é registrada nas células (do tamanho de um tile) que sua
+caixa cobre. Uma consulta visita só as células da área pedida, então o
+teste exato entre entidades recebe apenas candidatos próximos, em vez de
+todas as entidades do nível.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+from .constants import TILE_SIZE
+
+
+class SpatialHash:
+    """Grade uniforme de células com as entidades que as ocupam."""
+    
+    def __init__(self, cell_size: int = TILE_SIZE):
+        """
+        Cria o hash vazio.
+        
+        Args:
+            cell_size: Lado de cada célula em pixels
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Any]] = {}
+        self._count = 0
+    
+    def __len__(self) -> int:
+        """Número de entidades registradas."""
+        return self._count
+    
+    def clear(self):
+        """Remove todas as entidades."""
+        self._cells.clear()
+        self._count = 0
+    
+    def _range(self, x: float, y: float, width: float,
+               height: float) -> Tuple[int, int, int, int]:
+        """Células (esquerda, topo, direita, base) cobertas por uma caixa."""
+        size = self.cell_size
+        return (int((x - width / 2) // size), int((y - height / 2) // size),
+                int((x + width / 2) // size), int((y + height / 2) // size))
+    
+    def insert(self, item: Any, x: float, y: float,
+               width: float = 0.0, height: float = 0.0):
+        """
+        Registra uma entidade.
+        
+        Args:
+            item: Entidade (qualquer objeto)
+            x, y: Posição central
+            width, height: Dimensões da caixa
+        """
+        left, top, right, bottom = self._range(x, y, width, height)
+        cells = self._cells
+        self._count += 1
+        
+        # Caso comum: a caixa cabe numa célula
+        if left == right and top == bottom:
+            bucket = cells.get((left, top))
+            if bucket is None:
+                cells[(left, top)] = [item]
+            else:
+                bucket.append(item)
+            return
+        
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [item]
+                else:
+                    bucket.append(item)
+    
+    def rebuild(self, items: Iterable[Any]):
+        """
+        Refaz o hash com as entidades ativas.
+        
+        Args:
+            items: Entidades com ``x``, ``y``, ``width``, ``height`` e ``active``
+        """
+        self.clear()
+        insert = self.insert
+        for item in items:
+            if item.active:
+                insert(item, item.x, item.y, item.width, item.height)
+    
+    def query_aabb(self, x: float, y: float, width: float = 0.0,
+                   height: float = 0.0) -> List[Any]:
+        """
+        Retorna as entidades das células cobertas por uma caixa.
+        
+        É só a fase larga: os candidatos podem não tocar a caixa, e o teste
+        exato fica com quem chama.
+        
+        Args:
+            x, y: Posição central da caixa
+            width, height: Dimensões da caixa
+        
+        Returns:
+            Lista de candidatos, sem repetição
+        """
+        left, top, right, bottom = self._range(x, y, width, height)
+        cells = self._cells
+        if left == right and top == bottom:
+            bucket = cells.get((left, top))
+            return list(bucket) if bucket else []
+        
+        found: List[Any] = []
+        seen = set()
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    key = id(item)
+                    if key not in seen:
+                        seen.add(key)
+                        found.append(item)
+        return found
+    
+    def query_radius(self, x: float, y: float, radius: float) -> List[Any]:
+        """
+        Retorna as entidades das células que um círculo pode tocar.
+        
+        Args:
+            x, y: Centro do círculo
+            radius: Raio do círculo
+        
+        Returns:
+            Lista de candidatos, sem repetição
+        """
+        return self.query_aabb(x, y, radius * 2, radius * 2)
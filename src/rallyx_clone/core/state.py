@@ -67,7 +67,9 @@ class StateMachine:
         self._next_state = None
         
         if self._current_state in self._states:
-            self._states[self._current_state].on_enter(**self._transition_data)
+            scene = self._states[self._current_state]
+            scene.dirty.invalidate()  # Cena nova: a tela toda muda
+            scene.on_enter(**self._transition_data)
         
         self._transition_data = {}
     
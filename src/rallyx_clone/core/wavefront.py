@@ -0,0 +1,161 @@
+"""
+Mapa de distâncias (BFS de uma origem para todo o grid) vetorizado.
+
+Com NumPy, cada nível da BFS é expandido de uma vez: a frente de onda é
+deslocada nas quatro direções e filtrada pela máscara de tiles livres
+ainda não visitados. Sem NumPy (ou em mapas pequenos, onde o custo fixo
+por nível não compensa) é usada uma BFS com deque.
+"""
+from collections import deque
+from typing import List, Optional, Tuple
+from .collision import add_grid_listener
+from .constants import TILE_WALL, TILE_BORDER, WAVEFRONT_MIN_TILES
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+UNREACHABLE = -1
+
+# Máscara de tiles livres do último grid (níveis são estáticos)
+_last_grid: Optional[List[List[int]]] = None
+_last_free = None
+
+
+def distance_map(grid: List[List[int]], source: Tuple[int, int]):
+    """
+    Calcula a distância em tiles de todos os tiles até a origem.
+    
+    Args:
+        grid: Grid do mapa
+        source: Tile de origem (tx, ty)
+    
+    Returns:
+        Array int32 (altura, largura) com NumPy, ou lista de linhas sem
+        NumPy; tiles inalcançáveis valem UNREACHABLE
+    """
+    height = len(grid)
+    width = len(grid[0]) if height > 0 else 0
+    if not HAS_NUMPY:
+        return distance_map_deque(grid, source)
+    if width * height < WAVEFRONT_MIN_TILES:
+        return np.array(distance_map_deque(grid, source), dtype=np.int32)
+    return distance_map_numpy(grid, source)
+
+
+def free_mask(grid: List[List[int]]):
+    """
+    Retorna a cópia NumPy do grid como máscara de tiles livres.
+    
+    A máscara é reaproveitada enquanto o grid for o mesmo objeto.
+    """
+    global _last_grid, _last_free
+    if grid is not _last_grid:
+        tiles = np.array(grid, dtype=np.int8)
+        _last_free = (tiles != TILE_WALL) & (tiles != TILE_BORDER)
+        _last_grid = grid
+    return _last_free
+
+
+def _forget_grid(grid: List[List[int]], tiles=None):
+    """Descarta a máscara guardada se ela é a do grid alterado."""
+    global _last_grid, _last_free
+    if grid is _last_grid:
+        _last_grid = None
+        _last_free = None
+
+
+add_grid_listener(_forget_grid)
+
+
+def distance_map_numpy(grid: List[List[int]], source: Tuple[int, int]):
+    """
+    Kernel vetorizado: um nível da BFS por iteração.
+    
+    A frente de onda do nível d está no máximo a d tiles (Manhattan) da
+    origem, então cada iteração só opera na janela de raio d em volta
+    dela, e o custo dos primeiros níveis não depende do tamanho do mapa.
+    
+    Returns:
+        Array int32 (altura, largura) de distâncias
+    """
+    free = free_mask(grid)
+    height, width = free.shape
+    distances = np.full((height, width), UNREACHABLE, dtype=np.int32)
+    
+    sx, sy = source
+    if not (0 <= sx < width and 0 <= sy < height):
+        return distances
+    distances[sy, sx] = 0
+    
+    unvisited = free.copy()
+    unvisited[sy, sx] = False
+    frontier = np.zeros((height, width), dtype=bool)
+    frontier[sy, sx] = True
+    grown = np.zeros((height, width), dtype=bool)
+    distance = 1
+    
+    while True:
+        # As janelas crescem a cada nível, então fora delas os dois buffers
+        # continuam zerados
+        y0 = max(sy - distance, 0)
+        y1 = min(sy + distance + 1, height)
+        x0 = max(sx - distance, 0)
+        x1 = min(sx + distance + 1, width)
+        current = frontier[y0:y1, x0:x1]
+        step = grown[y0:y1, x0:x1]
+        
+        step[1:, :] = current[:-1, :]
+        step[0, :] = False
+        step[:-1, :] |= current[1:, :]
+        step[:, 1:] |= current[:, :-1]
+        step[:, :-1] |= current[:, 1:]
+        
+        window = unvisited[y0:y1, x0:x1]
+        step &= window
+        if not step.any():
+            break
+        
+        np.copyto(distances[y0:y1, x0:x1], distance, where=step)
+        window ^= step
+        frontier, grown = grown, frontier
+        distance += 1
+    
+    return distances
+
+
+def distance_map_deque(grid: List[List[int]],
+                       source: Tuple[int, int]) -> List[List[int]]:
+    """
+    Versão em Python puro com deque.
+    
+    Returns:
+        Lista de linhas de distâncias
+    """
+    height = len(grid)
+    width = len(grid[0]) if height > 0 else 0
+    distances = [[UNREACHABLE] * width for _ in range(height)]
+    
+    sx, sy = source
+    if not (0 <= sx < width and 0 <= sy < height):
+        return distances
+    distances[sy][sx] = 0
+    
+    blocked = (TILE_WALL, TILE_BORDER)
+    queue = deque([(sx, sy)])
+    while queue:
+        cx, cy = queue.popleft()
+        distance = distances[cy][cx] + 1
+        for nx, ny in ((cx, cy - 1), (cx, cy + 1), (cx - 1, cy), (cx + 1, cy)):
+            if nx < 0 or ny < 0 or nx >= width or ny >= height:
+                continue
+            if distances[ny][nx] != UNREACHABLE or grid[ny][nx] in blocked:
+                continue
+            distances[ny][nx] = distance
+            queue.append((nx, ny))
+    
+    return distances
@@ -4,15 +4,19 @@ Enemy - Carros inimigos com IA.
 import pygame
 import math
 import random
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 from .entities_base import Entity
 from ..core.constants import (
     ENEMY_SPEED, ENEMY_CONFUSED_DURATION, ENEMY_PATH_RECALC_INTERVAL,
-    TILE_SIZE, SMOKE_SLOW_FACTOR
+    ENEMY_PATH_MAX_DISTANCE, TILE_SIZE, SMOKE_SLOW_FACTOR
 )
 from ..core.assets import AssetManager
-from ..core.pathfinding import bfs_pathfind, get_direction_to_tile
-from ..core.collision import check_tile_collision
+from ..core.config import Config
+from ..core.pathfinding import (
+    create_engine, get_direction_to_tile, FlowField, path_to_waypoints
+)
+from ..core.path_scheduler import PathScheduler, PathRequest
+from ..core.path_service import AsyncPathService
 
 
 class Enemy(Entity):
@@ -23,7 +27,23 @@ class Enemy(Entity):
     STATE_CONFUSED = "confused"
     STATE_RESPAWN = "respawn"
     
-    def __init__(self, x: float, y: float, speed: float = ENEMY_SPEED):
+    __slots__ = ("base_speed", "speed", "vx", "vy", "state", "path",
+                 "path_index", "target_tile", "pathfinder", "_path_request",
+                 "_flow_field", "path_recalc_timer", "confused_timer",
+                 "_spawn_x", "_spawn_y")
+    
+    collider_scale = 0.7
+    
+    def __init__(self, x: float, y: float, speed: float = ENEMY_SPEED,
+                 engine: Optional[str] = None):
+        """
+        Cria um inimigo.
+        
+        Args:
+            x, y: Posição central
+            speed: Velocidade base
+            engine: Nome da engine de busca (padrão: a do Config)
+        """
         super().__init__(x, y, 28, 28)
         
         # Movimento
@@ -34,9 +54,12 @@ class Enemy(Entity):
         
         # IA
         self.state = self.STATE_CHASE
-        self.path: List[Tuple[int, int]] = []
+        self.path: List[Tuple[int, int]] = []  # Início, curvas e destino
         self.path_index = 0
         self.target_tile: Optional[Tuple[int, int]] = None
+        self.pathfinder = create_engine(engine or Config().pathfinding_engine)
+        self._path_request: Optional[PathRequest] = None
+        self._flow_field: Optional[FlowField] = None  # Campo sendo seguido
         
         # Timers
         self.path_recalc_timer = 0.0
@@ -60,7 +83,9 @@ class Enemy(Entity):
         return int(self.x // TILE_SIZE), int(self.y // TILE_SIZE)
     
     def update(self, dt: float, player_pos: Tuple[float, float],
-               grid: List[List[int]]):
+               grid: List[List[int]], flow_field: Optional[FlowField] = None,
+               path_service: Optional[Union[PathScheduler,
+                                            AsyncPathService]] = None):
         """
         Atualiza o inimigo.
         
@@ -68,6 +93,9 @@ class Enemy(Entity):
             dt: Delta time
             player_pos: Posição do jogador
             grid: Grid do mapa
+            flow_field: Campo de distâncias compartilhado até o jogador
+            path_service: Escalonador ou serviço assíncrono que recebe os
+                pedidos de busca
         """
         if not self.active:
             return
@@ -85,14 +113,26 @@ class Enemy(Entity):
         # Atualiza timer de recálculo de caminho
         self.path_recalc_timer -= dt
         
-        # Recalcula caminho se necessário
-        if self.path_recalc_timer <= 0 or not self.path:
-            self._calculate_path(player_pos, grid)
-            self.path_recalc_timer = ENEMY_PATH_RECALC_INTERVAL
+        # Busca pedida em frames anteriores ficou pronta
+        if self._path_request is not None and self._path_request.done():
+            self._adopt_path(self._path_request.result())
+            self._path_request = None
+        
+        # Recalcula caminho se necessário (sem pedir de novo enquanto espera)
+        if ((self.path_recalc_timer <= 0 or not self.path) and
+                self._path_request is None):
+            self._calculate_path(player_pos, grid, flow_field, path_service)
             
-            # Adiciona variação quando confuso
-            if self.state == self.STATE_CONFUSED:
-                self.path_recalc_timer += random.uniform(0.5, 1.0)
+            # Só reinicia o timer vencido (sem caminho, o recálculo não
+            # adia o próximo); somar ao que restava mantém a defasagem
+            # entre inimigos
+            if self.path_recalc_timer <= 0:
+                self.path_recalc_timer = max(
+                    self.path_recalc_timer + ENEMY_PATH_RECALC_INTERVAL, 0.0)
+                
+                # Adiciona variação quando confuso
+                if self.state == self.STATE_CONFUSED:
+                    self.path_recalc_timer += random.uniform(0.5, 1.0)
         
         # Move em direção ao próximo tile do caminho
         self._follow_path(dt, grid)
@@ -102,8 +142,11 @@ class Enemy(Entity):
             self.angle = math.degrees(math.atan2(self.vy, self.vx)) + 90
     
     def _calculate_path(self, player_pos: Tuple[float, float],
-                        grid: List[List[int]]):
-        """Calcula caminho até o jogador."""
+                        grid: List[List[int]],
+                        flow_field: Optional[FlowField] = None,
+                        path_service: Optional[Union[PathScheduler,
+                                            AsyncPathService]] = None):
+        """Calcula caminho até o jogador (ou pede a busca ao serviço)."""
         start = self.tile_pos
         goal = (int(player_pos[0] // TILE_SIZE), int(player_pos[1] // TILE_SIZE))
         
@@ -114,8 +157,49 @@ class Enemy(Entity):
             offset_y = random.randint(-3, 3)
             goal = (goal[0] + offset_x, goal[1] + offset_y)
         
-        self.path = bfs_pathfind(start, goal, grid)
+        # Perseguindo o jogador: desce o campo compartilhado sem buscar,
+        # um passo de cada vez (o seguinte é lido ao chegar no tile)
+        if flow_field is not None and goal == flow_field.target:
+            step = flow_field.next_tile(start)
+            self.path = [start, step] if step is not None else []
+            self.path_index = 0
+            self._flow_field = flow_field
+        elif path_service is not None:
+            # Mais perto do jogador é atendido primeiro; segue o caminho antigo
+            priority = abs(player_pos[0] - self.x) + abs(player_pos[1] - self.y)
+            self._path_request = path_service.submit(
+                start, goal, grid, self.pathfinder, priority,
+                self._search_limit(grid))
+        else:
+            self.path = self.pathfinder.find_waypoints(
+                start, goal, grid, self._search_limit(grid))
+            self.path_index = 0
+            self._flow_field = None
+    
+    def _search_limit(self, grid: List[List[int]]) -> int:
+        """Distância máxima de busca: o mapa todo para engines de longo alcance."""
+        if self.pathfinder.long_range:
+            return len(grid) * (len(grid[0]) if grid else 0)
+        return ENEMY_PATH_MAX_DISTANCE
+    
+    def _adopt_path(self, path: List[Tuple[int, int]]):
+        """Troca para um caminho (em tiles) calculado em frames anteriores."""
+        # O inimigo andou enquanto esperava: retoma do tile atual
+        current = self.tile_pos
+        for i, tile in enumerate(path[:4]):
+            if tile == current:
+                path = path[i:]
+                break
+        
+        self.path = path_to_waypoints(path)
         self.path_index = 0
+        self._flow_field = None
+    
+    def _cancel_path_request(self):
+        """Desiste da busca pendente, se houver."""
+        if self._path_request is not None:
+            self._path_request.cancel()
+            self._path_request = None
     
     def _follow_path(self, dt: float, grid: List[List[int]]):
         """Segue o caminho calculado."""
@@ -138,9 +222,16 @@ class Enemy(Entity):
         if dist < 4:
             self.path_index += 1
             if self.path_index >= len(self.path):
-                self.vx = 0
-                self.vy = 0
-                return
+                # Seguindo o campo: o próximo passo é uma consulta O(1)
+                step = None
+                if self._flow_field is not None:
+                    step = self._flow_field.next_tile(self.path[-1])
+                if step is None:
+                    self.vx = 0
+                    self.vy = 0
+                    return
+                self.path = [self.path[-1], step]
+                self.path_index = 1
             # Próximo tile
             target_tx, target_ty = self.path[self.path_index]
             target_x = target_tx * TILE_SIZE + TILE_SIZE / 2
@@ -155,20 +246,20 @@ class Enemy(Entity):
             self.vy = (dy / dist) * self.speed
         
         # Aplica movimento com colisão
-        new_x = self.x + self.vx
-        new_y = self.y + self.vy
-        
-        if not check_tile_collision(new_x, self.y, self.width * 0.7, self.height * 0.7, grid):
-            self.x = new_x
-        
-        if not check_tile_collision(self.x, new_y, self.width * 0.7, self.height * 0.7, grid):
-            self.y = new_y
+        self.move(self.vx, self.vy, grid)
     
     def confuse(self, duration: float = ENEMY_CONFUSED_DURATION):
         """Coloca o inimigo em estado confuso."""
+        # Ainda na fumaça: só renova o tempo, sem descartar a busca pedida
+        if self.state == self.STATE_CONFUSED:
+            self.confused_timer = duration
+            return
+        
         self.state = self.STATE_CONFUSED
         self.confused_timer = duration
         self.path = []  # Força recálculo
+        self._cancel_path_request()
+        self.pathfinder.reset()
     
     def respawn(self, x: Optional[float] = None, y: Optional[float] = None):
         """Respawna o inimigo."""
@@ -180,4 +271,6 @@ class Enemy(Entity):
         self.speed = self.base_speed
         self.confused_timer = 0
         self.path = []
+        self._cancel_path_request()
+        self.pathfinder.reset()
         self.active = True
@@ -2,11 +2,29 @@
 Classe base Entity para entidades do jogo.
 """
 import pygame
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
+from ..core.collision import InflatedMap, inflated_map, move_and_slide
+from ..core.constants import COLLISION_SWEEP_MARGIN, RENDER_LAYER_CARS
+from ..core.assets import AssetManager
+from ..core.render_queue import RenderQueue
 
 
 class Entity:
-    """Classe base para todas as entidades do jogo."""
+    """
+    Classe base para todas as entidades do jogo.
+    
+    A hierarquia usa ``__slots__`` (sem ``__dict__`` por instância); cada
+    subclasse declara os atributos que cria.
+    """
+    
+    __slots__ = ("x", "y", "width", "height", "active", "_sprite", "_angle",
+                 "_rect")
+    
+    # Fração do tamanho usada na colisão com tiles
+    collider_scale = 1.0
+    
+    # Camada na fila de renderização
+    render_layer = RENDER_LAYER_CARS
     
     def __init__(self, x: float, y: float, width: int = 32, height: int = 32):
         """
@@ -24,6 +42,9 @@ class Entity:
         
         self._sprite: Optional[pygame.Surface] = None
         self._angle = 0.0  # Rotação em graus
+        
+        # Retângulo de colisão reaproveitado (atualizado ao ser lido)
+        self._rect = pygame.Rect(0, 0, 0, 0)
     
     @property
     def position(self) -> Tuple[float, float]:
@@ -36,13 +57,16 @@ class Entity:
     
     @property
     def rect(self) -> pygame.Rect:
-        """Retorna retângulo de colisão."""
-        return pygame.Rect(
-            self.x - self.width / 2,
-            self.y - self.height / 2,
-            self.width,
-            self.height
-        )
+        """
+        Retorna retângulo de colisão.
+        
+        É sempre o mesmo objeto, atualizado no lugar (sem alocar); quem
+        precisar guardá-lo deve copiá-lo.
+        """
+        rect = self._rect
+        rect.update(self.x - self.width / 2, self.y - self.height / 2,
+                    self.width, self.height)
+        return rect
     
     @property
     def sprite(self) -> Optional[pygame.Surface]:
@@ -77,31 +101,87 @@ class Entity:
         """
         pass
     
-    def draw(self, screen: pygame.Surface, camera_offset: Tuple[float, float] = (0, 0)):
+    def _screen_sprite(self, camera_offset: Tuple[float, float]
+                       ) -> Tuple[pygame.Surface, Tuple[float, float]]:
+        """Sprite (girado, se preciso) e canto superior esquerdo na tela."""
+        # Rotaciona sprite se necessário (quadros pré-girados do cache)
+        if self._angle != 0:
+            rotated, (dx, dy) = AssetManager().get_rotated(self._sprite, self._angle)
+            return rotated, (round(self.x - camera_offset[0]) + dx,
+                             round(self.y - camera_offset[1]) + dy)
+        
+        # Calcula posição na tela
+        screen_x = self.x - camera_offset[0] - self.width / 2
+        screen_y = self.y - camera_offset[1] - self.height / 2
+        return self._sprite, (screen_x, screen_y)
+    
+    def draw(self, screen: pygame.Surface,
+             camera_offset: Tuple[float, float] = (0, 0)) -> Optional[pygame.Rect]:
         """
         Desenha a entidade.
         
         Args:
             screen: Surface para desenhar
             camera_offset: Offset da câmera
+        
+        Returns:
+            Área da tela afetada, ou None se nada foi desenhado
+        """
+        if not self.active or not self._sprite:
+            return None
+        return screen.blit(*self._screen_sprite(camera_offset))
+    
+    def enqueue(self, queue: RenderQueue):
+        """
+        Empilha o sprite na fila de renderização do frame.
+        
+        Args:
+            queue: Fila do frame (dá a câmera e descarta o que está fora)
         """
         if not self.active or not self._sprite:
             return
         
-        # Calcula posição na tela
-        screen_x = self.x - camera_offset[0] - self.width / 2
-        screen_y = self.y - camera_offset[1] - self.height / 2
+        # Recorte antes de girar: (w + h) / 2 cobre o sprite em qualquer ângulo
+        camera_offset = queue.camera_offset
+        width, height = self._sprite.get_size()
+        reach = (width + height) // 2 + 1
+        if queue.cull(self.x - camera_offset[0] - reach, self.y - camera_offset[1] - reach,
+                      2 * reach, 2 * reach):
+            return
+        surface, pos = self._screen_sprite(camera_offset)
+        queue.push(surface, pos, self.render_layer)
+    
+    def collision_map(self, grid: List[List[int]]) -> InflatedMap:
+        """
+        Retorna o mapa de folga usado no caminho rápido do movimento.
         
-        # Rotaciona sprite se necessário
-        if self._angle != 0:
-            rotated = pygame.transform.rotate(self._sprite, -self._angle)
-            rect = rotated.get_rect(center=(
-                self.x - camera_offset[0],
-                self.y - camera_offset[1]
-            ))
-            screen.blit(rotated, rect)
-        else:
-            screen.blit(self._sprite, (screen_x, screen_y))
+        É o mapa inflado da caixa de colisão engordada por
+        COLLISION_SWEEP_MARGIN em cada lado.
+        
+        Args:
+            grid: Grid do mapa
+        """
+        margin = 2 * COLLISION_SWEEP_MARGIN
+        return inflated_map(grid, self.width * self.collider_scale + margin,
+                            self.height * self.collider_scale + margin)
+    
+    def move(self, dx: float, dy: float,
+             grid: List[List[int]]) -> Tuple[bool, bool]:
+        """
+        Move a entidade com colisão contínua contra os tiles.
+        
+        Args:
+            dx, dy: Deslocamento do passo
+            grid: Grid do mapa
+        
+        Returns:
+            Tupla (bateu em x, bateu em y)
+        """
+        self.x, self.y, hit_x, hit_y = move_and_slide(
+            self.x, self.y, self.width * self.collider_scale,
+            self.height * self.collider_scale, dx, dy, grid,
+            self.collision_map(grid))
+        return hit_x, hit_y
     
     def collides_with(self, other: "Entity") -> bool:
         """Verifica colisão com outra entidade."""
@@ -0,0 +1,474 @@
+"""
+Armazenamento de entidades em colunas (estrutura de arrays) para enxames.
+
+Posição, velocidade, estado e timers de cada tipo de entidade ficam em
+arrays NumPy contíguos, e as atualizações em massa (perseguição pelo
+campo de distâncias, flutuação das bandeiras, envelhecimento da fumaça)
+rodam como kernels sobre todas as entidades de uma vez. As classes
+``EnemyView``, ``FlagView`` e ``SmokeView`` continuam sendo ``Enemy``,
+``Flag`` e ``Smoke``, mas leem e escrevem nas colunas, então cenas, HUD e
+colisão não mudam.
+"""
+from typing import Any, Dict, List, Optional
+from .enemy import Enemy
+from .flag import Flag
+from .smoke import Smoke
+from ..core.constants import (
+    TILE_SIZE, ENEMY_SPEED, SMOKE_DURATION, SMOKE_SLOW_FACTOR,
+    COLLISION_SWEEP_MARGIN, ENTITY_STORE_CAPACITY
+)
+from ..core.collision import as_blocked_mask, move_and_slide
+from ..core.pathfinding import DIRECTIONS, FlowField
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+class ColumnStore:
+    """Colunas de um tipo de entidade, com slots reaproveitáveis."""
+    
+    # Nome da coluna -> dtype NumPy (toda subclasse tem ``active``, ``x`` e ``y``)
+    columns: Dict[str, str] = {"active": "bool", "x": "float64", "y": "float64"}
+    
+    # Dimensões das entidades (todas do mesmo tipo têm o mesmo tamanho)
+    size = (0.0, 0.0)
+    
+    def __init__(self, capacity: int = ENTITY_STORE_CAPACITY):
+        """
+        Cria as colunas vazias.
+        
+        Args:
+            capacity: Slots iniciais (as colunas dobram quando enchem)
+        """
+        self.capacity = capacity
+        self.count = 0  # Slots já usados (os kernels operam em [:count])
+        self._free: List[int] = []
+        self.views: List[Any] = []  # View de cada slot
+        for name, dtype in self.columns.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+    
+    def allocate(self, view: Any) -> int:
+        """
+        Reserva um slot zerado para uma view.
+        
+        Returns:
+            Índice do slot
+        """
+        if self._free:
+            index = self._free.pop()
+            self.views[index] = view
+        else:
+            if self.count == self.capacity:
+                self._grow()
+            index = self.count
+            self.count += 1
+            self.views.append(view)
+        
+        for name in self.columns:
+            getattr(self, name)[index] = 0
+        return index
+    
+    def query(self, x: float, y: float, width: float, height: float) -> List[Any]:
+        """
+        Views ativas cuja caixa toca uma caixa centrada em (x, y).
+        
+        Substitui o hash espacial no modo em colunas: um teste vetorizado
+        sobre todas as entidades custa menos que refazer o hash a cada frame.
+        """
+        n = self.count
+        own_w, own_h = self.size
+        hit = (self.active[:n] &
+               (np.abs(self.x[:n] - x) * 2 <= width + own_w) &
+               (np.abs(self.y[:n] - y) * 2 <= height + own_h))
+        views = self.views
+        return [views[i] for i in np.flatnonzero(hit).tolist()]
+    
+    def release(self, index: int):
+        """Devolve um slot (a entidade fica inativa)."""
+        self.active[index] = False
+        self._free.append(index)
+    
+    def _grow(self):
+        """Dobra a capacidade de todas as colunas."""
+        self.capacity *= 2
+        for name in self.columns:
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+
+class EnemyColumns(ColumnStore):
+    """Colunas dos inimigos."""
+    
+    columns = {
+        "active": "bool",
+        "x": "float64", "y": "float64",
+        "vx": "float64", "vy": "float64",
+        "speed": "float64", "base_speed": "float64",
+        "angle": "float64",
+        "state": "int8",
+        "confused_timer": "float64",
+        # Tile cujo centro o inimigo está buscando
+        "target_x": "int32", "target_y": "int32",
+    }
+    
+    # Caixa de colisão dos inimigos (todos têm o mesmo tamanho)
+    collider = (0.0, 0.0)
+    
+    STATE_CODES = {Enemy.STATE_CHASE: 0, Enemy.STATE_CONFUSED: 1,
+                   Enemy.STATE_RESPAWN: 2}
+    STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+    
+    def retarget(self, index: int):
+        """Faz o inimigo escolher o próximo tile a partir do tile atual."""
+        self.target_x[index] = int(self.x[index] // TILE_SIZE)
+        self.target_y[index] = int(self.y[index] // TILE_SIZE)
+
+
+class FlagColumns(ColumnStore):
+    """Colunas das bandeiras."""
+    
+    columns = {
+        "active": "bool",
+        "x": "float64", "y": "float64",
+        "base_y": "float64",
+        "animation_time": "float64",
+        "collected": "bool",
+    }
+
+
+class SmokeColumns(ColumnStore):
+    """Colunas das fumaças."""
+    
+    columns = {
+        "active": "bool",
+        "x": "float64", "y": "float64",
+        "elapsed": "float64",
+        "duration": "float64",
+    }
+
+
+def _column(name: str, cast=float) -> property:
+    """Atributo de uma view guardado na coluna ``name`` do seu store."""
+    
+    def getter(self):
+        return cast(getattr(self._columns, name)[self._index])
+    
+    def setter(self, value):
+        getattr(self._columns, name)[self._index] = value
+    
+    return property(getter, setter)
+
+
+def _state_column() -> property:
+    """Estado do inimigo guardado como código na coluna ``state``."""
+    
+    def getter(self):
+        return EnemyColumns.STATE_NAMES[int(self._columns.state[self._index])]
+    
+    def setter(self, value):
+        self._columns.state[self._index] = EnemyColumns.STATE_CODES[value]
+    
+    return property(getter, setter)
+
+
+class EnemyView(Enemy):
+    """Inimigo cujos dados vivem nas colunas de um EnemyColumns."""
+    
+    __slots__ = ("_columns", "_index")
+    
+    x = _column("x")
+    y = _column("y")
+    vx = _column("vx")
+    vy = _column("vy")
+    speed = _column("speed")
+    base_speed = _column("base_speed")
+    _angle = _column("angle")
+    state = _state_column()
+    confused_timer = _column("confused_timer")
+    active = _column("active", bool)
+    
+    def __init__(self, columns: EnemyColumns, x: float, y: float,
+                 speed: float = ENEMY_SPEED, engine: Optional[str] = None):
+        self._columns = columns
+        self._index = columns.allocate(self)
+        super().__init__(x, y, speed, engine)
+        columns.retarget(self._index)
+        columns.size = (self.width, self.height)
+        columns.collider = (self.width * self.collider_scale,
+                            self.height * self.collider_scale)
+    
+    def respawn(self, x: Optional[float] = None, y: Optional[float] = None):
+        super().respawn(x, y)
+        self._columns.retarget(self._index)
+
+
+class FlagView(Flag):
+    """Bandeira cujos dados vivem nas colunas de um FlagColumns."""
+    
+    __slots__ = ("_columns", "_index")
+    
+    x = _column("x")
+    y = _column("y")
+    _base_y = _column("base_y")
+    _animation_time = _column("animation_time")
+    collected = _column("collected", bool)
+    active = _column("active", bool)
+    
+    def __init__(self, columns: FlagColumns, x: float, y: float):
+        self._columns = columns
+        self._index = columns.allocate(self)
+        super().__init__(x, y)
+        columns.size = (self.width, self.height)
+
+
+class SmokeView(Smoke):
+    """Fumaça cujos dados vivem nas colunas de um SmokeColumns."""
+    
+    __slots__ = ("_columns", "_index")
+    
+    x = _column("x")
+    y = _column("y")
+    elapsed = _column("elapsed")
+    duration = _column("duration")
+    active = _column("active", bool)
+    
+    def __init__(self, columns: SmokeColumns, x: float, y: float,
+                 duration: float = SMOKE_DURATION):
+        self._columns = columns
+        self._index = columns.allocate(self)
+        super().__init__(x, y, duration)
+        columns.size = (self.width, self.height)
+    
+    def reset(self, x: float, y: float, duration: float = SMOKE_DURATION):
+        """Reaproveita a view liberada: pega um slot novo e reinicia."""
+        self._index = self._columns.allocate(self)
+        super().reset(x, y, duration)
+    
+    def release(self):
+        """Devolve o slot da fumaça ao store."""
+        self._columns.release(self._index)
+    
+    def bind(self, store) -> bool:
+        """Liga a view liberada às colunas de outro store (o slot vem no reset)."""
+        if store is None:
+            return False
+        self._columns = store.smokes
+        return True
+
+
+class EntityStore:
+    """Inimigos, bandeiras e fumaças de um nível em colunas, com kernels em lote."""
+    
+    def __init__(self, capacity: int = ENTITY_STORE_CAPACITY):
+        """
+        Cria as colunas de cada tipo de entidade.
+        
+        Args:
+            capacity: Slots iniciais de cada tipo
+        """
+        self.enemies = EnemyColumns(capacity)
+        self.flags = FlagColumns(capacity)
+        self.smokes = SmokeColumns(capacity)
+        
+        # Campo de distâncias com moldura, refeito quando o campo muda
+        self._field_source: Optional[List[int]] = None
+        self._field = None
+    
+    def add_enemy(self, x: float, y: float, speed: float = ENEMY_SPEED,
+                  engine: Optional[str] = None) -> EnemyView:
+        """Cria um inimigo nas colunas."""
+        return EnemyView(self.enemies, x, y, speed, engine)
+    
+    def add_flag(self, x: float, y: float) -> FlagView:
+        """Cria uma bandeira nas colunas."""
+        return FlagView(self.flags, x, y)
+    
+    def add_flag_at_tile(self, tx: int, ty: int) -> FlagView:
+        """Cria uma bandeira no centro de um tile."""
+        return self.add_flag(tx * TILE_SIZE + TILE_SIZE / 2,
+                             ty * TILE_SIZE + TILE_SIZE / 2)
+    
+    def add_smoke(self, x: float, y: float,
+                  duration: float = SMOKE_DURATION) -> SmokeView:
+        """Cria uma fumaça nas colunas."""
+        return SmokeView(self.smokes, x, y, duration)
+    
+    def enemies_in_smoke(self, smoke_manager) -> List[EnemyView]:
+        """
+        Inimigos ativos dentro de alguma fumaça ativa (consulta em lote).
+        
+        Args:
+            smoke_manager: SmokeManager com a grade de ocupação das nuvens
+        """
+        e = self.enemies
+        n = e.count
+        if not n:
+            return []
+        inside = smoke_manager.check_entities(e.x[:n], e.y[:n])
+        inside &= e.active[:n]
+        views = e.views
+        return [views[i] for i in np.flatnonzero(inside).tolist()]
+    
+    def _padded_field(self, flow_field: FlowField):
+        """Distâncias do campo em (altura + 2, largura + 2), com moldura."""
+        if flow_field.distances is not self._field_source:
+            width = flow_field.width
+            height = flow_field.height
+            unreachable = width * height + 1
+            field = np.full((height + 2, width + 2), unreachable, dtype=np.int32)
+            if width and height:
+                distances = np.asarray(flow_field.distances, dtype=np.int32)
+                inner = distances.reshape(height, width)
+                field[1:-1, 1:-1] = np.where(inner == FlowField.UNREACHABLE,
+                                             unreachable, inner)
+            self._field = field
+            self._field_source = flow_field.distances
+        return self._field
+    
+    def update_enemies(self, dt: float, grid: List[List[int]],
+                       flow_field: FlowField):
+        """
+        Kernel de perseguição: todos os inimigos descem o campo de distâncias.
+        
+        Como no caminho por objetos, cada inimigo vai de centro em centro de
+        tile; ao chegar (a menos de 4 pixels), escolhe o vizinho de menor
+        distância até o jogador, com o mesmo desempate de
+        ``FlowField.next_tile``. Confusos andam mais devagar, mas seguem o
+        campo (não sorteiam destinos perto do jogador).
+        
+        Args:
+            dt: Delta time
+            grid: Grid do mapa
+            flow_field: Campo de distâncias até o jogador, já atualizado
+        """
+        e = self.enemies
+        n = e.count
+        if not n:
+            return
+        active = e.active[:n]
+        
+        # Timers de confusão e velocidade de cada estado
+        state = e.state[:n]
+        confused = active & (state == EnemyColumns.STATE_CODES[Enemy.STATE_CONFUSED])
+        timer = e.confused_timer[:n]
+        np.subtract(timer, dt, out=timer, where=confused)
+        recovered = confused & (timer <= 0)
+        state[recovered] = EnemyColumns.STATE_CODES[Enemy.STATE_CHASE]
+        confused &= ~recovered
+        speed = e.speed[:n]
+        np.copyto(speed, e.base_speed[:n])
+        speed[confused] *= SMOKE_SLOW_FACTOR
+        
+        # Distância até o centro do tile buscado
+        x = e.x[:n]
+        y = e.y[:n]
+        target_x = e.target_x[:n]
+        target_y = e.target_y[:n]
+        dx = target_x * TILE_SIZE + TILE_SIZE / 2 - x
+        dy = target_y * TILE_SIZE + TILE_SIZE / 2 - y
+        dist = np.hypot(dx, dy)
+        stopped = np.zeros(n, dtype=bool)
+        
+        arrived = np.flatnonzero(active & (dist < 4))
+        if len(arrived):
+            field = self._padded_field(flow_field)
+            rows = target_y[arrived] + 1
+            cols = target_x[arrived] + 1
+            current = field[rows, cols]
+            candidates = np.stack([field[rows + ddy, cols + ddx]
+                                   for ddx, ddy in DIRECTIONS])
+            best = np.argmin(candidates, axis=0)
+            closer = candidates[best, np.arange(len(arrived))] < current
+            
+            moving = arrived[closer]
+            steps = np.array(DIRECTIONS, dtype=np.int32)[best[closer]]
+            target_x[moving] += steps[:, 0]
+            target_y[moving] += steps[:, 1]
+            stopped[arrived[~closer]] = True
+            
+            dx[moving] = target_x[moving] * TILE_SIZE + TILE_SIZE / 2 - x[moving]
+            dy[moving] = target_y[moving] * TILE_SIZE + TILE_SIZE / 2 - y[moving]
+            dist[moving] = np.hypot(dx[moving], dy[moving])
+        
+        # Velocidade em direção ao tile buscado
+        vx = e.vx[:n]
+        vy = e.vy[:n]
+        steer = active & ~stopped & (dist > 0)
+        np.divide(dx * speed, dist, out=vx, where=steer)
+        np.divide(dy * speed, dist, out=vy, where=steer)
+        vx[stopped] = 0.0
+        vy[stopped] = 0.0
+        
+        moving = active & ((vx != 0) | (vy != 0))
+        self._move(moving, grid)
+        
+        angle = e.angle[:n]
+        angle[moving] = (np.degrees(np.arctan2(vy[moving], vx[moving])) + 90) % 360
+    
+    def _move(self, moving, grid: List[List[int]]):
+        """
+        Aplica as velocidades com colisão contínua.
+        
+        Passos pequenos cuja caixa engordada pela margem não toca nenhum
+        tile bloqueado andam direto, em lote; os demais (perto de paredes)
+        passam por move_and_slide um a um.
+        """
+        e = self.enemies
+        n = e.count
+        x = e.x[:n]
+        y = e.y[:n]
+        vx = e.vx[:n]
+        vy = e.vy[:n]
+        
+        width, height = e.collider
+        margin = COLLISION_SWEEP_MARGIN
+        half_w = width / 2 + margin
+        half_h = height / 2 + margin
+        
+        fast = moving & (np.abs(vx) <= margin) & (np.abs(vy) <= margin)
+        if 2 * half_w < TILE_SIZE and 2 * half_h < TILE_SIZE:
+            # Caixas menores que um tile ocupam no máximo 2x2 tiles
+            mask = as_blocked_mask(grid)
+            cells = np.frombuffer(mask.cells, dtype=np.uint8).reshape(
+                mask.height + 3, mask.stride)
+            left = np.clip((x - half_w) // TILE_SIZE, -1, mask.width).astype(np.intp) + 1
+            right = np.clip((x + half_w) // TILE_SIZE, -1, mask.width).astype(np.intp) + 1
+            top = np.clip((y - half_h) // TILE_SIZE, -1, mask.height).astype(np.intp) + 1
+            bottom = np.clip((y + half_h) // TILE_SIZE, -1, mask.height).astype(np.intp) + 1
+            blocked = (cells[top, left] | cells[top, right] |
+                       cells[bottom, left] | cells[bottom, right])
+            fast &= blocked == 0
+        else:
+            fast[:] = False
+        
+        x[fast] += vx[fast]
+        y[fast] += vy[fast]
+        
+        for i in np.flatnonzero(moving & ~fast).tolist():
+            x[i], y[i], _, _ = move_and_slide(
+                float(x[i]), float(y[i]), width, height,
+                float(vx[i]), float(vy[i]), grid)
+    
+    def update_flags(self, dt: float):
+        """Kernel de flutuação de todas as bandeiras não coletadas."""
+        f = self.flags
+        n = f.count
+        live = f.active[:n] & ~f.collected[:n]
+        time = f.animation_time[:n]
+        np.add(time, dt * 3, out=time, where=live)
+        f.y[:n][live] = f.base_y[:n][live] + np.sin(time[live]) * 3
+    
+    def update_smokes(self, dt: float):
+        """Kernel de envelhecimento de todas as fumaças ativas."""
+        s = self.smokes
+        n = s.count
+        live = s.active[:n]
+        elapsed = s.elapsed[:n]
+        np.add(elapsed, dt, out=elapsed, where=live)
+        live &= elapsed < s.duration[:n]
@@ -5,13 +5,17 @@ import pygame
 import math
 from typing import Tuple
 from .entities_base import Entity
-from ..core.constants import TILE_SIZE
+from ..core.constants import TILE_SIZE, RENDER_LAYER_FLAGS
 from ..core.assets import AssetManager
 
 
 class Flag(Entity):
     """Bandeira coletável no mapa."""
     
+    __slots__ = ("collected", "_animation_time", "_base_y")
+    
+    render_layer = RENDER_LAYER_FLAGS
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y, 24, 24)
         
@@ -10,12 +10,17 @@ from ..core.constants import (
     SMOKE_COOLDOWN, TILE_SIZE
 )
 from ..core.assets import AssetManager
-from ..core.collision import check_tile_collision
 
 
 class Player(Entity):
     """Carro controlado pelo jogador."""
     
+    __slots__ = ("vx", "vy", "speed", "max_speed", "acceleration", "friction",
+                 "facing", "_target_angle", "smoke_cooldown", "can_smoke",
+                 "is_dead", "_spawn_x", "_spawn_y")
+    
+    collider_scale = 0.8
+    
     def __init__(self, x: float, y: float):
         super().__init__(x, y, 28, 28)
         
@@ -135,24 +140,15 @@ class Player(Entity):
                 self.speed = 0
         
         # Movimento com colisão
-        new_x = self.x + self.vx
-        new_y = self.y + self.vy
-        
         if grid:
-            # Testa movimento X
-            if not check_tile_collision(new_x, self.y, self.width * 0.8, self.height * 0.8, grid):
-                self.x = new_x
-            else:
+            hit_x, hit_y = self.move(self.vx, self.vy, grid)
+            if hit_x:
                 self.vx = 0
-            
-            # Testa movimento Y
-            if not check_tile_collision(self.x, new_y, self.width * 0.8, self.height * 0.8, grid):
-                self.y = new_y
-            else:
+            if hit_y:
                 self.vy = 0
         else:
-            self.x = new_x
-            self.y = new_y
+            self.x += self.vx
+            self.y += self.vy
         
         # Atualiza ângulo suavemente
         if self.speed > 0.5:
@@ -1,17 +1,32 @@
 """
 Smoke - Sistema de fumaça defensiva.
+
+Cada nuvem é um emissor de partículas; a área da fumaça, para os
+inimigos, é o círculo de cada nuvem ativa, consultado pela grade de
+ocupação do campo de partículas (os tiles que cada círculo toca).
 """
 import pygame
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from .entities_base import Entity
-from ..core.constants import SMOKE_DURATION, SMOKE_RADIUS
+from ..core.constants import (
+    SMOKE_DURATION, SMOKE_RADIUS, SMOKE_POOL_SIZE, SMOKE_FADE_STEPS,
+    SMOKE_PARTICLE_SIZE, SMOKE_PARTICLE_CAPACITY, SMOKE_PARTICLE_RATE,
+    SMOKE_PARTICLE_BURST, SMOKE_PARTICLE_LIFE, SMOKE_PARTICLE_SPEED,
+    RENDER_LAYER_SMOKE
+)
 from ..core.assets import AssetManager
 from ..core.collision import check_circle_collision
+from ..core.particles import ParticleEmitter, ParticleField
+from ..core.render_queue import RenderQueue
 
 
 class Smoke(Entity):
     """Nuvem de fumaça individual."""
     
+    __slots__ = ("duration", "elapsed", "radius", "emitter")
+    
+    render_layer = RENDER_LAYER_SMOKE
+    
     def __init__(self, x: float, y: float, duration: float = SMOKE_DURATION):
         super().__init__(x, y, SMOKE_RADIUS * 2, SMOKE_RADIUS * 2)
         
@@ -19,14 +34,49 @@ class Smoke(Entity):
         self.elapsed = 0.0
         self.radius = SMOKE_RADIUS
         
-        # Carrega sprite
-        self._load_sprite()
+        # A nuvem é desenhada só pelas partículas
+        self._create_emitter()
     
-    def _load_sprite(self):
-        """Carrega sprite da fumaça."""
+    def _create_emitter(self):
+        """Cria o emissor de partículas da nuvem."""
         assets = AssetManager()
-        size = int(self.radius * 2)
-        self.sprite = assets.load_image("smoke.png", scale=(size, size))
+        particle = assets.load_image(
+            "smoke.png", scale=(SMOKE_PARTICLE_SIZE, SMOKE_PARTICLE_SIZE))
+        self.emitter = ParticleEmitter(
+            assets.get_fade_frames(particle, SMOKE_FADE_STEPS),
+            SMOKE_PARTICLE_CAPACITY, SMOKE_PARTICLE_RATE, SMOKE_PARTICLE_LIFE,
+            speed=SMOKE_PARTICLE_SPEED, radius=self.radius * 0.6, drag=1.0)
+        self.emitter.x = self.x
+        self.emitter.y = self.y
+    
+    def reset(self, x: float, y: float, duration: float = SMOKE_DURATION):
+        """
+        Reaproveita a instância para uma nova nuvem (usado pelo pool).
+        
+        Args:
+            x, y: Posição central
+            duration: Duração em segundos
+        """
+        self.x = x
+        self.y = y
+        self.duration = duration
+        self.elapsed = 0.0
+        self.active = True
+        self.emitter.clear()
+        self.emitter.x = x
+        self.emitter.y = y
+    
+    def bind(self, store) -> bool:
+        """
+        Prepara a instância livre do pool para o EntityStore de um nível.
+        
+        Args:
+            store: EntityStore do nível, ou None para objetos comuns
+        
+        Returns:
+            True se a instância serve para o novo nível
+        """
+        return store is None
     
     @property
     def progress(self) -> float:
@@ -49,19 +99,23 @@ class Smoke(Entity):
         if self.elapsed >= self.duration:
             self.active = False
     
-    def draw(self, screen: pygame.Surface, camera_offset: Tuple[float, float] = (0, 0)):
-        """Desenha a fumaça com fade."""
-        if not self.active or not self._sprite:
-            return
-        
-        # Copia sprite para aplicar alpha
-        temp = self._sprite.copy()
-        temp.set_alpha(self.alpha)
-        
-        screen_x = self.x - camera_offset[0] - self.width / 2
-        screen_y = self.y - camera_offset[1] - self.height / 2
+    def draw(self, screen: pygame.Surface,
+             camera_offset: Tuple[float, float] = (0, 0)) -> Optional[pygame.Rect]:
+        """
+        Desenha as partículas da nuvem (um único blits).
         
-        screen.blit(temp, (screen_x, screen_y))
+        Returns:
+            Área que as partículas podem cobrir, ou None se inativa
+        """
+        if not self.active:
+            return None
+        self.emitter.draw(screen, camera_offset)
+        return self.emitter.bounds(camera_offset)
+    
+    def enqueue(self, queue: RenderQueue):
+        """Empilha as partículas visíveis da nuvem na fila de renderização."""
+        if self.active:
+            self.emitter.enqueue(queue, self.render_layer)
     
     def contains_point(self, x: float, y: float) -> bool:
         """Verifica se um ponto está dentro da fumaça."""
@@ -71,14 +125,59 @@ class Smoke(Entity):
 
 
 class SmokeManager:
-    """Gerencia todas as instâncias de fumaça."""
+    """
+    Gerencia todas as instâncias de fumaça.
+    
+    As instâncias vêm de um pool de capacidade fixa: fumaças expiradas
+    voltam para a lista livre e são reaproveitadas por create_smoke();
+    com o pool cheio, a fumaça mais antiga é reciclada.
+    """
     
-    def __init__(self):
+    def __init__(self, capacity: int = SMOKE_POOL_SIZE):
+        """
+        Cria o gerenciador vazio.
+        
+        Args:
+            capacity: Máximo de fumaças simultâneas
+        """
         self.smokes: List[Smoke] = []
+        self.capacity = capacity
+        
+        # Pool: instâncias livres e total já criado
+        self._free: List[Smoke] = []
+        self._created = 0
+        
+        # Colunas das fumaças quando o nível usa o EntityStore
+        self._store = None
+        
+        # Partículas de todas as nuvens e sua grade de ocupação
+        self.particles = ParticleField()
+    
+    @property
+    def store(self):
+        """EntityStore das fumaças, ou None para objetos comuns."""
+        return self._store
+    
+    @store.setter
+    def store(self, store):
+        # As fumaças ativas voltam ao pool; as livres passam para o novo store
+        self.clear()
+        self._store = store
+        self._free = [smoke for smoke in self._free if smoke.bind(store)]
+        self._created = len(self._free)
+    
+    def _recycle(self, smoke: Smoke):
+        """Devolve uma fumaça ao pool."""
+        smoke.active = False
+        if self._store is not None:
+            smoke.release()
+        self.particles.remove(smoke.emitter)
+        smoke.emitter.clear()
+        self._free.append(smoke)
     
     def create_smoke(self, x: float, y: float) -> Smoke:
         """
-        Cria uma nova fumaça.
+        Cria uma nova fumaça (reaproveitando uma instância do pool).
         
         Args:
             x, y: Posição central
@@ -86,38 +185,110 @@ class SmokeManager:
         Returns:
             Instância da fumaça criada
         """
-        smoke = Smoke(x, y)
+        if not self._free and self._created >= self.capacity:
+            # Pool cheio: recicla a fumaça mais antiga
+            self._recycle(self.smokes.pop(0))
+        
+        if self._free:
+            smoke = self._free.pop()
+            smoke.reset(x, y)
+        else:
+            if self._store is not None:
+                smoke = self._store.add_smoke(x, y)
+            else:
+                smoke = Smoke(x, y)
+            self._created += 1
         self.smokes.append(smoke)
+        
+        # A nuvem já nasce cheia; a grade de ocupação ganha sua área
+        emitter = smoke.emitter
+        emitter.emitting = True
+        emitter.intensity = 1.0
+        emitter.emit(SMOKE_PARTICLE_BURST)
+        self.particles.add(emitter, reach=smoke.radius)
         return smoke
     
     def update(self, dt: float):
         """Atualiza todas as fumaças."""
-        for smoke in self.smokes:
-            smoke.update(dt)
+        if self._store is not None:
+            self._store.update_smokes(dt)
+        else:
+            for smoke in self.smokes:
+                smoke.update(dt)
+        
+        # Compacta a lista no lugar, devolvendo as inativas ao pool
+        smokes = self.smokes
+        live = 0
+        for smoke in smokes:
+            if smoke.active:
+                smokes[live] = smoke
+                live += 1
+            else:
+                self._recycle(smoke)
+        if live != len(smokes):
+            del smokes[live:]
         
-        # Remove fumaças inativas
-        self.smokes = [s for s in self.smokes if s.active]
+        # Nuvens no fade-out emitem menos; depois partículas em lote
+        for smoke in smokes:
+            smoke.emitter.intensity = smoke.alpha / 255
+        self.particles.update(dt)
+    
+    def draw(self, screen: pygame.Surface,
+             camera_offset: Tuple[float, float] = (0, 0)) -> List[pygame.Rect]:
+        """
+        Desenha todas as fumaças (um blits por nuvem).
+        
+        Returns:
+            Área de cada nuvem desenhada
+        """
+        rects = []
+        for smoke in self.smokes:
+            rect = smoke.draw(screen, camera_offset)
+            if rect is not None:
+                rects.append(rect)
+        return rects
     
-    def draw(self, screen: pygame.Surface, camera_offset: Tuple[float, float] = (0, 0)):
-        """Desenha todas as fumaças."""
+    def enqueue(self, queue: RenderQueue):
+        """
+        Empilha as partículas de todas as fumaças na fila de renderização.
+        
+        Args:
+            queue: Fila do frame
+        """
         for smoke in self.smokes:
-            smoke.draw(screen, camera_offset)
+            smoke.enqueue(queue)
     
     def check_entity(self, x: float, y: float) -> bool:
         """
         Verifica se uma entidade está em qualquer fumaça.
         
+        A grade de ocupação do campo de partículas, mantida ao criar e ao
+        expirar as nuvens, dá as nuvens que tocam o tile da entidade; só
+        elas fazem o teste exato do círculo (mesmo de ``contains_point``).
+        
         Args:
             x, y: Posição da entidade
         
         Returns:
             True se está em fumaça ativa
         """
-        for smoke in self.smokes:
-            if smoke.active and smoke.contains_point(x, y):
-                return True
-        return False
+        return self.particles.covers(x, y)
+    
+    def check_entities(self, xs, ys):
+        """
+        Versão em lote de check_entity.
+        
+        Args:
+            xs, ys: Posições das entidades (arrays NumPy ou sequências)
+        
+        Returns:
+            Array bool (com NumPy) ou lista de bools, um por entidade
+        """
+        return self.particles.covers_many(xs, ys)
     
     def clear(self):
-        """Remove todas as fumaças."""
+        """Remove todas as fumaças (as instâncias voltam ao pool)."""
+        for smoke in self.smokes:
+            self._recycle(smoke)
         self.smokes.clear()
+        self.particles.clear()
@@ -7,12 +7,23 @@ from .player import Player
 from .enemy import Enemy
 from .flag import Flag
 from .smoke import SmokeManager
+from .entity_store import EntityStore, HAS_NUMPY
 from ..core.constants import (
     TILE_SIZE, TILE_ROAD, TILE_WALL, TILE_GRASS, TILE_BORDER,
-    DIFFICULTY_SETTINGS
+    DIFFICULTY_SETTINGS, PATHFINDING_TABLE, PATHFINDING_HIERARCHICAL,
+    PATHFINDING_JUNCTION, PATHFINDING_BFS,
+    FLOW_FIELD_MAX_TILES, ENTITY_STORE_MIN_ENEMIES, ENEMY_PATH_RECALC_INTERVAL
 )
-from ..core.assets import AssetManager
 from ..core.config import Config
+from ..core.collision import BlockedMask, mark_grid_changed
+from ..core.pathfinding import FlowField, JunctionGraph
+from ..core.path_table import NextHopTable
+from ..core.hpa import ClusterGraph
+from ..core.path_scheduler import PathScheduler
+from ..core.path_service import AsyncPathService
+from ..core.spatial_hash import SpatialHash
+from ..core.map_renderer import ChunkedMapRenderer, ScrollingBackground
+from ..core.render_queue import RenderQueue
 
 
 class World:
@@ -20,6 +31,7 @@ class World:
     
     def __init__(self):
         self.grid: List[List[int]] = []
+        self.blocked_mask: Optional[BlockedMask] = None
         self.width = 0
         self.height = 0
         self.pixel_width = 0
@@ -31,6 +43,21 @@ class World:
         self.flags: List[Flag] = []
         self.smoke_manager = SmokeManager()
         
+        # Entidades em colunas, para níveis com enxames de inimigos
+        self.entity_store: Optional[EntityStore] = None
+        
+        # Fase larga da colisão entre entidades (refeita a cada frame)
+        self.enemy_hash = SpatialHash()
+        self.flag_hash = SpatialHash()
+        
+        # Campo de distâncias até o jogador (compartilhado pelos inimigos)
+        self.flow_field = FlowField()
+        self.use_flow_field = True
+        
+        # Buscas de caminho fatiadas com orçamento por frame
+        self.path_scheduler = PathScheduler()
+        self.path_service = self.path_scheduler
+        
         # Spawn points
         self.player_spawn: Tuple[int, int] = (1, 1)
         self.enemy_spawns: List[Tuple[int, int]] = []
@@ -38,9 +65,11 @@ class World:
         # Tempo limite
         self.time_limit = 120
         
-        # Cache de tiles
-        self._tile_cache: dict = {}
-        self._surface_cache: Optional[pygame.Surface] = None
+        # Mapa desenhado em pedaços montados sob demanda (cache LRU), por
+        # baixo de um fundo rolado que só redesenha as faixas novas
+        self.map_renderer = ChunkedMapRenderer()
+        self.background = ScrollingBackground(self.map_renderer)
+        self.render_queue = RenderQueue()  # Sprites do frame, um blits por camada
     
     def load_level(self, level_data: dict):
         """
@@ -49,26 +78,71 @@ class World:
         Args:
             level_data: Dados do nível
         """
-        # Carrega grid
-        self.grid = level_data.get("grid", [[0]])
+        # Carrega grid (cópia própria: set_tile não altera os dados em cache)
+        self.grid = [list(row) for row in level_data.get("grid", [[0]])]
         self.height = len(self.grid)
         self.width = len(self.grid[0]) if self.height > 0 else 0
         self.pixel_width = self.width * TILE_SIZE
         self.pixel_height = self.height * TILE_SIZE
+        self.blocked_mask = BlockedMask.for_grid(self.grid)
+        self.flow_field.set_grid(self.grid)
+        self.path_scheduler.clear()
         
         # Carrega spawns
         self.player_spawn = tuple(level_data.get("player_spawn", [1, 1]))
         self.enemy_spawns = [tuple(s) for s in level_data.get("enemy_spawns", [])]
         
-        # Carrega tempo limite
         config = Config()
+        
+        # Pré-calcula a tabela de próximos passos (cache em disco por grid)
+        if config.precompute_paths or config.pathfinding_engine == PATHFINDING_TABLE:
+            NextHopTable.for_grid(self.grid)
+        
+        # Grafo de clusters do HPA* (mapas grandes)
+        if config.pathfinding_engine == PATHFINDING_HIERARCHICAL:
+            ClusterGraph.for_grid(self.grid)
+        
+        # Grafo de cruzamentos (mapas de corredores)
+        if config.pathfinding_engine == PATHFINDING_JUNCTION:
+            JunctionGraph.for_grid(self.grid)
+        
+        # Com workers configurados, as buscas saem da thread principal
+        if config.path_workers > 0:
+            self.path_service = AsyncPathService()
+            self.path_service.reset()  # Buscas do nível anterior não servem mais
+            self.path_service.start(config.path_workers)
+        else:
+            self.path_service = self.path_scheduler
+        
+        # O campo é a BFS reversa compartilhada: substitui só a engine BFS
+        # (as demais engines configuradas fazem a perseguição); em mapas
+        # muito grandes o campo custa mais que as buscas
+        self.use_flow_field = (config.pathfinding_engine == PATHFINDING_BFS and
+                               self.width * self.height <= FLOW_FIELD_MAX_TILES)
+        
+        # Carrega tempo limite
         difficulty = config.difficulty
         time_bonus = DIFFICULTY_SETTINGS.get(difficulty, {}).get("time_bonus", 0)
         self.time_limit = level_data.get("time_limit", 120) + time_bonus
         
+        # Níveis de enxame definem o próprio número de inimigos
+        enemy_count = level_data.get(
+            "enemy_count",
+            DIFFICULTY_SETTINGS.get(difficulty, {}).get("enemy_count", 3))
+        
+        # Enxames ficam em colunas e são atualizados por kernels em lote
+        self.entity_store = None
+        swarm = min(enemy_count, len(self.enemy_spawns))
+        if HAS_NUMPY and swarm >= ENTITY_STORE_MIN_ENEMIES:
+            self.entity_store = EntityStore()
+        store = self.entity_store
+        
         # Carrega bandeiras
         flag_positions = level_data.get("flags", [])
-        self.flags = [Flag.from_tile(f[0], f[1]) for f in flag_positions]
+        if store is not None:
+            self.flags = [store.add_flag_at_tile(f[0], f[1]) for f in flag_positions]
+        else:
+            self.flags = [Flag.from_tile(f[0], f[1]) for f in flag_positions]
         
         # Cria jogador
         px = self.player_spawn[0] * TILE_SIZE + TILE_SIZE / 2
@@ -76,20 +150,60 @@ class World:
         self.player = Player(px, py)
         
         # Cria inimigos baseado na dificuldade
-        enemy_count = DIFFICULTY_SETTINGS.get(difficulty, {}).get("enemy_count", 3)
         enemy_speed = DIFFICULTY_SETTINGS.get(difficulty, {}).get("enemy_speed", 2.5)
         
         self.enemies = []
         for i, spawn in enumerate(self.enemy_spawns[:enemy_count]):
             ex = spawn[0] * TILE_SIZE + TILE_SIZE / 2
             ey = spawn[1] * TILE_SIZE + TILE_SIZE / 2
-            self.enemies.append(Enemy(ex, ey, speed=enemy_speed))
+            if store is not None:
+                self.enemies.append(store.add_enemy(ex, ey, speed=enemy_speed))
+            else:
+                self.enemies.append(Enemy(ex, ey, speed=enemy_speed))
+        
+        # Recálculos de caminho defasados: não caem todos no mesmo frame
+        for i, enemy in enumerate(self.enemies):
+            enemy.path_recalc_timer = ENEMY_PATH_RECALC_INTERVAL * i / len(self.enemies)
+        
+        # Mapas de colisão inflados para os tamanhos de carro do nível
+        for entity in [self.player] + self.enemies:
+            entity.collision_map(self.grid)
         
         # Limpa fumaça
         self.smoke_manager.clear()
+        self.smoke_manager.store = store
+        self.refresh_spatial_hashes()
         
         # Invalida cache de renderização
-        self._surface_cache = None
+        self.map_renderer.set_grid(self.grid)
+        self.background.invalidate()
+    
+    def set_tile(self, tx: int, ty: int, tile: int):
+        """
+        Troca um tile do nível carregado.
+        
+        Avisa os caches derivados do grid (máscara, grafos, tabelas), o
+        campo de distâncias, as engines dos inimigos e o desenho do mapa.
+        
+        Args:
+            tx, ty: Posição do tile
+            tile: Novo tipo do tile
+        """
+        if not (0 <= tx < self.width and 0 <= ty < self.height):
+            return
+        if self.grid[ty][tx] == tile:
+            return
+        
+        self.grid[ty][tx] = tile
+        tiles = [(tx, ty)]
+        mark_grid_changed(self.grid, tiles)
+        self.blocked_mask = BlockedMask.for_grid(self.grid)
+        self.flow_field.invalidate()
+        for enemy in self.enemies:
+            enemy.pathfinder.tiles_changed(tiles)
+        
+        self.map_renderer.invalidate_tile(tx, ty)
+        self.background.invalidate()
     
     def update(self, dt: float, keys):
         """Atualiza o mundo."""
@@ -100,60 +214,119 @@ class World:
         self.player.handle_input(keys)
         self.player.update(dt, self.grid)
         
+        # Uma única busca por tile do jogador para todos os inimigos
+        # (com enxames em colunas, o campo é sempre usado)
+        flow_field = None
+        if self.use_flow_field or self.entity_store is not None:
+            self.flow_field.update(self.player.tile_pos)
+            flow_field = self.flow_field
+        
         # Atualiza inimigos
-        for enemy in self.enemies:
-            # Verifica se inimigo está em fumaça
-            if self.smoke_manager.check_entity(enemy.x, enemy.y):
+        if self.entity_store is not None:
+            for enemy in self.entity_store.enemies_in_smoke(self.smoke_manager):
                 enemy.confuse()
-            
-            enemy.update(dt, (self.player.x, self.player.y), self.grid)
+            self.entity_store.update_enemies(dt, self.grid, flow_field)
+        else:
+            for enemy in self.enemies:
+                # Verifica se inimigo está em fumaça
+                if self.smoke_manager.check_entity(enemy.x, enemy.y):
+                    enemy.confuse()
+                
+                enemy.update(dt, (self.player.x, self.player.y), self.grid,
+                             flow_field, self.path_service)
+        
+        # Processa as buscas pedidas dentro do orçamento do frame (com
+        # workers, o serviço assíncrono despacha sozinho)
+        if self.path_service is self.path_scheduler:
+            self.path_scheduler.run()
         
         # Atualiza fumaça
         self.smoke_manager.update(dt)
         
         # Atualiza bandeiras
-        for flag in self.flags:
-            flag.update(dt)
+        if self.entity_store is not None:
+            self.entity_store.update_flags(dt)
+        else:
+            for flag in self.flags:
+                flag.update(dt)
+        
+        self.refresh_spatial_hashes()
+    
+    def refresh_spatial_hashes(self):
+        """Registra inimigos e bandeiras nas posições deste frame."""
+        # Em colunas, as consultas são testes vetorizados (sem hash)
+        if self.entity_store is not None:
+            self.enemy_hash.clear()
+            self.flag_hash.clear()
+            return
+        self.enemy_hash.rebuild(self.enemies)
+        self.flag_hash.rebuild(self.flags)
     
-    def draw(self, screen: pygame.Surface, camera_offset: Tuple[float, float] = (0, 0)):
-        """Desenha o mundo."""
+    def _player_candidates(self, kind: str) -> list:
+        """
+        Inimigos ou bandeiras perto do jogador (fase larga).
+        
+        Args:
+            kind: "enemies" ou "flags"
+        """
+        # Folga para o arredondamento dos Rects
+        player = self.player
+        box = (player.x, player.y, player.width + 2, player.height + 2)
+        if self.entity_store is not None:
+            return getattr(self.entity_store, kind).query(*box)
+        spatial_hash = self.enemy_hash if kind == "enemies" else self.flag_hash
+        return spatial_hash.query_aabb(*box)
+    
+    def draw(self, screen: pygame.Surface,
+             camera_offset: Tuple[float, float] = (0, 0)) -> List[pygame.Rect]:
+        """
+        Desenha o mundo.
+        
+        Returns:
+            Áreas da tela que mudaram em relação ao frame anterior (a tela
+            toda quando a câmera andou); as posições antigas das entidades
+            ficam por conta de quem junta as áreas de dois frames
+        """
         # Desenha mapa (com cache)
-        self._draw_map(screen, camera_offset)
+        if self._draw_map(screen, camera_offset):
+            # Câmera andou: o fundo inteiro foi deslocado
+            dirty = [screen.get_rect()]
+            self._draw_sprites(screen, camera_offset)
+        else:
+            dirty = self._draw_sprites(screen, camera_offset)
+        return dirty
+    
+    def _draw_sprites(self, screen: pygame.Surface,
+                      camera_offset: Tuple[float, float]) -> List[pygame.Rect]:
+        """
+        Desenha bandeiras, fumaça e carros pela fila de renderização.
         
-        # Desenha bandeiras
+        Returns:
+            Áreas desenhadas
+        """
+        queue = self.render_queue
+        queue.begin(screen, camera_offset)
+        
+        # Bandeiras
         for flag in self.flags:
             if not flag.collected:
-                flag.draw(screen, camera_offset)
+                flag.enqueue(queue)
         
-        # Desenha fumaça
-        self.smoke_manager.draw(screen, camera_offset)
+        # Fumaça
+        self.smoke_manager.enqueue(queue)
         
-        # Desenha inimigos
+        # Inimigos e jogador (mesma camada: o jogador por cima)
         for enemy in self.enemies:
-            enemy.draw(screen, camera_offset)
-        
-        # Desenha jogador
+            enemy.enqueue(queue)
         if self.player:
-            self.player.draw(screen, camera_offset)
-    
-    def _draw_map(self, screen: pygame.Surface, camera_offset: Tuple[float, float]):
-        """Desenha o mapa com cache."""
-        assets = AssetManager()
-        
-        # Cria cache se não existe
-        if self._surface_cache is None:
-            self._surface_cache = pygame.Surface((self.pixel_width, self.pixel_height))
-            
-            for ty, row in enumerate(self.grid):
-                for tx, tile_type in enumerate(row):
-                    tile_img = assets.load_tile(tile_type)
-                    self._surface_cache.blit(
-                        tile_img,
-                        (tx * TILE_SIZE, ty * TILE_SIZE)
-                    )
-        
-        # Desenha cache com offset
-        screen.blit(self._surface_cache, (-camera_offset[0], -camera_offset[1]))
+            self.player.enqueue(queue)
+        
+        return queue.flush(screen)
+    
+    def _draw_map(self, screen: pygame.Surface,
+                  camera_offset: Tuple[float, float]) -> List[pygame.Rect]:
+        """Desenha o fundo do mapa (rolado a partir do frame anterior)."""
+        return self.background.draw(screen, camera_offset)
     
     def get_camera_offset(self, screen_width: int, screen_height: int) -> Tuple[float, float]:
         """
@@ -186,7 +359,7 @@ class World:
             return 0
         
         collected = 0
-        for flag in self.flags:
+        for flag in self._player_candidates("flags"):
             if not flag.collected and flag.collides_with(self.player):
                 flag.collect()
                 collected += 1
@@ -203,7 +376,7 @@ class World:
         if not self.player or self.player.is_dead:
             return False
         
-        for enemy in self.enemies:
+        for enemy in self._player_candidates("enemies"):
             if enemy.active and self.player.collides_with(enemy):
                 return True
         
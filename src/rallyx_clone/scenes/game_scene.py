@@ -5,7 +5,7 @@ import pygame
 from ..core.scene import Scene
 from ..core.constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT, STATE_PAUSE, STATE_GAMEOVER,
-    COLOR_BLACK, COLOR_WHITE, COLOR_RED, COLOR_GREEN,
+    COLOR_WHITE, COLOR_RED, COLOR_GREEN,
     SCORE_FLAG, SCORE_COMPLETE
 )
 from ..core.assets import AssetManager
@@ -147,27 +147,29 @@ class GameScene(Scene):
     
     def draw(self, screen: pygame.Surface):
         """Desenha a cena."""
-        screen.fill(COLOR_BLACK)
-        
         # Calcula offset da câmera
         camera_offset = self._world.get_camera_offset(SCREEN_WIDTH, SCREEN_HEIGHT)
         
-        # Desenha mundo
-        self._world.draw(screen, camera_offset)
+        # Desenha mundo (o fundo cobre a tela toda, não precisa limpar antes)
+        self.dirty.extend(self._world.draw(screen, camera_offset))
         
         # Desenha HUD
         time_left = self._timer.time_left if self._timer else 0
-        self._hud.draw(screen, self._world, self._session, time_left)
+        self.dirty.extend(self._hud.draw(screen, self._world, self._session, time_left))
         
         # Mensagens de estado
         if self._respawn_delay > 0:
             if self._session.is_game_over:
-                self._hud.draw_message(screen, "GAME OVER", COLOR_RED)
+                self.dirty.add(self._hud.draw_message(screen, "GAME OVER", COLOR_RED))
             else:
-                self._hud.draw_message(screen, "PERDEU UMA VIDA!", COLOR_RED)
+                self.dirty.add(self._hud.draw_message(screen, "PERDEU UMA VIDA!", COLOR_RED))
         
         if self._victory_delay > 0:
-            self._hud.draw_message(screen, "VITÓRIA!", COLOR_GREEN)
+            self.dirty.add(self._hud.draw_message(screen, "VITÓRIA!", COLOR_GREEN))
+    
+    def dirty_rects(self):
+        """Áreas desenhadas neste frame e no anterior (a tela toda se a câmera andou)."""
+        return self.dirty.take()
     
     def handle_event(self, event: pygame.event.Event):
         """Processa eventos."""
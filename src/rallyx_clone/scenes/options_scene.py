@@ -158,8 +158,14 @@ class OptionsScene(Scene):
         # Menu
         self._menu.draw(screen)
     
+    def dirty_rects(self):
+        """Menu estático: só muda ao entrar na cena e ao apertar teclas."""
+        return self.dirty.take()
+    
     def handle_event(self, event: pygame.event.Event):
         """Processa eventos."""
+        if event.type == pygame.KEYDOWN:
+            self.dirty.invalidate()
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             self._go_back()
             return
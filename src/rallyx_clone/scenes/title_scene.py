@@ -81,6 +81,12 @@ class TitleScene(Scene):
         # Copyright
         self._copyright.draw(screen)
     
+    def dirty_rects(self):
+        """Menu estático: só muda ao entrar na cena e ao apertar teclas."""
+        return self.dirty.take()
+    
     def handle_event(self, event: pygame.event.Event):
         """Processa eventos."""
+        if event.type == pygame.KEYDOWN:
+            self.dirty.invalidate()
         self._menu.handle_event(event)
@@ -2,7 +2,7 @@
 HUD - Interface durante o gameplay.
 """
 import pygame
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from ..core.constants import (
     SCREEN_WIDTH, TILE_SIZE, COLOR_WHITE, COLOR_YELLOW, 
     COLOR_RED, COLOR_GREEN, COLOR_HUD_BG, COLOR_RADAR_BG
@@ -33,9 +33,14 @@ class HUD:
         self.radar_x = screen_width - self.radar_width - 10
         self.radar_y = 10
         self.radar_scale = 0.1  # Escala do mundo para o radar
+        
+        # Textos renderizados: posição -> ((texto, cor), surface, rect)
+        self._texts: Dict[str, tuple] = {}
+        self._lives_shown: Optional[int] = None
+        self._dirty: List[pygame.Rect] = []
     
     def draw(self, screen: pygame.Surface, world: World, session: Session,
-             time_left: float):
+             time_left: float) -> List[pygame.Rect]:
         """
         Desenha o HUD completo.
         
@@ -44,23 +49,51 @@ class HUD:
             world: Mundo do jogo
             session: Sessão atual
             time_left: Tempo restante em segundos
+        
+        Returns:
+            Áreas do HUD que mudaram desde o draw anterior
         """
+        self._dirty = []
         self._draw_score(screen, session)
         self._draw_time(screen, time_left)
         self._draw_lives(screen, session)
         self._draw_flags(screen, session, world)
         self._draw_radar(screen, world)
+        return self._dirty
+    
+    def _blit_text(self, screen: pygame.Surface, key: str, font: pygame.font.Font,
+                   text: str, color: Tuple[int, int, int], **anchor):
+        """
+        Desenha um texto, renderizando de novo só quando ele muda.
+        
+        Args:
+            screen: Surface para desenhar
+            key: Posição do texto no HUD (a âncora de cada chave é fixa)
+            font: Fonte
+            text: Texto
+            color: Cor
+            **anchor: Âncora do retângulo (ex.: topleft=(10, 10))
+        """
+        cached = self._texts.get(key)
+        if cached is None or cached[0] != (text, color):
+            surface = font.render(text, True, color)
+            rect = surface.get_rect(**anchor)
+            # A área antiga também muda (o texto anterior pode ser mais largo)
+            self._dirty.append(rect if cached is None else rect.union(cached[2]))
+            cached = ((text, color), surface, rect)
+            self._texts[key] = cached
+        screen.blit(cached[1], cached[2])
     
     def _draw_score(self, screen: pygame.Surface, session: Session):
         """Desenha pontuação."""
         score_text = f"SCORE: {session.score:06d}"
-        score_surf = self._font_large.render(score_text, True, COLOR_WHITE)
-        screen.blit(score_surf, (10, 10))
+        self._blit_text(screen, "score", self._font_large, score_text, COLOR_WHITE,
+                        topleft=(10, 10))
         
         # High score
         high_text = f"HI: {session.high_score:06d}"
-        high_surf = self._font_small.render(high_text, True, COLOR_YELLOW)
-        screen.blit(high_surf, (10, 45))
+        self._blit_text(screen, "high", self._font_small, high_text, COLOR_YELLOW,
+                        topleft=(10, 45))
     
     def _draw_time(self, screen: pygame.Surface, time_left: float):
         """Desenha tempo restante."""
@@ -71,9 +104,8 @@ class HUD:
         color = COLOR_RED if time_left < 30 else COLOR_WHITE
         
         time_text = f"TIME: {minutes:02d}:{seconds:02d}"
-        time_surf = self._font_large.render(time_text, True, color)
-        time_rect = time_surf.get_rect(midtop=(self.screen_width // 2, 10))
-        screen.blit(time_surf, time_rect)
+        self._blit_text(screen, "time", self._font_large, time_text, color,
+                        midtop=(self.screen_width // 2, 10))
     
     def _draw_lives(self, screen: pygame.Surface, session: Session):
         """Desenha vidas."""
@@ -81,13 +113,21 @@ class HUD:
         y = self.screen_height - 40
         
         lives_text = "LIVES:"
-        lives_surf = self._font_small.render(lives_text, True, COLOR_WHITE)
-        screen.blit(lives_surf, (x, y))
+        self._blit_text(screen, "lives", self._font_small, lives_text, COLOR_WHITE,
+                        topleft=(x, y))
         
         # Ícones de vida
-        icon_x = x + lives_surf.get_width() + 10
+        icon_x = self._texts["lives"][2].right + 10
         for i in range(session.lives):
             screen.blit(self._life_icon, (icon_x + i * 28, y - 2))
+        
+        if session.lives != self._lives_shown:
+            shown = max(session.lives, self._lives_shown or 0)
+            if shown > 0:
+                icon_w, icon_h = self._life_icon.get_size()
+                self._dirty.append(pygame.Rect(icon_x, y - 2,
+                                               (shown - 1) * 28 + icon_w, icon_h))
+            self._lives_shown = session.lives
     
     def _draw_flags(self, screen: pygame.Surface, session: Session, world: World):
         """Desenha contador de bandeiras."""
@@ -95,9 +135,8 @@ class HUD:
         
         flags_text = f"FLAGS: {collected}/{total}"
         color = COLOR_GREEN if collected == total else COLOR_WHITE
-        flags_surf = self._font_large.render(flags_text, True, color)
-        flags_rect = flags_surf.get_rect(topleft=(10, 70))
-        screen.blit(flags_surf, flags_rect)
+        self._blit_text(screen, "flags", self._font_large, flags_text, color,
+                        topleft=(10, 70))
     
     def _draw_radar(self, screen: pygame.Surface, world: World):
         """Desenha mini-map radar."""
@@ -107,6 +146,9 @@ class HUD:
         pygame.draw.rect(screen, COLOR_RADAR_BG, radar_rect)
         pygame.draw.rect(screen, COLOR_WHITE, radar_rect, 2)
         
+        # Os pontos andam todo frame (e podem passar da borda pelo raio)
+        self._dirty.append(radar_rect.inflate(8, 8))
+        
         # Calcula escala
         if world.pixel_width > 0 and world.pixel_height > 0:
             scale_x = (self.radar_width - 4) / world.pixel_width
@@ -142,8 +184,13 @@ class HUD:
     
     def draw_message(self, screen: pygame.Surface, text: str,
                      color: Tuple[int, int, int] = COLOR_WHITE,
-                     y_offset: int = 0):
-        """Desenha mensagem centralizada."""
+                     y_offset: int = 0) -> pygame.Rect:
+        """
+        Desenha mensagem centralizada.
+        
+        Returns:
+            Área ocupada pela mensagem (com o fundo)
+        """
         msg_surf = self._font_large.render(text, True, color)
         msg_rect = msg_surf.get_rect(center=(
             self.screen_width // 2,
@@ -157,3 +204,4 @@ class HUD:
         screen.blit(bg_surf, bg_rect)
         
         screen.blit(msg_surf, msg_rect)
+        return bg_rect
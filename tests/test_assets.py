@@ -0,0 +1,202 @@
+"""
+Testes para o AssetManager (cache de rotação e atlas).
+"""
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.assets import AssetManager
+from rallyx_clone.core.constants import ROTATION_BUCKETS
+from rallyx_clone.gameplay.entities_base import Entity
+
+
+def arrow_sprite():
+    """Sprite 28x28 com a metade de cima pintada (aponta para cima)."""
+    surface = pygame.Surface((28, 28), pygame.SRCALPHA)
+    surface.fill((255, 0, 0, 255), pygame.Rect(0, 0, 28, 14))
+    return surface
+
+
+class TestRotationCache(unittest.TestCase):
+    """Testes do cache de sprites pré-girados."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def setUp(self):
+        self.assets = AssetManager()
+        self.assets.set_rotation_buckets(ROTATION_BUCKETS)
+    
+    def tearDown(self):
+        self.assets.set_rotation_buckets(ROTATION_BUCKETS)
+    
+    def test_quantised_angles_share_frames(self):
+        """Ângulos da mesma faixa devolvem a mesma superfície."""
+        sprite = arrow_sprite()
+        step = 360.0 / ROTATION_BUCKETS
+        first, _ = self.assets.get_rotated(sprite, 10 * step)
+        near, _ = self.assets.get_rotated(sprite, 10 * step + step * 0.4)
+        wrapped, _ = self.assets.get_rotated(sprite, 10 * step - 360)
+        self.assertIs(first, near)
+        self.assertIs(first, wrapped)
+        self.assertIs(self.assets.get_rotated(sprite, 0.1)[0], sprite)
+        
+        stats = self.assets.rotation_stats()
+        self.assertEqual(stats["buckets"], ROTATION_BUCKETS)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["hits"], 2)
+        self.assertAlmostEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["bytes"],
+                         first.get_width() * first.get_height() * first.get_bytesize())
+    
+    def test_frames_match_transform(self):
+        """A faixa é igual à rotação direta e o deslocamento centraliza."""
+        sprite = arrow_sprite()
+        self.assets.set_rotation_buckets(8)
+        rotated, (dx, dy) = self.assets.get_rotated(sprite, 44.0)
+        expected = pygame.transform.rotate(sprite, -45.0)
+        self.assertEqual(rotated.get_size(), expected.get_size())
+        self.assertEqual(pygame.image.tobytes(rotated, "RGBA"),
+                         pygame.image.tobytes(expected, "RGBA"))
+        self.assertEqual((dx, dy), (-(rotated.get_width() // 2),
+                                    -(rotated.get_height() // 2)))
+        
+        # 90 graus no sentido horário: a metade pintada vai para a direita
+        rotated, (dx, dy) = self.assets.get_rotated(sprite, 90.0)
+        self.assertEqual((dx, dy), (-14, -14))
+        self.assertEqual(rotated.get_at((24, 14)).a, 255)
+        self.assertEqual(rotated.get_at((3, 14)).a, 0)
+    
+    def test_prerotate_fills_every_bucket(self):
+        """prerotate() renderiza todas as faixas; depois só há acertos."""
+        sprite = arrow_sprite()
+        self.assets.set_rotation_buckets(16)
+        self.assets.prerotate(sprite)
+        self.assertEqual(self.assets.rotation_stats()["surfaces"], 16)
+        for i in range(64):
+            self.assets.get_rotated(sprite, i * 5.625)
+        stats = self.assets.rotation_stats()
+        self.assertEqual(stats["misses"], 0)
+        self.assertEqual(stats["hit_rate"], 1.0)
+    
+    def test_entity_draw_uses_cache(self):
+        """Entity.draw desenha o quadro do cache centrado na entidade."""
+        entity = Entity(40, 40, 28, 28)
+        entity._sprite = arrow_sprite()
+        entity._angle = 90.0
+        screen = pygame.Surface((80, 80), pygame.SRCALPHA)
+        for _ in range(3):
+            entity.draw(screen)
+        self.assertEqual(self.assets.rotation_stats()["hits"], 2)
+        self.assertEqual(screen.get_at((50, 40)).a, 255)
+        self.assertEqual(screen.get_at((29, 40)).a, 0)
+
+
+class TestAtlas(unittest.TestCase):
+    """Testes do atlas de sprites."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def setUp(self):
+        self.assets = AssetManager()
+        self.base_path = self.assets._base_path
+        self.assets.clear_cache()
+    
+    def tearDown(self):
+        self.assets._base_path = self.base_path
+        self.assets.use_atlas = True
+        self.assets.clear_cache()
+    
+    def load_files(self, requests):
+        """Carrega imagens direto dos arquivos (sem atlas)."""
+        self.assets.use_atlas = False
+        images = [self.assets.load_image(name, scale=size) for name, size in requests]
+        self.assets.use_atlas = True
+        self.assets.clear_cache()
+        return images
+    
+    def test_views_match_files(self):
+        """Cada sprite do atlas tem os mesmos pixels do arquivo escalado."""
+        requests = [("player_car.png", (28, 28)), ("flag.png", (24, 24)),
+                    ("smoke.png", (96, 96)), ("title.png", (400, 200)),
+                    ("tile_wall.png", (32, 32))]
+        expected = self.load_files(requests)
+        
+        for (name, size), image in zip(requests, expected):
+            view = self.assets.load_image(name, scale=size)
+            self.assertIsNotNone(view.get_parent(), name)
+            self.assertEqual(pygame.image.tobytes(view, "RGBA"),
+                             pygame.image.tobytes(image, "RGBA"), name)
+    
+    def test_one_sheet_no_extra_decodes(self):
+        """Os sprites são vistas de uma folha; pedir de novo não abre arquivo."""
+        self.assets.load_atlas()
+        decodes = self.assets.decodes
+        cars = [self.assets.load_image(name, scale=(28, 28))
+                for name in ("player_car.png", "enemy_car.png")]
+        tile = self.assets.load_tile(0)
+        
+        self.assertEqual(self.assets.decodes, decodes)
+        self.assertIs(cars[0].get_parent(), tile.get_parent())
+        self.assertIs(self.assets.get_sprite("road"), tile)
+        self.assertEqual(self.assets.atlas_stats()["sheets"], 1)
+        
+        # Outro tamanho não está no atlas: vem do arquivo
+        self.assets.load_image("player_car.png", scale=(40, 40))
+        self.assertEqual(self.assets.decodes, decodes + 1)
+    
+    def test_sheet_rects(self):
+        """Entradas com rect são recortadas da folha indicada no JSON."""
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "images"))
+            sheet = pygame.Surface((20, 10), pygame.SRCALPHA)
+            sheet.fill((255, 0, 0, 255), pygame.Rect(0, 0, 10, 10))
+            sheet.fill((0, 0, 255, 128), pygame.Rect(10, 0, 10, 10))
+            pygame.image.save(sheet, os.path.join(tmp, "images", "sheet.png"))
+            with open(os.path.join(tmp, "images", "atlas.json"), "w") as f:
+                json.dump({"sheet": "sheet.png", "sprites": {
+                    "red": {"file": "red.png", "rect": [0, 0, 10, 10]},
+                    "blue": {"file": "blue.png", "rect": [10, 0, 10, 10]},
+                }}, f)
+            
+            self.assets._base_path = tmp
+            decodes = self.assets.decodes
+            self.assertTrue(self.assets.load_atlas())
+            red = self.assets.load_image("red.png", scale=(10, 10))
+            blue = self.assets.get_sprite("blue")
+        
+        self.assertEqual(self.assets.decodes, decodes + 1)
+        self.assertIs(red.get_parent(), blue.get_parent())
+        self.assertEqual(tuple(red.get_at((5, 5))), (255, 0, 0, 255))
+        self.assertEqual(tuple(blue.get_at((5, 5))), (0, 0, 255, 128))
+    
+    def test_missing_atlas_falls_back(self):
+        """Sem atlas, as imagens continuam vindo dos arquivos."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assets._base_path = tmp
+            self.assertFalse(self.assets.load_atlas())
+        self.assets._base_path = self.base_path
+        
+        image = self.assets.load_image("flag.png", scale=(24, 24))
+        self.assertIsNone(image.get_parent())
+        self.assertEqual(image.get_size(), (24, 24))
+
+
+if __name__ == "__main__":
+    unittest.main()
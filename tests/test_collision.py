@@ -0,0 +1,258 @@
+"""
+Testes para a detecção de colisão com tiles.
+"""
+import unittest
+import sys
+import os
+import random
+import threading
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+from rallyx_clone.core.constants import TILE_SIZE, PATHFINDING_DSTAR_LITE
+from rallyx_clone.core.collision import (
+    BlockedMask, InflatedMap, check_tile_collision, is_tile_blocked,
+    sweep_aabb, move_and_slide, mark_grid_changed
+)
+from rallyx_clone.core.pathfinding import JunctionGraph, bfs_pathfind, create_engine
+from rallyx_clone.core import dstar_lite  # Registra a engine D* Lite
+from rallyx_clone.core.hpa import ClusterGraph
+from rallyx_clone.core import wavefront
+from rallyx_clone.gameplay.world import World
+
+
+def random_grid(width, height, seed):
+    """Gera um grid aleatório com paredes, grama e borda."""
+    rng = random.Random(seed)
+    return [[rng.choice((0, 0, 0, 1, 2, 3)) for _ in range(width)]
+            for _ in range(height)]
+
+
+def blocked_in_lists(tx, ty, grid):
+    """Regra original, direto nas listas do grid."""
+    if ty < 0 or ty >= len(grid) or tx < 0 or tx >= len(grid[0]):
+        return True
+    return grid[ty][tx] in (1, 3)
+
+
+class TestBlockedMask(unittest.TestCase):
+    """Testes para BlockedMask."""
+    
+    def test_matches_grid(self):
+        """A máscara bloqueia os mesmos tiles, inclusive fora do mapa."""
+        grid = random_grid(13, 9, 1)
+        mask = BlockedMask(grid)
+        for ty in range(-3, 12):
+            for tx in range(-3, 16):
+                expected = blocked_in_lists(tx, ty, grid)
+                self.assertEqual(mask.is_blocked(tx, ty), expected)
+                self.assertEqual(is_tile_blocked(tx, ty, grid), expected)
+                if mask.contains(tx, ty):
+                    self.assertEqual(mask.cells[mask.index(tx, ty)] == 1, expected)
+                    self.assertEqual(mask.tile_at(mask.index(tx, ty)), (tx, ty))
+    
+    def test_cached_per_grid(self):
+        """A máscara só é reconstruída quando o grid muda."""
+        grid = random_grid(5, 5, 2)
+        self.assertIs(BlockedMask.for_grid(grid), BlockedMask.for_grid(grid))
+        self.assertIsNot(BlockedMask.for_grid(random_grid(5, 5, 2)),
+                         BlockedMask.for_grid(grid))
+    
+    def test_cache_per_thread(self):
+        """Outra thread (worker de buscas) não despeja a máscara da principal."""
+        grid = random_grid(5, 5, 3)
+        mask = BlockedMask.for_grid(grid)
+        snapshot = tuple(tuple(row) for row in grid)
+        masks = []
+        worker = threading.Thread(
+            target=lambda: masks.extend([BlockedMask.for_grid(snapshot),
+                                         BlockedMask.for_grid(snapshot)]))
+        worker.start()
+        worker.join()
+        
+        self.assertIs(masks[0], masks[1])
+        self.assertIsNot(masks[0], mask)
+        self.assertIs(BlockedMask.for_grid(grid), mask)
+    
+    def test_tile_collision_matches_grid(self):
+        """check_tile_collision concorda com a varredura tile a tile."""
+        rng = random.Random(3)
+        grid = random_grid(12, 10, 3)
+        for _ in range(2000):
+            x = rng.uniform(-2 * TILE_SIZE, 14 * TILE_SIZE)
+            y = rng.uniform(-2 * TILE_SIZE, 12 * TILE_SIZE)
+            size = rng.choice((0.7, 0.8, 1.5)) * TILE_SIZE
+            left = int((x - size / 2) // TILE_SIZE)
+            right = int((x + size / 2) // TILE_SIZE)
+            top = int((y - size / 2) // TILE_SIZE)
+            bottom = int((y + size / 2) // TILE_SIZE)
+            expected = any(blocked_in_lists(tx, ty, grid)
+                           for ty in range(top, bottom + 1)
+                           for tx in range(left, right + 1))
+            self.assertEqual(check_tile_collision(x, y, size, size, grid), expected)
+
+
+class TestGridChanged(unittest.TestCase):
+    """Edições no lugar invalidam os caches derivados do grid."""
+    
+    def test_wall_after_edit(self):
+        """Parede nova bloqueia colisão e busca depois de mark_grid_changed."""
+        grid = [[0] * 5 for _ in range(3)]
+        self.assertFalse(is_tile_blocked(2, 0, grid))
+        self.assertEqual(len(bfs_pathfind((0, 0), (4, 0), grid)), 5)
+        graph = JunctionGraph.for_grid(grid)
+        clusters = ClusterGraph.for_grid(grid)
+        
+        for ty in range(3):
+            grid[ty][2] = 1
+        mark_grid_changed(grid, [(2, ty) for ty in range(3)])
+        
+        self.assertTrue(is_tile_blocked(2, 0, grid))
+        self.assertTrue(check_tile_collision(2.5 * TILE_SIZE, 0.5 * TILE_SIZE,
+                                             10, 10, grid))
+        self.assertEqual(bfs_pathfind((0, 0), (4, 0), grid), [])
+        self.assertIsNot(JunctionGraph.for_grid(grid), graph)
+        self.assertIsNot(ClusterGraph.for_grid(grid), clusters)
+        if wavefront.HAS_NUMPY:
+            self.assertFalse(wavefront.free_mask(grid)[0][2])
+        
+        # Volta a abrir uma passagem
+        grid[1][2] = 0
+        mark_grid_changed(grid, [(2, 1)])
+        self.assertFalse(is_tile_blocked(2, 1, grid))
+        self.assertEqual(len(bfs_pathfind((0, 0), (4, 0), grid)), 7)
+    
+    def test_world_set_tile(self):
+        """World.set_tile atualiza máscara, campo e engines dos inimigos."""
+        import pygame
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        
+        level = {
+            "grid": [[0] * 6 for _ in range(3)],
+            "player_spawn": [0, 0],
+            "enemy_spawns": [[5, 0]],
+            "enemy_count": 1,
+        }
+        world = World()
+        world.load_level(level)
+        world.flow_field.update((0, 0))
+        enemy = world.enemies[0]
+        enemy.pathfinder = create_engine(PATHFINDING_DSTAR_LITE)  # Guarda estado
+        self.assertEqual(len(enemy.pathfinder.find_path((5, 0), (0, 0), world.grid)), 6)
+        
+        for ty in range(3):
+            world.set_tile(3, ty, 1)
+        self.assertEqual(level["grid"][0][3], 0)  # Dados do nível intactos
+        self.assertTrue(world.blocked_mask.is_blocked(3, 0))
+        self.assertTrue(world.flow_field.update((0, 0)))
+        self.assertEqual(world.flow_field.distance_at((5, 0)), -1)
+        self.assertEqual(enemy.pathfinder.find_path((5, 0), (0, 0), world.grid), [])
+
+
+class TestInflatedMap(unittest.TestCase):
+    """Testes para o mapa de colisão inflado."""
+    
+    def test_matches_tile_collision(self):
+        """Uma consulta no centro dá a mesma resposta do teste exato."""
+        rng = random.Random(4)
+        grid = random_grid(20, 15, 4)
+        mask = BlockedMask(grid)
+        for size in (28 * 0.8, 28 * 0.7, 20, 40):
+            inflated = mask.inflated(size, size)
+            self.assertIn(InflatedMap.FREE, inflated.cells)
+            self.assertIn(InflatedMap.BLOCKED, inflated.cells)
+            for _ in range(5000):
+                x = rng.uniform(-TILE_SIZE, 21 * TILE_SIZE)
+                y = rng.uniform(-TILE_SIZE, 16 * TILE_SIZE)
+                if rng.random() < 0.3:
+                    x, y = round(x), round(y)  # Bordas de células
+                self.assertEqual(inflated.collides(x, y),
+                                 check_tile_collision(x, y, size, size, mask))
+    
+    def test_cached_per_size(self):
+        """Cada tamanho de entidade tem um único mapa por nível."""
+        mask = BlockedMask(random_grid(6, 6, 5))
+        self.assertIs(mask.inflated(22.4, 22.4), mask.inflated(22.4, 22.4))
+        self.assertIsNot(mask.inflated(22.4, 22.4), mask.inflated(19.6, 19.6))
+
+
+class TestSweep(unittest.TestCase):
+    """Testes da colisão contínua."""
+    
+    def test_time_of_impact_and_normal(self):
+        """Caixa indo contra uma parede para no contato."""
+        grid = [[0] * 6 for _ in range(3)]
+        grid[1][4] = 1
+        x = 1.5 * TILE_SIZE
+        y = 1.5 * TILE_SIZE
+        
+        # Borda direita da caixa (x + 10) chega em 4 * TILE_SIZE
+        toi, nx, ny = sweep_aabb(x, y, 20, 20, 100, 0, grid)
+        self.assertAlmostEqual(x + 100 * toi, 4 * TILE_SIZE - 10)
+        self.assertEqual((nx, ny), (-1.0, 0.0))
+        
+        toi, nx, ny = sweep_aabb(x, y, 20, 20, 0, 10, grid)
+        self.assertEqual((toi, nx, ny), (1.0, 0.0, 0.0))
+    
+    def test_no_tunnelling(self):
+        """Passos grandes nunca atravessam paredes nem terminam nelas."""
+        rng = random.Random(5)
+        for seed in range(4):
+            grid = random_grid(16, 12, seed)
+            for _ in range(300):
+                x = rng.uniform(-8, 16 * TILE_SIZE + 8)
+                y = rng.uniform(-8, 12 * TILE_SIZE + 8)
+                if check_tile_collision(x, y, 22.4, 22.4, grid):
+                    continue
+                dx = rng.uniform(-80, 80)
+                dy = rng.uniform(-80, 80)
+                new_x, new_y, _, _ = move_and_slide(x, y, 22.4, 22.4,
+                                                    dx, dy, grid)
+                self.assertFalse(check_tile_collision(new_x, new_y, 22.4,
+                                                      22.4, grid))
+                
+                # O trajeto percorrido (até dois segmentos) fica livre
+                toi, _, _ = sweep_aabb(x, y, 22.4, 22.4, dx, dy, grid)
+                for k in range(21):
+                    t = toi * k / 20 * 0.999
+                    self.assertFalse(check_tile_collision(
+                        x + dx * t, y + dy * t, 22.4, 22.4, grid))
+    
+    def test_slides_along_wall(self):
+        """Movimento diagonal contra parede desliza no outro eixo."""
+        grid = [[0] * 6 for _ in range(6)]
+        for ty in range(6):
+            grid[ty][4] = 1
+        x = 3.5 * TILE_SIZE
+        y = 2.5 * TILE_SIZE
+        new_x, new_y, hit_x, hit_y = move_and_slide(x, y, 20, 20, 12, 12, grid)
+        self.assertTrue(hit_x)
+        self.assertFalse(hit_y)
+        self.assertAlmostEqual(new_x, 4 * TILE_SIZE - 10, places=3)
+        self.assertAlmostEqual(new_y, y + 12)
+    
+    def test_small_steps_match_sweep(self):
+        """O caminho rápido dá o mesmo resultado da varredura."""
+        grid = random_grid(12, 10, 9)
+        rng = random.Random(3)
+        for _ in range(500):
+            x = rng.uniform(0, 12 * TILE_SIZE)
+            y = rng.uniform(0, 10 * TILE_SIZE)
+            if check_tile_collision(x, y, 22.4, 22.4, grid):
+                continue
+            dx = rng.uniform(-4, 4)
+            dy = rng.uniform(-4, 4)
+            fast = move_and_slide(x, y, 22.4, 22.4, dx, dy, grid)
+            toi, nx, ny = sweep_aabb(x, y, 22.4, 22.4, dx, dy, grid)
+            if not nx and not ny:
+                self.assertEqual(fast, (x + dx, y + dy, False, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Testes para a apresentação por retângulos sujos.
+"""
+import unittest
+from unittest import mock
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import numpy as np
+import pygame
+
+from rallyx_clone.core.constants import SCREEN_WIDTH, SCREEN_HEIGHT, STATE_GAME
+from rallyx_clone.core.dirty_rects import DirtyRegion, DisplayPresenter
+from rallyx_clone.core.state import StateMachine
+from rallyx_clone.scenes.game_scene import GameScene
+
+
+class _Keys:
+    """Estado de teclado falso para pygame.key.get_pressed."""
+    
+    def __init__(self, pressed):
+        self.pressed = pressed
+    
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class TestDirtyRegion(unittest.TestCase):
+    """Testes da DirtyRegion."""
+    
+    def test_first_frame_is_full(self):
+        """O primeiro frame e os frames após invalidate pedem a tela toda."""
+        region = DirtyRegion()
+        region.add(pygame.Rect(0, 0, 10, 10))
+        self.assertIsNone(region.take())
+        self.assertEqual(region.take(), [pygame.Rect(0, 0, 10, 10)])
+        self.assertEqual(region.take(), [])
+        
+        region.invalidate()
+        self.assertIsNone(region.take())
+    
+    def test_joins_two_frames(self):
+        """Cada frame envia as próprias áreas mais as do frame anterior."""
+        region = DirtyRegion()
+        region.take()
+        
+        region.add(pygame.Rect(0, 0, 10, 10))
+        self.assertEqual(region.take(), [pygame.Rect(0, 0, 10, 10)])
+        
+        region.extend([pygame.Rect(20, 0, 10, 10), None, pygame.Rect(5, 5, 0, 0)])
+        self.assertEqual(region.take(), [pygame.Rect(0, 0, 10, 10),
+                                         pygame.Rect(20, 0, 10, 10)])
+        self.assertEqual(region.take(), [pygame.Rect(20, 0, 10, 10)])
+
+
+class TestDisplayPresenter(unittest.TestCase):
+    """Testes do DisplayPresenter."""
+    
+    def setUp(self):
+        self.screen_rect = pygame.Rect(0, 0, 800, 600)
+        self.presenter = DisplayPresenter(full_fraction=0.5)
+    
+    def test_paths(self):
+        """None faz flip, lista vazia não envia nada, áreas pequenas fazem update."""
+        with mock.patch("pygame.display.flip") as flip, \
+                mock.patch("pygame.display.update") as update:
+            self.assertEqual(self.presenter.present(None, self.screen_rect), "flip")
+            self.assertEqual(self.presenter.present([], self.screen_rect), "skip")
+            
+            rects = [pygame.Rect(-10, -10, 40, 40), pygame.Rect(900, 0, 10, 10)]
+            self.assertEqual(self.presenter.present(rects, self.screen_rect), "update")
+        
+        flip.assert_called_once_with()
+        update.assert_called_once_with([pygame.Rect(0, 0, 30, 30)])
+        self.assertEqual(self.presenter.stats()["skipped"], 1)
+    
+    def test_large_area_flips(self):
+        """Acima da fração configurada, um flip substitui os updates."""
+        with mock.patch("pygame.display.flip") as flip, \
+                mock.patch("pygame.display.update") as update:
+            self.presenter.present([pygame.Rect(0, 0, 800, 300)], self.screen_rect)
+            self.presenter.invalidate()
+            self.presenter.present([pygame.Rect(0, 0, 8, 8)], self.screen_rect)
+        
+        self.assertEqual(flip.call_count, 2)
+        update.assert_not_called()
+
+
+class TestGameSceneDirtyRects(unittest.TestCase):
+    """As áreas da GameScene cobrem tudo o que muda entre frames."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    
+    def test_rects_cover_changes(self):
+        """Todo pixel que mudou está dentro das áreas informadas."""
+        machine = StateMachine()
+        scene = GameScene()
+        machine.add_state(STATE_GAME, scene)
+        machine.change_state(STATE_GAME)
+        
+        keys = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+        screen = self.screen
+        previous = None
+        partial = 0
+        for frame in range(150):
+            pressed = {keys[(frame // 40) % 4]}
+            if frame % 50 == 10:
+                pressed.add(pygame.K_SPACE)
+            with mock.patch("pygame.key.get_pressed", return_value=_Keys(pressed)):
+                machine.update(1 / 60)
+            machine.draw(screen)
+            rects = scene.dirty_rects()
+            pixels = pygame.surfarray.array3d(screen)
+            
+            if previous is not None and rects is not None:
+                covered = np.zeros(pixels.shape[:2], dtype=bool)
+                for rect in rects:
+                    rect = rect.clip(screen.get_rect())
+                    covered[rect.left:rect.right, rect.top:rect.bottom] = True
+                changed = (pixels != previous).any(axis=2)
+                self.assertFalse((changed & ~covered).any(), f"frame {frame}")
+                if covered.sum() < covered.size // 2:
+                    partial += 1
+            previous = pixels
+        
+        # Câmera parada (o nível cabe na tela): quase todo frame é parcial
+        self.assertGreater(partial, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+"""
+Testes para a base de entidades (slots e retângulos reaproveitados).
+"""
+import unittest
+import sys
+import os
+import random
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core import allocations
+from rallyx_clone.core.allocations import AllocationCounter
+from rallyx_clone.gameplay.entities_base import Entity
+from rallyx_clone.gameplay.player import Player
+from rallyx_clone.gameplay.enemy import Enemy
+from rallyx_clone.gameplay.flag import Flag
+from rallyx_clone.gameplay.smoke import Smoke
+from rallyx_clone.gameplay.world import World
+from rallyx_clone.core.config import Config
+from rallyx_clone.core.constants import (
+    TILE_SIZE, PATHFINDING_BFS, PATHFINDING_ASTAR,
+    PATHFINDING_DSTAR_LITE, ENEMY_PATH_RECALC_INTERVAL
+)
+from rallyx_clone.core.path_scheduler import PathScheduler
+from rallyx_clone.core.pathfinding import FlowField
+
+
+class TestEntitySlots(unittest.TestCase):
+    """Testes de Entity e subclasses."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def test_no_instance_dict(self):
+        """Nenhuma entidade do jogo tem __dict__."""
+        for entity in (Player(50, 50), Enemy(80, 80), Flag(20, 20), Smoke(40, 40)):
+            self.assertFalse(hasattr(entity, "__dict__"), type(entity).__name__)
+            with self.assertRaises(AttributeError):
+                entity.not_an_attribute = 1
+    
+    def test_rect_reused_and_exact(self):
+        """O retângulo é o mesmo objeto e igual ao construído do zero."""
+        rng = random.Random(4)
+        entity = Entity(0, 0, 28, 28)
+        rect = entity.rect
+        for _ in range(200):
+            entity.x = rng.uniform(-50, 700)
+            entity.y = rng.uniform(-50, 500)
+            self.assertIs(entity.rect, rect)
+            self.assertEqual(rect, pygame.Rect(entity.x - 14, entity.y - 14, 28, 28))
+    
+    def test_collision_loop_allocates_nothing(self):
+        """O laço de colisão entre pares não aloca por entidade."""
+        rng = random.Random(2)
+        
+        def peak(count):
+            entities = [Entity(rng.uniform(0, 640), rng.uniform(0, 480), 28, 28)
+                        for _ in range(count)]
+            player = Entity(320, 240, 28, 28)
+            counter = AllocationCounter()
+            with counter:
+                for entity in entities:
+                    player.collides_with(entity)
+            return counter.last_peak
+        
+        # Menos de um byte por entidade: só o custo fixo do próprio laço
+        peak(10)
+        self.assertLess(peak(5000), 5000)
+    
+    def test_allocation_peak_without_reset_peak(self):
+        """Sem tracemalloc.reset_peak (Python 3.8), o pico ainda é medido."""
+        with mock.patch.object(allocations, "HAS_RESET_PEAK", False):
+            counter = AllocationCounter()
+            counter.start()
+            try:
+                counter.begin_frame()
+                scratch = [0] * 100000
+                del scratch
+                counter.end_frame()
+                self.assertGreater(counter.last_peak, 100000 * 4)
+                self.assertLess(counter.last_retained, 100000)
+                
+                # O pico do frame anterior não conta para o seguinte
+                counter.begin_frame()
+                counter.end_frame()
+                self.assertLess(counter.last_peak, 100000)
+            finally:
+                counter.stop()
+
+
+class TestEnemyPathRequests(unittest.TestCase):
+    """Inimigos com buscas pelo escalonador."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def test_confused_enemy_keeps_moving(self):
+        """Na fumaça por vários frames, a busca pedida ainda é adotada."""
+        random.seed(5)
+        grid = [[0] * 12 for _ in range(8)]
+        scheduler = PathScheduler()
+        enemy = Enemy(1.5 * TILE_SIZE, 1.5 * TILE_SIZE)
+        player_pos = (10.5 * TILE_SIZE, 6.5 * TILE_SIZE)
+        start = (enemy.x, enemy.y)
+        
+        moving = 0
+        for _ in range(120):
+            enemy.confuse()  # Como World.update a cada frame na fumaça
+            enemy.update(1 / 60, player_pos, grid, None, scheduler)
+            scheduler.run()
+            if enemy.vx or enemy.vy:
+                moving += 1
+        
+        self.assertEqual(enemy.state, Enemy.STATE_CONFUSED)
+        self.assertGreater(moving, 100)
+        self.assertNotEqual((enemy.x, enemy.y), start)
+    
+    def test_follows_flow_field_step_by_step(self):
+        """Perseguindo pelo campo, cada passo é um next_tile, sem caminho inteiro."""
+        grid = [[0] * 12 for _ in range(8)]
+        for ty in range(1, 7):
+            grid[ty][5] = 1  # Parede com passagens nas pontas
+        field = FlowField()
+        field.set_grid(grid)
+        enemy = Enemy(1.5 * TILE_SIZE, 4.5 * TILE_SIZE)
+        player_pos = (10.5 * TILE_SIZE, 4.5 * TILE_SIZE)
+        field.update((10, 4))
+        
+        with mock.patch.object(FlowField, "path_from", side_effect=AssertionError):
+            for _ in range(600):
+                enemy.update(1 / 60, player_pos, grid, field)
+                self.assertLessEqual(len(enemy.path), 2)
+                if enemy.tile_pos == (10, 4):
+                    break
+        self.assertEqual(enemy.tile_pos, (10, 4))
+    
+    def test_recalc_timers_staggered(self):
+        """Os recálculos de caminho de cada inimigo ficam defasados."""
+        world = World()
+        world.load_level({
+            "grid": [[0] * 10 for _ in range(8)],
+            "player_spawn": [1, 1],
+            "enemy_spawns": [[8, 1], [8, 6], [1, 6]],
+            "enemy_count": 3,
+        })
+        timers = [enemy.path_recalc_timer for enemy in world.enemies]
+        self.assertEqual(len(set(timers)), 3)
+        
+        # A defasagem sobrevive aos recálculos
+        keys = pygame.key.get_pressed()
+        for _ in range(90):
+            world.update(1 / 60, keys)
+        timers = sorted(enemy.path_recalc_timer for enemy in world.enemies)
+        self.assertGreater(timers[1] - timers[0], 0.1)
+        self.assertGreater(timers[2] - timers[1], 0.1)
+    
+    def test_recalc_timer_bounded_without_path(self):
+        """Sem caminho, recalcular a cada frame não empurra o timer."""
+        grid = [[0] * 12 for _ in range(8)]
+        for ty in range(8):
+            grid[ty][6] = 1  # Jogador do outro lado de uma parede
+        player_pos = (10.5 * TILE_SIZE, 4.5 * TILE_SIZE)
+        
+        for scheduler in (None, PathScheduler()):
+            enemy = Enemy(1.5 * TILE_SIZE, 4.5 * TILE_SIZE)
+            for _ in range(120):
+                enemy.update(1 / 60, player_pos, grid, None, scheduler)
+                if scheduler is not None:
+                    scheduler.run()
+                self.assertEqual(enemy.path, [])
+                self.assertLessEqual(enemy.path_recalc_timer,
+                                     ENEMY_PATH_RECALC_INTERVAL)
+    
+    def test_configured_engine_chases(self):
+        """Com outra engine configurada, a perseguição usa essa engine."""
+        config = Config()
+        previous = config.pathfinding_engine
+        level = {
+            "grid": [[0] * 10 for _ in range(8)],
+            "player_spawn": [1, 1],
+            "enemy_spawns": [[8, 6]],
+            "enemy_count": 1,
+        }
+        try:
+            config.pathfinding_engine = PATHFINDING_ASTAR
+            world = World()
+            world.load_level(level)
+            self.assertFalse(world.use_flow_field)
+            keys = pygame.key.get_pressed()
+            for _ in range(10):
+                world.update(1 / 60, keys)
+            self.assertGreater(world.enemies[0].pathfinder.last_expanded, 0)
+            
+            config.pathfinding_engine = PATHFINDING_BFS
+            world.load_level(level)
+            self.assertTrue(world.use_flow_field)
+        finally:
+            config.pathfinding_engine = previous
+    
+    def test_hpa_chases_beyond_default_limit(self):
+        """Com HPA*, o inimigo persegue um alvo a mais de 50 tiles."""
+        grid = [[0] * 120 for _ in range(12)]
+        enemy = Enemy(2.5 * TILE_SIZE, 6.5 * TILE_SIZE, engine="hpa")
+        player_pos = (110.5 * TILE_SIZE, 6.5 * TILE_SIZE)
+        start_x = enemy.x
+        
+        for _ in range(240):
+            enemy.update(1 / 60, player_pos, grid)
+        self.assertEqual(enemy.path[-1], (110, 6))
+        self.assertGreater(enemy.x, start_x + 5 * TILE_SIZE)
+        
+        scheduler = PathScheduler()
+        enemy = Enemy(2.5 * TILE_SIZE, 6.5 * TILE_SIZE, engine="hpa")
+        for _ in range(240):
+            enemy.update(1 / 60, player_pos, grid, None, scheduler)
+            scheduler.run()
+        self.assertEqual(enemy.path[-1], (110, 6))
+        self.assertGreater(enemy.x, start_x + 5 * TILE_SIZE)
+    
+    def test_dstar_lite_pursuit_is_incremental(self):
+        """Na perseguição, o D* Lite replaneja sem recomeçar a busca."""
+        config = Config()
+        previous = config.pathfinding_engine
+        try:
+            config.pathfinding_engine = PATHFINDING_DSTAR_LITE
+            world = World()
+            world.load_level({
+                "grid": [[0] * 12 for _ in range(8)],
+                "player_spawn": [1, 1],
+                "enemy_spawns": [[10, 6]],
+                "enemy_count": 1,
+            })
+            keys = pygame.key.get_pressed()
+            world.update(1 / 60, keys)
+            planner = world.enemies[0].pathfinder.planner
+            self.assertEqual(planner.goal, world.player.tile_pos)
+            
+            with mock.patch.object(planner, "_initialize",
+                                   wraps=planner._initialize) as initialize, \
+                    mock.patch.object(planner, "plan", wraps=planner.plan) as plan:
+                for _ in range(90):
+                    world.update(1 / 60, keys)
+            self.assertGreaterEqual(plan.call_count, 2)
+            initialize.assert_not_called()
+        finally:
+            config.pathfinding_engine = previous
+
+
+if __name__ == "__main__":
+    unittest.main()
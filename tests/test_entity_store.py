@@ -0,0 +1,165 @@
+"""
+Testes para o armazenamento de entidades em colunas.
+"""
+import unittest
+import collections
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.constants import TILE_SIZE, ENTITY_STORE_MIN_ENEMIES
+from rallyx_clone.core.collision import check_tile_collision
+from rallyx_clone.core.pathfinding import FlowField
+from rallyx_clone.gameplay.flag import Flag
+from rallyx_clone.gameplay.smoke import SmokeManager
+from rallyx_clone.gameplay.world import World
+from rallyx_clone.gameplay.entity_store import EntityStore, HAS_NUMPY
+
+
+def block_grid(size):
+    """Quarteirões de 3x3 paredes separados por ruas de um tile."""
+    return [[3 if tx in (0, size - 1) or ty in (0, size - 1)
+             else (1 if tx % 4 and ty % 4 else 0)
+             for tx in range(size)] for ty in range(size)]
+
+
+def centre(tx, ty):
+    """Centro de um tile em pixels."""
+    return tx * TILE_SIZE + TILE_SIZE / 2, ty * TILE_SIZE + TILE_SIZE / 2
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy não instalado")
+class TestEntityStore(unittest.TestCase):
+    """Testes do EntityStore."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def test_views_share_columns(self):
+        """Atributos das views são lidos e escritos nas colunas."""
+        store = EntityStore(capacity=2)
+        enemies = [store.add_enemy(*centre(i + 1, 4)) for i in range(5)]
+        self.assertEqual(store.enemies.count, 5)
+        self.assertGreaterEqual(store.enemies.capacity, 5)
+        
+        enemy = enemies[3]
+        enemy.x = 100.0
+        self.assertEqual(store.enemies.x[3], 100.0)
+        enemy.confuse()
+        self.assertEqual(enemy.state, enemy.STATE_CONFUSED)
+        self.assertGreater(store.enemies.confused_timer[3], 0)
+        enemy.respawn()
+        self.assertEqual((enemy.x, enemy.y), centre(4, 4))
+        self.assertEqual(enemy.state, enemy.STATE_CHASE)
+    
+    def test_flag_kernel_matches_objects(self):
+        """Flutuação em lote igual à de Flag.update."""
+        store = EntityStore()
+        views = [store.add_flag_at_tile(tx, 2) for tx in range(4)]
+        flags = [Flag.from_tile(tx, 2) for tx in range(4)]
+        views[1].collect()
+        flags[1].collect()
+        for _ in range(30):
+            store.update_flags(1 / 60)
+            for flag in flags:
+                flag.update(1 / 60)
+        for view, flag in zip(views, flags):
+            self.assertAlmostEqual(view.y, flag.y)
+            self.assertEqual(view.collected, flag.collected)
+    
+    def test_smoke_slots_are_reused(self):
+        """Fumaças expiram no kernel e devolvem o slot."""
+        manager = SmokeManager()
+        manager.store = EntityStore()
+        manager.create_smoke(50, 50)
+        manager.update(1.0)
+        self.assertEqual(len(manager.smokes), 1)
+        self.assertTrue(manager.check_entity(60, 50))
+        manager.update(2.0)
+        self.assertEqual(manager.smokes, [])
+        
+        manager.create_smoke(80, 80)
+        self.assertEqual(manager.store.smokes.count, 1)
+        self.assertEqual(manager.smokes[0].elapsed, 0.0)
+    
+    def test_smoke_pool_survives_new_store(self):
+        """Trocar de store (novo nível) reaproveita as views do pool."""
+        manager = SmokeManager(capacity=4)
+        manager.store = EntityStore()
+        pool = [manager.create_smoke(50 + i * 10, 50) for i in range(4)]
+        
+        store = EntityStore()
+        manager.store = store
+        self.assertEqual(manager.smokes, [])
+        self.assertEqual(sorted(map(id, manager._free)), sorted(map(id, pool)))
+        
+        smoke = manager.create_smoke(80, 80)
+        self.assertIn(smoke, pool)
+        self.assertEqual(store.smokes.count, 1)
+        self.assertEqual(store.smokes.x[0], 80.0)
+        self.assertTrue(manager.check_entity(80, 80))
+        
+        # Objetos comuns não têm colunas: o pool recomeça
+        manager.store = None
+        self.assertEqual(manager._free, [])
+        self.assertNotIn(manager.create_smoke(80, 80), pool)
+    
+    def test_enemies_chase_without_entering_walls(self):
+        """O kernel desce o campo até o alvo sem entrar em paredes."""
+        grid = block_grid(21)
+        field = FlowField()
+        field.set_grid(grid)
+        field.update((12, 12))
+        
+        store = EntityStore()
+        spawns = [(4, 1), (4, 16), (19, 4), (12, 19), (1, 8)]
+        enemies = [store.add_enemy(*centre(tx, ty)) for tx, ty in spawns]
+        for _ in range(600):
+            store.update_enemies(1 / 60, grid, field)
+            for enemy in enemies:
+                self.assertFalse(check_tile_collision(
+                    enemy.x, enemy.y, 28 * 0.7, 28 * 0.7, grid))
+        
+        for enemy in enemies:
+            self.assertEqual(enemy.tile_pos, (12, 12))
+    
+    def test_world_uses_store_for_swarms(self):
+        """Níveis com muitos inimigos usam as colunas."""
+        grid = block_grid(41)
+        roads = [(tx, ty) for ty in range(41) for tx in range(41)
+                 if grid[ty][tx] == 0]
+        count = ENTITY_STORE_MIN_ENEMIES
+        level = {
+            "grid": grid,
+            "player_spawn": list(roads[0]),
+            "enemy_spawns": [list(t) for t in roads[-count:]],
+            "flags": [list(roads[1])],
+            "enemy_count": count,
+        }
+        world = World()
+        world.load_level(level)
+        self.assertIsNotNone(world.entity_store)
+        self.assertEqual(len(world.enemies), count)
+        
+        world.update(1 / 60, collections.defaultdict(bool))
+        self.assertEqual(world.check_flag_collection(), 0)
+        self.assertFalse(world.check_enemy_collision())
+        
+        # Inimigo em cima do jogador é encontrado pela consulta em lote
+        world.enemies[5].x = world.player.x
+        world.enemies[5].y = world.player.y
+        self.assertTrue(world.check_enemy_collision())
+
+
+if __name__ == "__main__":
+    unittest.main()
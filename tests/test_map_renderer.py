@@ -0,0 +1,142 @@
+"""
+Testes para o renderizador do mapa em pedaços.
+"""
+import unittest
+import random
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.assets import AssetManager
+from rallyx_clone.core.constants import TILE_SIZE
+from rallyx_clone.core.map_renderer import ChunkedMapRenderer, ScrollingBackground
+
+
+def random_grid(width, height, seed=1):
+    """Grid com os quatro tipos de tile."""
+    rng = random.Random(seed)
+    return [[rng.randrange(4) for _ in range(width)] for _ in range(height)]
+
+
+def reference(grid, screen_size, camera_offset):
+    """Desenho ingênuo: o mapa inteiro numa superfície, com offset."""
+    assets = AssetManager()
+    whole = pygame.Surface((len(grid[0]) * TILE_SIZE, len(grid) * TILE_SIZE))
+    for ty, row in enumerate(grid):
+        for tx, tile in enumerate(row):
+            whole.blit(assets.load_tile(tile), (tx * TILE_SIZE, ty * TILE_SIZE))
+    screen = pygame.Surface(screen_size)
+    screen.blit(whole, (-int(camera_offset[0]), -int(camera_offset[1])))
+    return pygame.image.tobytes(screen, "RGB")
+
+
+class TestChunkedMapRenderer(unittest.TestCase):
+    """Testes do ChunkedMapRenderer."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def test_matches_whole_map_blit(self):
+        """Os pedaços desenham o mesmo que a superfície do mapa inteiro."""
+        grid = random_grid(37, 23)
+        renderer = ChunkedMapRenderer(chunk_tiles=8)
+        renderer.set_grid(grid)
+        for offset in ((0, 0), (45.7, 13.2), (37 * 32 - 200, 23 * 32 - 150), (-20, -10)):
+            screen = pygame.Surface((200, 150))
+            renderer.draw(screen, offset)
+            self.assertEqual(pygame.image.tobytes(screen, "RGB"),
+                             reference(grid, (200, 150), offset), offset)
+    
+    def test_only_visible_chunks_are_built(self):
+        """Só os pedaços que cruzam a tela (ou o clip) são montados."""
+        renderer = ChunkedMapRenderer(chunk_tiles=4)  # pedaços de 128 px
+        renderer.set_grid(random_grid(64, 64))
+        screen = pygame.Surface((256, 256))
+        self.assertEqual(renderer.draw(screen, (0, 0)), 4)
+        self.assertEqual(renderer.draw(screen, (64, 0)), 6)
+        self.assertEqual(renderer.stats()["builds"], 6)
+        
+        screen.set_clip(pygame.Rect(0, 0, 256, 16))
+        self.assertEqual(renderer.draw(screen, (64, 0)), 3)
+        self.assertEqual(renderer.stats()["hits"], 4 + 3)
+    
+    def test_memory_is_capped(self):
+        """Percorrer um mapa grande não passa do teto de memória."""
+        chunk_bytes = (4 * TILE_SIZE) ** 2 * 4
+        renderer = ChunkedMapRenderer(chunk_tiles=4, max_bytes=8 * chunk_bytes)
+        renderer.set_grid(random_grid(256, 16))
+        screen = pygame.Surface((256, 256))
+        for x in range(0, 256 * TILE_SIZE - 256, 96):
+            renderer.draw(screen, (x, 0))
+            self.assertLessEqual(renderer.stats()["bytes"], 8 * chunk_bytes)
+        stats = renderer.stats()
+        self.assertGreater(stats["evictions"], 0)
+        self.assertLessEqual(stats["chunks"], 8)
+
+
+class TestScrollingBackground(unittest.TestCase):
+    """Testes do ScrollingBackground."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def setUp(self):
+        self.grid = random_grid(40, 30, seed=7)
+        self.renderer = ChunkedMapRenderer(chunk_tiles=8)
+        self.renderer.set_grid(self.grid)
+        self.background = ScrollingBackground(self.renderer)
+        self.screen = pygame.Surface((240, 180))
+    
+    def test_scrolled_frames_match_full_redraw(self):
+        """Depois de cada rolagem a tela é igual a um redesenho completo."""
+        rng = random.Random(3)
+        x, y = 10.0, 10.0
+        for _ in range(60):
+            x = min(max(x + rng.uniform(-9, 9), -30), 40 * 32 - 200)
+            y = min(max(y + rng.uniform(-9, 9), -30), 30 * 32 - 150)
+            self.background.draw(self.screen, (x, y))
+            self.assertEqual(pygame.image.tobytes(self.screen, "RGB"),
+                             reference(self.grid, (240, 180), (x, y)), (x, y))
+        self.assertEqual(self.background.full_redraws, 1)
+    
+    def test_redraws_only_exposed_strips(self):
+        """Passos pequenos redesenham só as faixas novas."""
+        self.background.draw(self.screen, (100, 100))
+        self.assertEqual(self.background.redrawn_pixels, 240 * 180)
+        
+        strips = self.background.draw(self.screen, (104, 97))
+        self.assertEqual(strips, [pygame.Rect(0, 0, 240, 3),
+                                  pygame.Rect(236, 3, 4, 177)])
+        self.assertEqual(self.background.redrawn_pixels, 240 * 3 + 4 * 177)
+        
+        # Câmera parada: nada é redesenhado
+        self.assertEqual(self.background.draw(self.screen, (104, 97)), [])
+        self.assertEqual(self.background.redrawn_pixels, 0)
+    
+    def test_large_jump_redraws_everything(self):
+        """Saltos (respawn) e invalidate() redesenham a tela toda."""
+        self.background.draw(self.screen, (0, 0))
+        self.background.draw(self.screen, (500, 0))
+        self.assertEqual(self.background.full_redraws, 2)
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"),
+                         reference(self.grid, (240, 180), (500, 0)))
+        
+        self.background.invalidate()
+        self.background.draw(self.screen, (500, 0))
+        self.assertEqual(self.background.full_redraws, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+Testes para o sistema de partículas em arrays.
+"""
+import unittest
+import sys
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.particles import ParticleEmitter, ParticleField, HAS_NUMPY
+
+
+class CountingSurface(pygame.Surface):
+    """Superfície que conta as chamadas de desenho."""
+    
+    def __init__(self, size):
+        super().__init__(size)
+        self.blit_calls = 0
+        self.blits_calls = 0
+        self.drawn = 0
+    
+    def blit(self, *args, **kwargs):
+        self.blit_calls += 1
+        return super().blit(*args, **kwargs)
+    
+    def blits(self, sequence, doreturn=True):
+        sequence = list(sequence)
+        self.blits_calls += 1
+        self.drawn += len(sequence)
+        return super().blits(sequence, doreturn=doreturn)
+
+
+def fade_frames(steps=4, size=16):
+    """Níveis de fade sintéticos."""
+    frames = []
+    for i in range(steps):
+        frame = pygame.Surface((size, size))
+        frame.set_alpha(round(255 * i / (steps - 1)))
+        frames.append(frame)
+    return frames
+
+
+class TestParticles(unittest.TestCase):
+    """Testes de ParticleEmitter e ParticleField nos dois back-ends."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.backends = [False] + ([True] if HAS_NUMPY else [])
+    
+    def emitter(self, use_numpy, **kwargs):
+        params = dict(capacity=32, rate=0.0, life=1.0, speed=0.0, radius=0.0)
+        params.update(kwargs)
+        return ParticleEmitter(fade_frames(), use_numpy=use_numpy, seed=3, **params)
+    
+    def test_integration_and_expiry(self):
+        """Partículas andam com a velocidade e somem ao fim da vida."""
+        for use_numpy in self.backends:
+            emitter = self.emitter(use_numpy, speed=10.0, radius=5.0)
+            emitter.x, emitter.y = 100.0, 100.0
+            emitter.emit(10)
+            start = [(emitter.px[i], emitter.py[i]) for i in range(10)]
+            velocity = [(emitter.vx[i], emitter.vy[i]) for i in range(10)]
+            for i, (x, y) in enumerate(start):
+                self.assertLessEqual((x - 100) ** 2 + (y - 100) ** 2, 25 + 1e-9)
+            
+            emitter.update(0.5)
+            for i in range(10):
+                self.assertAlmostEqual(emitter.px[i], start[i][0] + velocity[i][0] * 0.5)
+                self.assertAlmostEqual(emitter.py[i], start[i][1] + velocity[i][1] * 0.5)
+            
+            emitter.emit(5)
+            emitter.update(0.6)
+            self.assertEqual(emitter.count, 5)
+            self.assertTrue(all(emitter.age[i] < 1.0 for i in range(5)))
+    
+    def test_emission_rate_and_capacity(self):
+        """A taxa acumula frações entre frames e respeita a capacidade."""
+        for use_numpy in self.backends:
+            emitter = self.emitter(use_numpy, rate=30.0, life=10.0)
+            emitter.emitting = True
+            for _ in range(60):
+                emitter.update(1 / 60)
+            self.assertEqual(emitter.count, 30)
+            
+            emitter.intensity = 0.5
+            for _ in range(60):
+                emitter.update(1 / 60)
+            self.assertEqual(emitter.count, 32)
+    
+    def test_draw_culls_and_batches(self):
+        """Um blits por emissor, só com as partículas na tela."""
+        for use_numpy in self.backends:
+            emitter = self.emitter(use_numpy)
+            emitter.x, emitter.y = 50.0, 50.0
+            emitter.emit(6)
+            emitter.x, emitter.y = 500.0, 50.0
+            emitter.emit(4)
+            
+            screen = CountingSurface((200, 200))
+            self.assertEqual(emitter.draw(screen), 6)
+            self.assertEqual((screen.blits_calls, screen.blit_calls, screen.drawn), (1, 0, 6))
+            
+            # Com a câmera deslocada, as outras ficam visíveis
+            self.assertEqual(emitter.draw(screen, (400, 0)), 4)
+            
+            # Partícula nova usa o nível opaco
+            self.assertEqual(screen.get_at((50, 50)), pygame.Color(0, 0, 0))
+    
+    def test_field_footprints(self):
+        """Emissores marcam sua área ao entrar e a desmarcam ao sair."""
+        field = ParticleField(cell_size=32)
+        first = self.emitter(HAS_NUMPY)
+        first.x, first.y = 48.0, 48.0  # centro da célula (1, 1)
+        field.add(first, reach=32)
+        self.assertEqual(sorted(field._cells),
+                         [(cx, cy) for cx in range(3) for cy in range(3)])
+        self.assertTrue(field.occupied(33, 63))
+        self.assertTrue(field.occupied(80, 40))
+        self.assertTrue(field.occupied(80, 80))  # Célula tocada pelo círculo
+        self.assertFalse(field.covers(80, 80))  # Mas o ponto está fora dele
+        self.assertTrue(field.covers(78, 48))
+        self.assertFalse(field.occupied(100, 48))
+        
+        second = self.emitter(HAS_NUMPY)
+        second.x, second.y = 80.0, 48.0
+        field.add(second, reach=10)
+        self.assertEqual(field._cells[(2, 1)], [first, second])
+        
+        field.remove(first)
+        self.assertFalse(field.occupied(48, 48))
+        self.assertTrue(field.covers(85, 40))
+        self.assertFalse(field.covers(80, 30))
+        field.remove(second)
+        self.assertEqual(field._cells, {})
+    
+    def test_covers_matches_circles(self):
+        """covers() e covers_many() dão o mesmo que o teste de círculo."""
+        rng = random.Random(8)
+        field = ParticleField(cell_size=32)
+        circles = []
+        for _ in range(12):
+            emitter = self.emitter(HAS_NUMPY)
+            emitter.x, emitter.y = rng.uniform(0, 400), rng.uniform(0, 300)
+            reach = rng.uniform(10, 70)
+            field.add(emitter, reach=reach)
+            circles.append((emitter.x, emitter.y, reach))
+        
+        xs = [rng.uniform(-50, 450) for _ in range(3000)]
+        ys = [rng.uniform(-50, 350) for _ in range(3000)]
+        expected = [any((x - cx) ** 2 + (y - cy) ** 2 <= r * r for cx, cy, r in circles)
+                    for x, y in zip(xs, ys)]
+        self.assertTrue(any(expected))
+        single = [field.covers(x, y) for x, y in zip(xs, ys)]
+        batch = [bool(v) for v in field.covers_many(xs, ys)]
+        self.assertEqual([i for i, v in enumerate(single) if v != expected[i]], [])
+        self.assertEqual([i for i, v in enumerate(batch) if v != expected[i]], [])
+        
+        # A fase larga nunca perde um ponto de dentro
+        for x, y, inside in zip(xs, ys, expected):
+            if inside:
+                self.assertTrue(field.occupied(x, y))
+    
+    def test_batch_query_matches_single(self):
+        """occupied_many() dá o mesmo que occupied() ponto a ponto."""
+        field = ParticleField(cell_size=32)
+        for x, y in ((100.0, 100.0), (300.0, 140.0), (-40.0, 20.0)):
+            emitter = self.emitter(HAS_NUMPY)
+            emitter.x, emitter.y = x, y
+            field.add(emitter, reach=50)
+        
+        xs = [float(x) for x in range(-120, 420, 7)] * 3
+        ys = [float(y) for y in range(-60, 300, 5)][:len(xs) // 3] * 3
+        xs, ys = xs[:len(ys)], ys
+        expected = [field.occupied(x, y) for x, y in zip(xs, ys)]
+        self.assertTrue(any(expected))
+        self.assertFalse(all(expected))
+        self.assertEqual([bool(v) for v in field.occupied_many(xs, ys)], expected)
+        
+        field.remove(field.emitters[0])
+        expected = [field.occupied(x, y) for x, y in zip(xs, ys)]
+        self.assertEqual([bool(v) for v in field.occupied_many(xs, ys)], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
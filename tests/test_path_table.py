@@ -0,0 +1,134 @@
+"""
+Testes para a tabela de próximos passos pré-calculada.
+"""
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+from rallyx_clone.core import path_table
+from rallyx_clone.core.path_table import NextHopTable
+from rallyx_clone.core.pathfinding import bfs_pathfind, create_engine, get_next_tile
+
+from test_pathfinding import load_level_grid
+
+
+class TestNextHopTable(unittest.TestCase):
+    """Testes para NextHopTable."""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(path_table, "_get_cache_dir",
+                                    return_value=self._tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        NextHopTable.clear_cache()
+    
+    def tearDown(self):
+        NextHopTable.clear_cache()
+        self._tmp.cleanup()
+    
+    def test_paths_are_shortest(self):
+        """Caminhos da tabela têm o tamanho dos caminhos do BFS."""
+        grid = load_level_grid()
+        table = NextHopTable.for_grid(grid)
+        tiles = [(tx, ty) for ty, row in enumerate(grid)
+                 for tx, tile in enumerate(row) if tile not in (1, 3)]
+        
+        for start in tiles[::5]:
+            for goal in tiles:
+                self.assertEqual(len(table.path(start, goal, 50)),
+                                 len(bfs_pathfind(start, goal, grid)))
+        
+        self.assertEqual(table.path((2, 2), (18, 13), 5), [])
+    
+    def test_cache_is_memory_mapped_and_reused(self):
+        """A segunda carga mapeia o arquivo já gravado."""
+        grid = load_level_grid()
+        NextHopTable.for_grid(grid)
+        files = os.listdir(self._tmp.name)
+        self.assertEqual(len(files), 1)
+        
+        NextHopTable.clear_cache()
+        with mock.patch.object(NextHopTable, "_build") as build:
+            table = NextHopTable.for_grid(grid)
+            build.assert_not_called()
+        self.assertEqual(table.next_tile((2, 2), (2, 2)), None)
+        self.assertIsNotNone(table.next_tile((2, 2), (5, 5)))
+    
+    def test_changed_level_rebuilds(self):
+        """Um grid alterado gera outra tabela."""
+        grid = load_level_grid()
+        first = NextHopTable.for_grid(grid)
+        changed = [list(row) for row in grid]
+        changed[1][5] = 1
+        second = NextHopTable.for_grid(changed)
+        self.assertNotEqual(first.digest, second.digest)
+        self.assertEqual(len(os.listdir(self._tmp.name)), 2)
+        self.assertIsNone(second.next_tile((5, 1), (2, 2)))
+    
+    def test_cache_keeps_recent_tables(self):
+        """Além do limite, as tabelas usadas há mais tempo saem do disco."""
+        grid = [[0] * 6 for _ in range(4)]
+        first = NextHopTable.for_grid(grid)
+        first_file = os.path.join(self._tmp.name, f"nexthop_{first.digest[:16]}.bin")
+        os.utime(first_file, (0, 0))
+        
+        with mock.patch.object(path_table, "PATH_TABLE_CACHE_FILES", 2):
+            digests = []
+            for wall in range(3):
+                changed = [list(row) for row in grid]
+                changed[1][wall + 1] = 1
+                digests.append(NextHopTable.for_grid(changed).digest)
+                self.assertLessEqual(len(os.listdir(self._tmp.name)), 2)
+        
+        self.assertFalse(os.path.exists(first_file))
+        self.assertIn(f"nexthop_{digests[-1][:16]}.bin", os.listdir(self._tmp.name))
+    
+    def test_next_tile_respects_max_distance(self):
+        """Com a tabela carregada, get_next_tile segue o limite do BFS."""
+        grid = load_level_grid()
+        table = NextHopTable.for_grid(grid)
+        tiles = [(tx, ty) for ty, row in enumerate(grid)
+                 for tx, tile in enumerate(row) if tile not in (1, 3)]
+        
+        mismatches = []
+        for start in tiles[::7]:
+            for goal in tiles[::3]:
+                for limit in (3, 10):
+                    step = get_next_tile(start, goal, grid, limit)
+                    path = bfs_pathfind(start, goal, grid, limit)
+                    if (step is None) != (len(path) < 2):
+                        mismatches.append((start, goal, limit))
+                    elif step is not None and step != table.next_tile(start, goal):
+                        mismatches.append((start, goal, limit))
+        self.assertEqual(mismatches, [])
+    
+    def test_lookup_hashes_each_grid_once(self):
+        """Consultas com outro objeto de grid calculam o hash uma vez só."""
+        grid = load_level_grid()
+        NextHopTable.for_grid(grid)
+        other = [list(row) for row in grid]
+        with mock.patch.object(path_table, "grid_digest",
+                               wraps=path_table.grid_digest) as digest:
+            for _ in range(20):
+                self.assertIsNotNone(NextHopTable.loaded_for(other))
+                get_next_tile((2, 2), (5, 5), other)
+        self.assertEqual(digest.call_count, 1)
+    
+    def test_table_engine(self):
+        """Engine 'table' retorna caminhos ótimos."""
+        grid = load_level_grid()
+        engine = create_engine("table")
+        self.assertEqual(engine.name, "table")
+        self.assertEqual(len(engine.find_path((2, 2), (18, 13), grid)),
+                         len(bfs_pathfind((2, 2), (18, 13), grid)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,618 @@
+"""
+Testes para o pathfinding dos inimigos.
+"""
+import unittest
+import sys
+import os
+import json
+import random
+import tempfile
+import threading
+import time
+from collections import deque
+from unittest import mock
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+from rallyx_clone.core import path_table
+from rallyx_clone.core.path_table import NextHopTable
+from rallyx_clone.core.hpa import ClusterGraph
+from rallyx_clone.core.dstar_lite import DStarLite
+from rallyx_clone.core.path_scheduler import PathScheduler
+from rallyx_clone.core.path_service import AsyncPathService
+from rallyx_clone.core import wavefront
+from rallyx_clone.core.collision import is_tile_blocked, mark_grid_changed
+from rallyx_clone.core.pathfinding import (
+    bfs_pathfind, bfs_search_steps, FlowField, JunctionGraph,
+    PATHFINDING_ENGINES, PathfindingEngine, create_engine, register_engine,
+    path_to_waypoints, waypoints_to_path
+)
+
+
+def load_level_grid():
+    """Carrega o grid do level_01.json."""
+    level_path = os.path.join(
+        src_path, "rallyx_clone", "assets", "data", "level_01.json"
+    )
+    with open(level_path, 'r') as f:
+        return json.load(f)["grid"]
+
+
+def random_grid(width, height, wall_chance, seed):
+    """Gera um grid aleatório com borda."""
+    rng = random.Random(seed)
+    grid = []
+    for ty in range(height):
+        row = []
+        for tx in range(width):
+            if tx in (0, width - 1) or ty in (0, height - 1):
+                row.append(3)
+            else:
+                row.append(1 if rng.random() < wall_chance else rng.choice((0, 0, 2)))
+        grid.append(row)
+    return grid
+
+
+def maze_grid(cells_x, cells_y, seed, loops=10):
+    """Gera um labirinto de corredores de 1 tile com alguns ciclos."""
+    rng = random.Random(seed)
+    width, height = cells_x * 2 + 1, cells_y * 2 + 1
+    grid = [[1] * width for _ in range(height)]
+    for tx in range(width):
+        grid[0][tx] = grid[height - 1][tx] = 3
+    for ty in range(height):
+        grid[ty][0] = grid[ty][width - 1] = 3
+    
+    stack = [(0, 0)]
+    visited = {(0, 0)}
+    grid[1][1] = 0
+    while stack:
+        cx, cy = stack[-1]
+        options = [(cx + dx, cy + dy) for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0))
+                   if 0 <= cx + dx < cells_x and 0 <= cy + dy < cells_y
+                   and (cx + dx, cy + dy) not in visited]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(options)
+        grid[cy + ny + 1][cx + nx + 1] = 0
+        grid[ny * 2 + 1][nx * 2 + 1] = 0
+        visited.add((nx, ny))
+        stack.append((nx, ny))
+    
+    for _ in range(loops):
+        tx, ty = rng.randrange(1, width - 1), rng.randrange(1, height - 1)
+        if (tx + ty) % 2 == 1:
+            grid[ty][tx] = 0
+    return grid
+
+
+def bfs_pathfind_reference(start, goal, grid, max_distance=50):
+    """Implementação original do BFS, que copia o caminho a cada tile."""
+    if start == goal:
+        return [goal]
+    
+    queue = deque([(start, [start])])
+    visited = {start}
+    
+    while queue:
+        (cx, cy), path = queue.popleft()
+        
+        if len(path) > max_distance:
+            continue
+        
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            nx, ny = cx + dx, cy + dy
+            
+            if (nx, ny) in visited:
+                continue
+            
+            if is_tile_blocked(nx, ny, grid):
+                continue
+            
+            new_path = path + [(nx, ny)]
+            
+            if (nx, ny) == goal:
+                return new_path
+            
+            visited.add((nx, ny))
+            queue.append(((nx, ny), new_path))
+    
+    return []
+
+
+class TestBFSPathfind(unittest.TestCase):
+    """Testes para bfs_pathfind."""
+    
+    def test_same_tile(self):
+        """Início igual ao destino retorna só o destino."""
+        grid = load_level_grid()
+        self.assertEqual(bfs_pathfind((2, 2), (2, 2), grid), [(2, 2)])
+    
+    def test_matches_reference_on_level(self):
+        """Caminhos idênticos à implementação original no level_01."""
+        grid = load_level_grid()
+        tiles = [(tx, ty) for ty in range(len(grid)) for tx in range(len(grid[0]))]
+        
+        for start in tiles[::13]:
+            for goal in tiles:
+                self.assertEqual(
+                    bfs_pathfind(start, goal, grid),
+                    bfs_pathfind_reference(start, goal, grid),
+                    f"{start} -> {goal}"
+                )
+    
+    def test_matches_reference_with_limits(self):
+        """Respeita max_distance e inícios fora do mapa como o original."""
+        for seed in range(5):
+            grid = random_grid(24, 18, 0.3, seed)
+            rng = random.Random(seed)
+            for _ in range(200):
+                start = (rng.randint(-1, 24), rng.randint(-1, 18))
+                goal = (rng.randint(-1, 24), rng.randint(-1, 18))
+                limit = rng.randint(1, 30)
+                self.assertEqual(
+                    bfs_pathfind(start, goal, grid, limit),
+                    bfs_pathfind_reference(start, goal, grid, limit)
+                )
+    
+    def test_matches_sliced_search(self):
+        """O laço direto e a busca fatiada expandem os mesmos nós."""
+        grid = random_grid(30, 20, 0.25, 7)
+        engine = create_engine("bfs")
+        rng = random.Random(7)
+        for _ in range(100):
+            start = (rng.randint(1, 28), rng.randint(1, 18))
+            goal = (rng.randint(1, 28), rng.randint(1, 18))
+            path = engine.find_path(start, goal, grid, 40)
+            
+            steps = bfs_search_steps(start, goal, grid, 40, batch=8)
+            try:
+                while True:
+                    next(steps)
+            except StopIteration as finished:
+                self.assertEqual(finished.value, (path, engine.last_expanded))
+    
+    def test_unreachable_goal(self):
+        """Destino bloqueado retorna caminho vazio."""
+        grid = load_level_grid()
+        self.assertEqual(bfs_pathfind((2, 2), (0, 0), grid), [])
+
+
+class TestEngines(unittest.TestCase):
+    """Testes para as engines do registro."""
+    
+    def setUp(self):
+        # Engines com cache em disco gravam em um diretório temporário
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(path_table, "_get_cache_dir",
+                                    return_value=self._tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        NextHopTable.clear_cache()
+        self._tmp.cleanup()
+    
+    def assert_valid_path(self, path, start, goal, grid):
+        """Verifica continuidade e tiles livres do caminho."""
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], goal)
+        for (ax, ay), (bx, by) in zip(path, path[1:]):
+            self.assertEqual(abs(ax - bx) + abs(ay - by), 1)
+            self.assertNotIn(grid[by][bx], (1, 3))
+    
+    def test_registry(self):
+        """Engines padrão registradas; nome desconhecido cai no BFS."""
+        for name in ("bfs", "astar", "bidirectional"):
+            self.assertIn(name, PATHFINDING_ENGINES)
+            self.assertEqual(create_engine(name).name, name)
+        self.assertEqual(create_engine("inexistente").name, "bfs")
+    
+    def test_engines_find_shortest_paths(self):
+        """Engines exatas acham caminhos ótimos dentro do limite."""
+        for seed in range(4):
+            grid = random_grid(30, 20, 0.25, seed)
+            rng = random.Random(seed)
+            # O HPA* é aproximado e ignora max_distance (ver TestHierarchical)
+            for name in set(PATHFINDING_ENGINES) - {"hpa"}:
+                engine = create_engine(name)
+                for _ in range(100):
+                    start = (rng.randint(1, 28), rng.randint(1, 18))
+                    goal = (rng.randint(1, 28), rng.randint(1, 18))
+                    limit = rng.randint(5, 40)
+                    expected = bfs_pathfind(start, goal, grid, limit)
+                    path = engine.find_path(start, goal, grid, limit)
+                    self.assertEqual(len(path), len(expected), name)
+                    if len(path) > 1:
+                        self.assert_valid_path(path, start, goal, grid)
+
+
+class TestJunctionGraph(unittest.TestCase):
+    """Testes para o grafo de cruzamentos."""
+    
+    def test_maze_paths_and_compression(self):
+        """Em labirintos o grafo é bem menor e os caminhos são ótimos."""
+        for seed in range(3):
+            grid = maze_grid(15, 10, seed)
+            graph = JunctionGraph(grid)
+            free = [(tx, ty) for ty, row in enumerate(grid)
+                    for tx, tile in enumerate(row) if tile == 0]
+            self.assertLess(len(graph.adjacency), len(free) / 2)
+            
+            rng = random.Random(seed)
+            for _ in range(100):
+                start, goal = rng.choice(free), rng.choice(free)
+                expected = bfs_pathfind(start, goal, grid, max_distance=1000)
+                path = graph.find_path(start, goal)
+                self.assertEqual(len(path), len(expected))
+                
+                waypoints = graph.find_waypoints(start, goal)
+                self.assertEqual(waypoints_to_path(waypoints), path)
+                self.assertEqual(waypoints, path_to_waypoints(path))
+    
+    def test_ring_without_junctions(self):
+        """Anel sem cruzamentos ainda vira um grafo navegável."""
+        grid = [[1, 1, 1, 1],
+                [1, 0, 0, 1],
+                [1, 0, 0, 1],
+                [1, 1, 1, 1]]
+        graph = JunctionGraph(grid)
+        self.assertEqual(len(graph.find_path((1, 1), (2, 2))), 3)
+        self.assertEqual(graph.find_path((1, 1), (0, 0)), [])
+
+
+class TestHierarchical(unittest.TestCase):
+    """Testes para o HPA*."""
+    
+    def test_long_paths_on_large_map(self):
+        """Acha caminhos válidos e quase ótimos além do limite do BFS."""
+        grid = random_grid(100, 80, 0.2, 7)
+        graph = ClusterGraph(grid)
+        rng = random.Random(7)
+        free = [(tx, ty) for ty, row in enumerate(grid)
+                for tx, tile in enumerate(row) if tile not in (1, 3)]
+        long_paths = 0
+        
+        for _ in range(60):
+            start, goal = rng.choice(free), rng.choice(free)
+            expected = bfs_pathfind(start, goal, grid, max_distance=100000)
+            path = graph.find_path(start, goal)
+            self.assertEqual(bool(path), bool(expected))
+            if not path:
+                continue
+            
+            self.assertEqual(path[0], start)
+            self.assertEqual(path[-1], goal)
+            for (ax, ay), (bx, by) in zip(path, path[1:]):
+                self.assertEqual(abs(ax - bx) + abs(ay - by), 1)
+                self.assertNotIn(grid[by][bx], (1, 3))
+            self.assertLessEqual(len(path), len(expected) * 1.5)
+            if len(path) > 51:
+                long_paths += 1
+        
+        self.assertGreater(long_paths, 0)
+    
+    def test_engine_max_distance_and_expanded(self):
+        """A engine respeita max_distance e conta os nós expandidos."""
+        grid = random_grid(100, 80, 0.2, 7)
+        engine = create_engine("hpa")
+        rng = random.Random(3)
+        free = [(tx, ty) for ty, row in enumerate(grid)
+                for tx, tile in enumerate(row) if tile not in (1, 3)]
+        
+        for _ in range(60):
+            start, goal = rng.choice(free), rng.choice(free)
+            path = engine.find_path(start, goal, grid, 30)
+            self.assertLessEqual(len(path) - 1, 30)
+            if not bfs_pathfind(start, goal, grid, 30):
+                self.assertEqual(path, [])
+            if abs(start[0] - goal[0]) + abs(start[1] - goal[1]) > 30:
+                self.assertEqual(engine.last_expanded, 0)
+            
+            unlimited = engine.find_path(start, goal, grid, 100000)
+            self.assertEqual(bool(unlimited),
+                             bool(bfs_pathfind(start, goal, grid, 100000)))
+            if unlimited and start != goal:
+                self.assertGreater(engine.last_expanded, 0)
+
+
+class TestDStarLite(unittest.TestCase):
+    """Testes para o planejador incremental."""
+    
+    def test_moving_start_and_goal(self):
+        """Replanejamentos seguem ótimos com início e destino andando."""
+        grid = random_grid(40, 30, 0.2, 3)
+        planner = DStarLite()
+        rng = random.Random(3)
+        free = [(tx, ty) for ty, row in enumerate(grid)
+                for tx, tile in enumerate(row) if tile not in (1, 3)]
+        start, goal = rng.choice(free), rng.choice(free)
+        
+        for step in range(80):
+            path = planner.plan(start, goal, grid)
+            expected = bfs_pathfind(start, goal, grid, max_distance=100000)
+            self.assertEqual(len(path), len(expected))
+            if step == 0:
+                first_expanded = planner.last_expanded
+            
+            # Perseguidor avança; alvo anda para um vizinho livre
+            if len(path) > 1:
+                start = path[1]
+            moves = [(goal[0] + dx, goal[1] + dy) for dx, dy in
+                     ((0, -1), (0, 1), (-1, 0), (1, 0))]
+            moves = [tile for tile in moves if grid[tile[1]][tile[0]] not in (1, 3)]
+            goal = rng.choice(moves)
+        
+        self.assertLess(planner.last_expanded, first_expanded)
+    
+    def test_grid_changes_are_repaired(self):
+        """Bloquear um tile do caminho força um desvio ótimo."""
+        grid = random_grid(30, 20, 0.1, 5)
+        planner = DStarLite()
+        start, goal = (1, 1), (28, 18)
+        grid[1][1] = grid[18][28] = 0
+        path = planner.plan(start, goal, grid)
+        
+        blocked = path[len(path) // 2]
+        grid[blocked[1]][blocked[0]] = 1
+        planner.tiles_changed([blocked])
+        path = planner.plan(start, goal, grid)
+        self.assertNotIn(blocked, path)
+        self.assertEqual(len(path),
+                         len(bfs_pathfind(start, goal, grid, max_distance=100000)))
+        
+        planner.reset()
+        self.assertIsNone(planner.goal)
+
+
+class TestFlowField(unittest.TestCase):
+    """Testes para o campo de distâncias compartilhado."""
+    
+    def test_paths_are_shortest(self):
+        """Descer o campo dá caminhos do mesmo tamanho que o BFS."""
+        grid = load_level_grid()
+        field = FlowField()
+        field.set_grid(grid)
+        target = (2, 2)
+        self.assertTrue(field.update(target))
+        self.assertFalse(field.update(target))
+        
+        for ty, row in enumerate(grid):
+            for tx, tile in enumerate(row):
+                expected = bfs_pathfind((tx, ty), target, grid, max_distance=1000)
+                path = field.path_from((tx, ty))
+                self.assertEqual(len(path), len(expected))
+                if path:
+                    self.assertEqual(path[-1], target)
+                if path and tile not in (1, 3):
+                    self.assertEqual(field.distance_at((tx, ty)), len(path) - 1)
+    
+    def test_blocked_tile_is_unreachable(self):
+        """Tiles bloqueados não têm distância."""
+        grid = load_level_grid()
+        field = FlowField()
+        field.set_grid(grid)
+        field.update((2, 2))
+        self.assertEqual(field.distance_at((0, 0)), FlowField.UNREACHABLE)
+        self.assertIsNone(field.next_tile((2, 2)))
+    
+    @unittest.skipUnless(wavefront.HAS_NUMPY, "NumPy não instalado")
+    def test_large_map_reads_numpy_field(self):
+        """Em mapas grandes o campo fica no array NumPy, com as mesmas respostas."""
+        grid = random_grid(64, 48, 0.25, 11)
+        field = FlowField()
+        field.set_grid(grid)
+        field.update((30, 20))
+        self.assertNotIsInstance(field.distances, list)
+        
+        with mock.patch.object(wavefront, "HAS_NUMPY", False):
+            reference = FlowField()
+            reference.set_grid(grid)
+            reference.update((30, 20))
+        self.assertIsInstance(reference.distances, list)
+        
+        mismatches = []
+        for ty in range(-1, 49):
+            for tx in range(-1, 65):
+                tile = (tx, ty)
+                if (field.distance_at(tile) != reference.distance_at(tile) or
+                        field.next_tile(tile) != reference.next_tile(tile)):
+                    mismatches.append(tile)
+        self.assertEqual(mismatches, [])
+        self.assertIs(type(field.distance_at((30, 20))), int)
+
+
+class TestWavefront(unittest.TestCase):
+    """Testes para o mapa de distâncias vetorizado."""
+    
+    @unittest.skipUnless(wavefront.HAS_NUMPY, "NumPy não instalado")
+    def test_numpy_matches_deque(self):
+        """O kernel NumPy dá as mesmas distâncias que a BFS com deque."""
+        rng = random.Random(5)
+        grid = [[3] * 48] + [
+            [3] + [1 if rng.random() < 0.3 else 0 for _ in range(46)] + [3]
+            for _ in range(38)
+        ] + [[3] * 48]
+        for source in ((1, 1), (24, 20), (46, 38), (0, 0), (60, 5)):
+            expected = wavefront.distance_map_deque(grid, source)
+            self.assertEqual(
+                wavefront.distance_map_numpy(grid, source).tolist(), expected)
+            self.assertEqual(wavefront.distance_map(grid, source).tolist(),
+                             expected)
+    
+    def test_fallback_without_numpy(self):
+        """Sem NumPy o mapa vem da BFS com deque, em listas."""
+        grid = load_level_grid()
+        with mock.patch.object(wavefront, "HAS_NUMPY", False):
+            distances = wavefront.distance_map(grid, (1, 1))
+        self.assertIsInstance(distances, list)
+        self.assertEqual(distances[1][1], 0)
+        self.assertEqual(distances[0][0], wavefront.UNREACHABLE)
+        self.assertEqual(distances[13][18],
+                         len(bfs_pathfind((1, 1), (18, 13), grid)) - 1)
+
+
+class TestPathScheduler(unittest.TestCase):
+    """Testes para o escalonador de buscas com orçamento por frame."""
+    
+    def test_search_continues_across_frames(self):
+        """Com orçamento zero cada frame avança uma fatia até terminar."""
+        grid = load_level_grid()
+        scheduler = PathScheduler()
+        start, goal = (1, 1), (18, 13)
+        request = scheduler.submit(start, goal, grid, create_engine("bfs"),
+                                   max_distance=1000)
+        
+        frames = 0
+        while not request.done():
+            scheduler.run(budget_ms=0)
+            frames += 1
+        
+        self.assertGreater(frames, 1)
+        self.assertEqual(scheduler.pending, 0)
+        self.assertEqual(request.result(),
+                         bfs_pathfind(start, goal, grid, max_distance=1000))
+    
+    def test_priority_order_and_cancel(self):
+        """Menor prioridade é atendida primeiro; cancelados são descartados."""
+        grid = load_level_grid()
+        scheduler = PathScheduler()
+        engine = create_engine("astar")
+        far = scheduler.submit((1, 1), (18, 13), grid, engine, priority=5.0)
+        near = scheduler.submit((1, 1), (2, 1), grid, engine, priority=1.0)
+        dropped = scheduler.submit((1, 1), (3, 1), grid, engine, priority=0.0)
+        dropped.cancel()
+        
+        while not near.done():
+            scheduler.run(budget_ms=0)
+        self.assertFalse(far.done())
+        
+        while not far.done():
+            scheduler.run(budget_ms=0)
+        self.assertEqual(near.result(), [(1, 1), (2, 1)])
+        self.assertFalse(dropped.done())
+        self.assertEqual(scheduler.pending, 0)
+
+
+class TestAsyncPathService(unittest.TestCase):
+    """Testes para o serviço de buscas em workers."""
+    
+    def tearDown(self):
+        AsyncPathService().shutdown()
+    
+    def check_service(self, use_processes):
+        grid = load_level_grid()
+        service = AsyncPathService()
+        service.start(workers=2, use_processes=use_processes)
+        engine = create_engine("astar")
+        queries = [((1, 1), (18, 13)), ((1, 1), (2, 1)), ((18, 1), (1, 13))]
+        futures = [service.submit(start, goal, grid, engine)
+                   for start, goal in queries]
+        
+        for (start, goal), future in zip(queries, futures):
+            self.assertEqual(len(future.result(timeout=30)),
+                             len(bfs_pathfind(start, goal, grid)))
+        self.assertEqual(service.pending, 0)
+    
+    def test_thread_pool(self):
+        """Com threads o resultado chega pelo future."""
+        self.check_service(use_processes=False)
+    
+    def test_process_pool(self):
+        """Com processos o grid vai pela memória compartilhada; mesmo resultado."""
+        self.check_service(use_processes=True)
+    
+    def test_grid_published_once_per_version(self):
+        """O grid é publicado uma vez; uma edição gera uma versão nova."""
+        grid = [[0] * 8 for _ in range(5)]
+        service = AsyncPathService()
+        service.start(workers=2, use_processes=True)
+        engine = create_engine("bfs")
+        futures = [service.submit((0, 0), (7, 0), grid, engine) for _ in range(4)]
+        version = service._version
+        for future in futures:
+            self.assertEqual(len(future.result(timeout=30)), 8)
+        self.assertEqual(service._version, version)
+        
+        for ty in range(5):
+            grid[ty][4] = 1
+        mark_grid_changed(grid)
+        future = service.submit((0, 0), (7, 0), grid, engine)
+        self.assertEqual(future.result(timeout=30), [])
+        self.assertEqual(service._version, version + 1)
+    
+    def test_priority_order(self):
+        """Com o worker ocupado, os pedidos saem por ordem de prioridade."""
+        gate = threading.Event()
+        
+        @register_engine
+        class GatedEngine(PathfindingEngine):
+            name = "test_gated"
+            
+            def find_path(self, start, goal, grid, max_distance=50):
+                gate.wait(10)
+                return [start]
+        
+        try:
+            grid = [[0] * 4 for _ in range(4)]
+            service = AsyncPathService()
+            service.start(workers=1, use_processes=False)
+            engine = GatedEngine()
+            order = []
+            busy = service.submit((0, 0), (1, 0), grid, engine)
+            for tile, priority in (((1, 1), 3.0), ((2, 2), 1.0), ((3, 3), 2.0)):
+                future = service.submit(tile, (0, 0), grid, engine, priority)
+                future.add_done_callback(lambda f: order.append(f.result()[0]))
+            dropped = service.submit((0, 3), (0, 0), grid, engine, priority=0.0)
+            dropped.cancel()
+            self.assertEqual(service.pending, 4)
+            
+            gate.set()
+            busy.result(timeout=10)
+            deadline = time.time() + 10
+            while len(order) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(order, [(2, 2), (3, 3), (1, 1)])
+            self.assertTrue(dropped.cancelled())
+        finally:
+            PATHFINDING_ENGINES.pop("test_gated", None)
+    
+    def test_reset_drops_previous_level(self):
+        """reset cancela a fila, solta a busca em andamento e publica de novo."""
+        gate = threading.Event()
+        
+        @register_engine
+        class GatedEngine(PathfindingEngine):
+            name = "test_gated"
+            
+            def find_path(self, start, goal, grid, max_distance=50):
+                gate.wait(10)
+                return [start]
+        
+        try:
+            grid = [[0] * 4 for _ in range(4)]
+            service = AsyncPathService()
+            service.start(workers=1, use_processes=False)
+            engine = GatedEngine()
+            busy = service.submit((0, 0), (1, 0), grid, engine)
+            queued = service.submit((1, 1), (0, 0), grid, engine)
+            version = service._version
+            
+            service.reset()
+            self.assertTrue(queued.cancelled())
+            self.assertIsInstance(busy.exception(timeout=1), RuntimeError)
+            self.assertEqual(service.pending, 0)
+            
+            gate.set()
+            future = service.submit((0, 0), (3, 0), grid, create_engine("bfs"))
+            self.assertEqual(len(future.result(timeout=10)), 4)
+            self.assertEqual(service._version, version + 1)
+        finally:
+            PATHFINDING_ENGINES.pop("test_gated", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Testes para a fila de renderização.
+"""
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.render_queue import RenderQueue
+from rallyx_clone.gameplay.entities_base import Entity
+from rallyx_clone.gameplay.world import World
+
+
+class CountingSurface(pygame.Surface):
+    """Superfície que conta as chamadas de desenho."""
+    
+    def __init__(self, size):
+        super().__init__(size)
+        self.blit_calls = 0
+        self.blits_calls = 0
+    
+    def blit(self, *args, **kwargs):
+        self.blit_calls += 1
+        return super().blit(*args, **kwargs)
+    
+    def blits(self, sequence, doreturn=True):
+        self.blits_calls += 1
+        return super().blits(sequence, doreturn=doreturn)
+
+
+def solid(color, size=10):
+    """Superfície de uma cor só."""
+    surface = pygame.Surface((size, size))
+    surface.fill(color)
+    return surface
+
+
+class TestRenderQueue(unittest.TestCase):
+    """Testes da RenderQueue."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def test_layers_in_order(self):
+        """Camadas menores vão primeiro; dentro da camada, a ordem de push."""
+        screen = CountingSurface((100, 100))
+        queue = RenderQueue()
+        queue.begin(screen)
+        queue.push(solid((255, 0, 0)), (0, 0), layer=2)
+        queue.push(solid((0, 255, 0)), (5, 5), layer=1)
+        queue.push(solid((0, 0, 255)), (0, 0), layer=1)
+        rects = queue.flush(screen)
+        
+        # Vermelho (camada 2) por cima; azul por cima do verde na camada 1
+        self.assertEqual(screen.get_at((2, 2))[:3], (255, 0, 0))
+        self.assertEqual(screen.get_at((12, 12))[:3], (0, 255, 0))
+        self.assertEqual(screen.get_at((0, 12))[:3], (0, 0, 0))
+        self.assertEqual(screen.blits_calls, 2)
+        self.assertEqual(screen.blit_calls, 0)
+        self.assertEqual(queue.draw_calls, 2)
+        self.assertEqual(len(rects), 3)
+    
+    def test_culling(self):
+        """Sprites fora do clip são descartados e contados."""
+        screen = CountingSurface((100, 100))
+        screen.set_clip(pygame.Rect(0, 0, 50, 50))
+        queue = RenderQueue()
+        queue.begin(screen)
+        sprite = solid((255, 255, 255))
+        self.assertTrue(queue.push(sprite, (45, 45)))
+        self.assertTrue(queue.push(sprite, (-9.5, 0)))
+        self.assertFalse(queue.push(sprite, (50, 0)))
+        self.assertFalse(queue.push(sprite, (0, -10)))
+        self.assertFalse(queue.push(sprite, (60, 60)))
+        rects = queue.flush(screen)
+        
+        self.assertEqual(queue.stats(), {"submitted": 2, "culled": 3, "draw_calls": 1})
+        self.assertEqual(rects, [pygame.Rect(45, 45, 5, 5), pygame.Rect(0, 0, 1, 10)])
+    
+    def test_begin_resets(self):
+        """Cada frame começa vazio e com os contadores zerados."""
+        screen = CountingSurface((100, 100))
+        queue = RenderQueue()
+        queue.begin(screen)
+        queue.push(solid((255, 255, 255)), (0, 0))
+        queue.begin(screen)
+        self.assertEqual(queue.flush(screen), [])
+        self.assertEqual(queue.stats(), {"submitted": 0, "culled": 0, "draw_calls": 0})
+        self.assertEqual(screen.blits_calls, 0)
+    
+    def test_entity_matches_direct_draw(self):
+        """Entidade pela fila desenha os mesmos pixels que Entity.draw."""
+        sprite = pygame.Surface((28, 28), pygame.SRCALPHA)
+        sprite.fill((200, 40, 40, 255), pygame.Rect(6, 2, 16, 24))
+        camera = (13.4, 7.8)
+        queue = RenderQueue()
+        for angle in (0, 30, 90, 200):
+            entity = Entity(60.3, 41.7, 28, 28)
+            entity._sprite = sprite
+            entity._angle = angle
+            
+            direct = pygame.Surface((100, 100))
+            entity.draw(direct, camera)
+            queued = pygame.Surface((100, 100))
+            queue.begin(queued, camera)
+            entity.enqueue(queue)
+            queue.flush(queued)
+            self.assertEqual(pygame.image.tobytes(direct, "RGB"),
+                             pygame.image.tobytes(queued, "RGB"), angle)
+        
+        # Longe da câmera: descartada antes de girar
+        entity.x = 500
+        queue.begin(queued, camera)
+        entity.enqueue(queue)
+        self.assertEqual(queue.culled, 1)
+        self.assertEqual(queue.submitted, 0)
+
+
+class TestWorldRenderQueue(unittest.TestCase):
+    """O mundo desenha os sprites com um blits por camada."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def test_world_draw_calls(self):
+        """Bandeiras, fumaça e carros: um blits por camada."""
+        world = World()
+        world.load_level({
+            "grid": [[0] * 10 for _ in range(8)],
+            "player_spawn": [2, 2],
+            "enemy_spawns": [[7, 5], [8, 6]],
+            "enemy_count": 2,
+            "flags": [[5, 5], [6, 2]],
+        })
+        world.smoke_manager.create_smoke(100, 100)
+        
+        screen = CountingSurface((320, 256))
+        world.draw(screen)
+        stats = world.render_queue.stats()
+        self.assertEqual(stats["draw_calls"], 3)
+        self.assertEqual(screen.blit_calls, 1)  # O fundo
+        self.assertEqual(screen.blits_calls, 3)
+        self.assertEqual(len(world.enemies), 2)
+        self.assertGreaterEqual(stats["submitted"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Testes para o pool de fumaças e o fade-out pré-renderizado.
+"""
+import unittest
+import sys
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+import pygame
+
+from rallyx_clone.core.assets import AssetManager
+from rallyx_clone.core.constants import SMOKE_DURATION, SMOKE_FADE_STEPS, SMOKE_RADIUS
+from rallyx_clone.gameplay.smoke import Smoke, SmokeManager
+
+
+class RecordingSurface(pygame.Surface):
+    """Superfície que anota as origens de cada blit."""
+    
+    def __init__(self, size):
+        super().__init__(size)
+        self.sources = []
+    
+    def blit(self, source, dest, *args):
+        self.sources.append(source)
+        return super().blit(source, dest, *args)
+    
+    def blits(self, sequence, doreturn=True):
+        sequence = list(sequence)
+        self.sources.extend(source for source, _ in sequence)
+        return super().blits(sequence, doreturn=doreturn)
+
+
+class TestSmokePool(unittest.TestCase):
+    """Testes do SmokeManager com pool."""
+    
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+    
+    def test_expired_instances_are_reused(self):
+        """Fumaças expiradas voltam ao pool e são reaproveitadas."""
+        manager = SmokeManager(capacity=4)
+        first = manager.create_smoke(50, 50)
+        manager.update(SMOKE_DURATION + 0.1)
+        self.assertEqual(manager.smokes, [])
+        self.assertFalse(manager.check_entity(50, 50))
+        
+        again = manager.create_smoke(200, 120)
+        self.assertIs(again, first)
+        self.assertTrue(again.active)
+        self.assertEqual((again.x, again.y, again.elapsed), (200, 120, 0.0))
+        self.assertTrue(manager.check_entity(210, 120))
+        self.assertFalse(manager.check_entity(50, 50))
+    
+    def test_full_pool_recycles_oldest(self):
+        """Com o pool cheio, a fumaça mais antiga dá lugar à nova."""
+        manager = SmokeManager(capacity=3)
+        created = [manager.create_smoke(100 * i + 50, 50) for i in range(3)]
+        newest = manager.create_smoke(50, 300)
+        self.assertIs(newest, created[0])
+        self.assertEqual(manager.smokes, created[1:] + [newest])
+        self.assertFalse(manager.check_entity(50, 50))
+        self.assertTrue(manager.check_entity(50, 300))
+        
+        manager.clear()
+        self.assertEqual(manager.smokes, [])
+        self.assertIn(manager.create_smoke(10, 10), created)
+    
+    def test_fade_frames_are_evenly_spaced(self):
+        """Os níveis de fade vão do transparente ao próprio sprite."""
+        smoke = Smoke(48, 48)
+        frames = smoke.emitter.frames
+        self.assertEqual(len(frames), SMOKE_FADE_STEPS)
+        self.assertIs(AssetManager().get_fade_frames(frames[-1], SMOKE_FADE_STEPS),
+                      frames)
+        self.assertEqual(frames[-1].get_alpha(), 255)
+        for i, frame in enumerate(frames[:-1]):
+            self.assertEqual(frame.get_alpha(), round(255 * i / (SMOKE_FADE_STEPS - 1)))
+    
+    def test_occupancy_follows_spawn_and_expiry(self):
+        """Os tiles de uma nuvem contam até ela expirar, nem antes nem depois."""
+        manager = SmokeManager()
+        manager.create_smoke(160, 160)
+        self.assertTrue(manager.check_entity(160, 160))
+        self.assertTrue(manager.check_entity(190, 160))
+        self.assertFalse(manager.check_entity(160 + SMOKE_RADIUS + 32, 160))
+        self.assertFalse(manager.check_entity(160, 320))
+        
+        manager.update(SMOKE_DURATION - 0.1)
+        self.assertTrue(manager.check_entity(160, 160))
+        manager.update(0.2)
+        self.assertFalse(manager.check_entity(160, 160))
+    
+    def test_batch_query(self):
+        """check_entities() responde por todas as posições de uma vez."""
+        manager = SmokeManager()
+        manager.create_smoke(100, 100)
+        manager.create_smoke(400, 100)
+        xs = [100, 400, 250, 100, 410]
+        ys = [100, 90, 100, 300, 110]
+        self.assertEqual([bool(v) for v in manager.check_entities(xs, ys)],
+                         [True, True, False, False, True])
+    
+    def test_matches_contains_point(self):
+        """A consulta pela grade dá o mesmo que o círculo de cada nuvem."""
+        rng = random.Random(11)
+        manager = SmokeManager()
+        for _ in range(6):
+            manager.create_smoke(rng.uniform(40, 600), rng.uniform(40, 440))
+        
+        xs = [rng.uniform(0, 640) for _ in range(4000)]
+        ys = [rng.uniform(0, 480) for _ in range(4000)]
+        expected = [any(smoke.active and smoke.contains_point(x, y)
+                        for smoke in manager.smokes)
+                    for x, y in zip(xs, ys)]
+        self.assertGreater(sum(expected), 100)
+        single = [manager.check_entity(x, y) for x, y in zip(xs, ys)]
+        batch = [bool(v) for v in manager.check_entities(xs, ys)]
+        self.assertEqual([i for i, v in enumerate(single) if v != expected[i]], [])
+        self.assertEqual([i for i, v in enumerate(batch) if v != expected[i]], [])
+    
+    def test_steady_state_reuses_instances_and_frames(self):
+        """Com o pool aquecido, só instâncias e quadros já existentes são usados."""
+        manager = SmokeManager(capacity=8)
+        screen = RecordingSurface((320, 240))
+        
+        def frames(count):
+            for i in range(count):
+                if i % 5 == 0:
+                    manager.create_smoke(40 + i % 240, 120)
+                manager.update(1 / 20)
+                manager.draw(screen)
+        
+        frames(200)
+        pool = {id(smoke) for smoke in manager.smokes + manager._free}
+        baked = {id(frame) for frame in manager.smokes[0].emitter.frames}
+        screen.sources.clear()
+        
+        frames(200)
+        self.assertLessEqual(len(pool), 8)
+        self.assertTrue({id(smoke) for smoke in manager.smokes} <= pool)
+        self.assertTrue(screen.sources)
+        self.assertTrue({id(source) for source in screen.sources} <= baked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Testes para o hash espacial de entidades.
+"""
+import unittest
+import sys
+import os
+import random
+
+# Adiciona src ao path
+src_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+sys.path.insert(0, src_path)
+
+from rallyx_clone.core.spatial_hash import SpatialHash
+
+
+class Box:
+    """Entidade mínima para o hash."""
+    
+    def __init__(self, x, y, width, height, active=True):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.active = active
+
+
+def overlaps(box, x, y, width, height):
+    """Teste exato entre duas caixas centradas (bordas inclusivas)."""
+    return (abs(box.x - x) <= (box.width + width) / 2 and
+            abs(box.y - y) <= (box.height + height) / 2)
+
+
+class TestSpatialHash(unittest.TestCase):
+    """Testes do SpatialHash."""
+    
+    def test_query_finds_every_overlap(self):
+        """Nenhuma caixa que sobrepõe a consulta fica de fora."""
+        rng = random.Random(1)
+        boxes = [Box(rng.uniform(0, 640), rng.uniform(0, 480),
+                     rng.choice((0, 24, 28, 80)), rng.choice((0, 24, 28, 80)))
+                 for _ in range(300)]
+        spatial_hash = SpatialHash()
+        spatial_hash.rebuild(boxes)
+        self.assertEqual(len(spatial_hash), 300)
+        
+        for _ in range(200):
+            x, y = rng.uniform(-20, 660), rng.uniform(-20, 500)
+            size = rng.choice((0, 28, 70))
+            found = spatial_hash.query_aabb(x, y, size, size)
+            self.assertEqual(len(found), len(set(map(id, found))))
+            for box in boxes:
+                if overlaps(box, x, y, size, size):
+                    self.assertIn(box, found)
+    
+    def test_query_radius_and_inactive(self):
+        """Raio cobre o círculo; entidades inativas não entram no hash."""
+        near = Box(100, 100, 10, 10)
+        far = Box(400, 400, 10, 10)
+        hidden = Box(100, 100, 10, 10, active=False)
+        spatial_hash = SpatialHash()
+        spatial_hash.rebuild([near, far, hidden])
+        
+        self.assertEqual(spatial_hash.query_radius(130, 100, 40), [near])
+        self.assertEqual(spatial_hash.query_radius(250, 250, 10), [])
+        
+        spatial_hash.clear()
+        self.assertEqual(len(spatial_hash), 0)
+        self.assertEqual(spatial_hash.query_radius(100, 100, 40), [])
+
+
+if __name__ == "__main__":
+    unittest.main()